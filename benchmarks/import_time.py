@@ -0,0 +1,81 @@
+#!/usr/bin/python
+"""
+    benchmarks.import_time
+    ======================
+
+    Measures the time to import pydevDAG and get its common entry points,
+    each in a fresh interpreter.
+
+    Run from the top-level directory, e.g.:
+    PYTHONPATH=src python benchmarks/import_time.py
+
+    .. moduleauthor:: mulhern <amulhern@redhat.com>
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import argparse
+import subprocess
+import sys
+
+# the time from before the import until after the names are got
+_CODE = """
+import time
+start = time.time()
+import pydevDAG
+%s
+print(time.time() - start)
+"""
+
+ENTRY_POINTS = [
+   ("import pydevDAG", ""),
+   ("NodeGetters", "pydevDAG.NodeGetters"),
+   ("Dict, ExtendedLookup", "pydevDAG.Dict; pydevDAG.ExtendedLookup"),
+   ("Reader", "pydevDAG.Reader"),
+   ("DepthFirst", "pydevDAG.DepthFirst"),
+   ("GenerateGraph", "pydevDAG.GenerateGraph"),
+   (
+      "all names",
+      "for name in pydevDAG.__all__: getattr(pydevDAG, name)"
+   ),
+]
+
+
+def measure(name, statement, repeat):
+    """
+    Print the least time taken to import pydevDAG and run ``statement``.
+
+    :param str name: name of the measurement
+    :param str statement: statement to run after the import
+    :param int repeat: the number of fresh interpreters to use
+    """
+    elapsed = min(
+       float(
+          subprocess.check_output(
+             [sys.executable, '-c', _CODE % statement]
+          ).decode('utf-8')
+       ) for _ in range(repeat)
+    )
+    print("%-40s %10.1f ms" % (name, elapsed * 1000))
+
+
+def main():
+    """
+    Run the benchmarks.
+
+    The "all names" row approximates the cost of an eager import.
+    """
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    for (name, statement) in ENTRY_POINTS:
+        measure(name, statement, args.repeat)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,143 @@
+#!/usr/bin/python
+"""
+    benchmarks.traversal
+    ====================
+
+    Measures throughput of the graph traversal generators on synthetic DAGs.
+
+    Run from the top-level directory, e.g.:
+    PYTHONPATH=src python benchmarks/traversal.py
+
+    .. moduleauthor:: mulhern <amulhern@redhat.com>
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import argparse
+import sys
+import timeit
+
+import pydevDAG
+
+
+def deep_graph(length):
+    """
+    A single chain of ``length`` nodes.
+
+    :param int length: the number of nodes
+    :rtype: `TrackedDiGraph`
+    """
+    graph = pydevDAG.TrackedDiGraph()
+    graph.add_path(range(length))
+    return graph
+
+
+def wide_graph(width, depth):
+    """
+    A DAG of ``depth`` levels, each of ``width`` nodes, in which each node
+    has two successors in the next level.
+
+    :param int width: the number of nodes in a level
+    :param int depth: the number of levels
+    :rtype: `TrackedDiGraph`
+    """
+    graph = pydevDAG.TrackedDiGraph()
+    graph.add_nodes_from((0, i) for i in range(width))
+    for level in range(depth - 1):
+        for i in range(width):
+            graph.add_edge((level, i), (level + 1, i))
+            graph.add_edge((level, i), (level + 1, (i + 1) % width))
+    return graph
+
+
+def recursive_nodes(graph, key_func):
+    """
+    The recursive depth-first traversal, for comparison.
+
+    :param DiGraph graph: the graph
+    :param key_func: the key function for sorting
+    """
+    def recurse(node_info):
+        """
+        Recursively yield the nodes below ``node_info``.
+        """
+        yield node_info
+        (depth, node, _) = node_info
+        successors = sorted(graph.successors(node), key=key_func)
+        for succ in successors:
+            for info in recurse((depth + 1, succ, succ is successors[-1])):
+                yield info
+
+    roots = sorted(pydevDAG.GraphUtils.get_roots(graph), key=key_func)
+    for root in roots:
+        for info in recurse((0, root, root is roots[-1])):
+            yield info
+
+
+def measure(name, func, graph, repeat):
+    """
+    Print the throughput of a traversal.
+
+    :param str name: name of the measurement
+    :param func: the traversal
+    :param `DiGraph` graph: the graph
+    :param int repeat: the number of repetitions
+    """
+    key_func = lambda x: x
+    try:
+        count = sum(1 for _ in func(graph, key_func))
+        elapsed = min(
+           timeit.repeat(
+              lambda: sum(1 for _ in func(graph, key_func)),
+              number=1,
+              repeat=repeat
+           )
+        )
+    except RuntimeError as err:
+        print("%-40s failed: %s" % (name, err))
+        return
+    print(
+       "%-40s %8d nodes %10.4f s %12.0f nodes/s" % \
+          (name, count, elapsed, count / elapsed)
+    )
+
+
+def main():
+    """
+    Run the benchmarks.
+    """
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    graphs = [
+       ("deep (500)", deep_graph(500)),
+       ("deep (5000)", deep_graph(5000)),
+       ("wide (1000 x 4)", wide_graph(1000, 4)),
+       ("wide (10 x 12)", wide_graph(10, 12)),
+    ]
+    graphs.extend(
+       ("%s, frozen" % name, pydevDAG.FrozenDeviceGraph(graph)) \
+          for (name, graph) in list(graphs)
+    )
+    traversals = [
+       ("recursive", recursive_nodes),
+       ("DepthFirst", pydevDAG.DepthFirst.nodes),
+       ("BreadthFirst", pydevDAG.BreadthFirst.nodes),
+    ]
+    for (name, graph) in graphs:
+        for (traversal_name, traversal) in traversals:
+            measure(
+               "%s: %s" % (traversal_name, name),
+               traversal,
+               graph,
+               args.repeat
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
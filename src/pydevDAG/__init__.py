@@ -25,34 +25,111 @@
 
     .. moduleauthor::  Anne Mulhern  <amulhern@redhat.com>
 """
-from ._attributes import EdgeTypes
-from ._attributes import ElementTypes
-from ._attributes import NodeTypes
 
-from ._errors import DAGError
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
 
-from ._item_str import NodeGetters
+import importlib
+import sys
 
-from ._generators import BreadthFirst
-from ._generators import DepthFirst
 
-from ._graphs import GenerateGraph
+# the submodule which defines each public name; a submodule is imported
+# only when one of its names is first used
+_SUBMODULES = {
+   'BitsetReachability': '_analysis',
+   'Impact': '_analysis',
+   'ImpactAnalysis': '_analysis',
+   'IntervalReachability': '_analysis',
+   'Reachability': '_analysis',
+   'SpindleSignatures': '_analysis',
 
-from ._decorations import Decorator
-from ._decorations import NodeDecorator
+   'AttributeIndex': '_attrindex',
+   'AttributeIndexes': '_attrindex',
 
-from ._readwrite import StringUtils
-from ._readwrite import Reader
-from ._readwrite import Rewriter
-from ._readwrite import Writer
+   'EdgeTypes': '_attributes',
+   'ElementTypes': '_attributes',
+   'NodeTypes': '_attributes',
 
-from ._structure import PyudevGraphs
-from ._structure import PyudevAggregateGraph
-from ._structure import SysfsTraversal
+   'DAGError': '_errors',
 
-from ._traversal import holders
-from ._traversal import slaves
+   'NodeGetters': '_item_str',
 
-from ._utils import GraphUtils
-from ._utils import Dict
-from ._utils import ExtendedLookup
+   'NodeIds': '_interning',
+   'StringTable': '_interning',
+
+   'FrozenDeviceGraph': '_frozen',
+
+   'BackReference': '_generators',
+   'BreadthFirst': '_generators',
+   'DepthFirst': '_generators',
+
+   'GenerateGraph': '_graphs',
+
+   'GraphIndex': '_index',
+   'TrackedDiGraph': '_index',
+
+   'Decorator': '_decorations',
+   'NodeDecorator': '_decorations',
+
+   'BackgroundWriter': '_readwrite',
+   'Compressions': '_readwrite',
+   'CSVSink': '_readwrite',
+   'DOTSink': '_readwrite',
+   'Exporter': '_readwrite',
+   'ExportSink': '_readwrite',
+   'JSONLinesSink': '_readwrite',
+   'StringUtils': '_readwrite',
+   'Reader': '_readwrite',
+   'Rewriter': '_readwrite',
+   'SQLiteStore': '_readwrite',
+   'Writer': '_readwrite',
+
+   'PyudevGraphs': '_structure',
+   'PyudevAggregateGraph': '_structure',
+   'SysfsTraversal': '_structure',
+
+   'GraphTable': '_table',
+
+   'holders': '_traversal',
+   'slaves': '_traversal',
+
+   'GraphUtils': '_utils',
+   'Dict': '_utils',
+   'ExtendedLookup': '_utils',
+
+   'EdgeTypeView': '_views',
+   'GraphViews': '_views',
+   'ReversedView': '_views',
+}
+
+__all__ = sorted(_SUBMODULES)
+
+
+def __getattr__(name):
+    """
+    Import the submodule which defines ``name`` and get ``name`` from it.
+
+    :param str name: the name
+    :returns: the value of the name
+    :raises AttributeError: if the name is not public
+    """
+    try:
+        submodule = _SUBMODULES[name]
+    except KeyError:
+        raise AttributeError(
+           "module %r has no attribute %r" % (__name__, name)
+        )
+    value = getattr(importlib.import_module('.' + submodule, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_SUBMODULES))
+
+
+# module level __getattr__ is available only from Python 3.7
+if sys.version_info < (3, 7): # pragma: no cover
+    for _name in __all__:
+        __getattr__(_name)
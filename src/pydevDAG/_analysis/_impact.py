@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2016  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+# Red Hat Author(s): Anne Mulhern <amulhern@redhat.com>
+
+"""
+    pydevDAG._analysis._impact
+    ==========================
+
+    The nodes affected by the failure of a set of nodes.
+
+    .. moduleauthor::  Anne Mulhern  <amulhern@redhat.com>
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from collections import defaultdict
+from collections import OrderedDict
+
+from .._errors import DAGValueError
+from .._index import GraphIndex
+
+
+class Impact(object):
+    """
+    The result of an impact analysis.
+
+    A node is affected if it is a proper ancestor of some source, that is,
+    if it is stacked, directly or indirectly, on a failed node.
+    """
+
+    def __init__(self, sources, causes, kinds, roots):
+        """
+        Initializer.
+
+        :param sources: the failed nodes, in order
+        :type sources: list of node
+        :param causes: map from affected nodes, in topological order, to a
+           bitset over the positions of the sources that affect them
+        :type causes: list of tuple of node * int
+        :param kinds: the kind of each affected node
+        :type kinds: dict of node * object
+        :param roots: the roots of the graph
+        :type roots: set of node
+        """
+        self.sources = sources
+        self._causes = dict(causes)
+        self.affected = [n for (n, _) in causes]
+
+        self.by_kind = defaultdict(list)
+        for node in self.affected:
+            self.by_kind[kinds[node]].append(node)
+        self.by_kind = dict(self.by_kind)
+
+        self.roots = [n for n in self.affected if n in roots]
+
+    def causes(self, node):
+        """
+        The sources which affect ``node``.
+
+        :param node: the node
+        :returns: the sources, in order, or an empty list if not affected
+        :rtype: list of node
+        """
+        digits = bin(self._causes.get(node, 0))[:1:-1]
+        return [s for (s, d) in zip(self.sources, digits) if d == '1']
+
+
+class ImpactAnalysis(object):
+    """
+    Computes the nodes affected by a set of failed nodes.
+    """
+    # pylint: disable=too-few-public-methods
+
+    @staticmethod
+    def impact(graph, sources, kind=None):
+        """
+        The nodes affected by the failure of ``sources``.
+
+        :param `DiGraph` graph: the graph
+        :param sources: the failed nodes
+        :type sources: iterable of node
+        :param kind: function from a node to its kind, or None for the
+           node's nodetype attribute
+        :type kind: node -> object or NoneType
+        :returns: the affected nodes, by kind, and their causes
+        :rtype: `Impact`
+
+        :raises DAGValueError: if a source is not in the graph
+        :raises DAGGraphError: if the graph has a cycle
+
+        The sets of sources below each node are propagated as bitsets in a
+        single pass over the nodes in reverse topological order, so the
+        cost does not depend on the number of sources, except through the
+        width of the bitsets.
+        """
+        sources = list(OrderedDict.fromkeys(sources))
+        missing = [s for s in sources if s not in graph]
+        if missing:
+            raise DAGValueError("sources %s not in graph" % missing)
+
+        if kind is None:
+            kind = lambda n: graph.node[n].get('nodetype')
+
+        index = GraphIndex.get(graph)
+        bits = dict((s, 1 << i) for (i, s) in enumerate(sources))
+        below = dict()
+        causes = []
+        for node in reversed(index.order):
+            node_causes = 0
+            for succ in graph.successors_iter(node):
+                node_causes |= below.get(succ, 0)
+            if node_causes:
+                causes.append((node, node_causes))
+            node_below = node_causes | bits.get(node, 0)
+            if node_below:
+                below[node] = node_below
+
+        causes.reverse()
+        kinds = dict((n, kind(n)) for (n, _) in causes)
+        return Impact(sources, causes, kinds, frozenset(index.roots))
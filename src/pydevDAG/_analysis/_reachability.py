@@ -0,0 +1,418 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2016  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+# Red Hat Author(s): Anne Mulhern <amulhern@redhat.com>
+
+"""
+    pydevDAG._analysis._reachability
+    ================================
+
+    Indexes answering whether one node is reachable from another.
+
+    .. moduleauthor::  Anne Mulhern  <amulhern@redhat.com>
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import abc
+import random
+import weakref
+
+import six
+
+from .._errors import DAGGraphError
+from .._errors import DAGValueError
+from .._index import GraphIndex
+
+
+def _members(bits, nodes):
+    """
+    The nodes whose positions are set in ``bits``.
+
+    :param int bits: a bitset over positions in ``nodes``
+    :param nodes: the nodes, by position
+    :type nodes: list of node
+    :rtype: set of node
+    """
+    digits = bin(bits)[:1:-1]
+    result = set()
+    position = digits.find('1')
+    while position != -1:
+        result.add(nodes[position])
+        position = digits.find('1', position + 1)
+    return result
+
+
+@six.add_metaclass(abc.ABCMeta)
+class Reachability(object):
+    """
+    An index answering whether there is a path from one node to another.
+
+    An index is obtained with get(), which builds it once for each
+    version of the graph's `GraphIndex` and each set of edge types
+    followed, so it is rebuilt exactly when the graph index is. Graphs with
+    at most ``BITSET_LIMIT`` nodes get a `BitsetReachability`, larger
+    graphs an `IntervalReachability`.
+
+    A node is not its own ancestor or descendant.
+    """
+
+    BITSET_LIMIT = 16384
+
+    _INDEXES = weakref.WeakKeyDictionary()
+
+    def __init__(self, index, edgetypes=None):
+        """
+        Initializer.
+
+        :param `GraphIndex` index: the index of the graph
+        :param edgetypes: the edge types to follow, or None for all
+        :type edgetypes: iterable of `EdgeType` or NoneType
+
+        :raises DAGGraphError: if the graph has a cycle
+        """
+        # the order of the graph is also an order of any of its subgraphs
+        self.nodes = index.order
+        self.positions = dict((n, i) for (i, n) in enumerate(self.nodes))
+        self._graph = weakref.ref(index.graph)
+
+        # the adjacency tables are plain dicts, which refer to no graph
+        if edgetypes is None:
+            self._tables = None
+        else:
+            self._tables = tuple(
+               [index.adjacency(t, reverse) for t in edgetypes] for \
+                  reverse in (False, True)
+            )
+
+    @classmethod
+    def get(cls, graph, edgetypes=None):
+        """
+        Get an up to date reachability index for ``graph``.
+
+        :param `DiGraph` graph: the graph
+        :param edgetypes: the edge types to follow, or None for all
+        :type edgetypes: iterable of `EdgeType` or NoneType
+        :rtype: `Reachability`
+
+        :raises DAGGraphError: if the graph has a cycle
+        """
+        if edgetypes is not None:
+            edgetypes = frozenset(edgetypes)
+        index = GraphIndex.get(graph)
+        results = cls._INDEXES.setdefault(index, dict())
+        try:
+            return results[edgetypes]
+        except KeyError:
+            if len(index.order) <= cls.BITSET_LIMIT:
+                result = BitsetReachability(index, edgetypes)
+            else:
+                result = IntervalReachability(index, edgetypes)
+            results[edgetypes] = result
+            return result
+
+    @property
+    def graph(self):
+        """
+        The graph indexed.
+
+        :raises DAGGraphError: if the graph no longer exists
+        """
+        graph = self._graph()
+        if graph is None: # pragma: no cover
+            raise DAGGraphError("indexed graph no longer exists")
+        return graph
+
+    def _successors(self, node):
+        """
+        Iterate over the successors of ``node`` along the edges followed.
+
+        :param node: the node
+        """
+        if self._tables is None:
+            return self.graph.successors_iter(node)
+        return (n for t in self._tables[0] for n in t.get(node, ()))
+
+    def _predecessors(self, node):
+        """
+        Iterate over the predecessors of ``node`` along the edges followed.
+
+        :param node: the node
+        """
+        if self._tables is None:
+            return self.graph.predecessors_iter(node)
+        return (n for t in self._tables[1] for n in t.get(node, ()))
+
+    def _position(self, node):
+        """
+        The position of ``node`` in the topological order.
+
+        :param node: the node
+        :rtype: int
+
+        :raises DAGValueError: if the node is not in the graph
+        """
+        try:
+            return self.positions[node]
+        except KeyError:
+            raise DAGValueError("node %s not in graph" % node)
+
+    @abc.abstractmethod
+    def reaches(self, source, target):
+        """
+        Whether there is a path from ``source`` to ``target``.
+
+        :param source: the source node
+        :param target: the target node
+        :rtype: bool
+
+        :raises DAGValueError: if a node is not in the graph
+        """
+        raise NotImplementedError() # pragma: no cover
+
+    @abc.abstractmethod
+    def descendants(self, node):
+        """
+        The nodes reachable from ``node``.
+
+        :param node: the node
+        :rtype: set of node
+
+        :raises DAGValueError: if the node is not in the graph
+        """
+        raise NotImplementedError() # pragma: no cover
+
+    @abc.abstractmethod
+    def ancestors(self, node):
+        """
+        The nodes from which ``node`` is reachable.
+
+        :param node: the node
+        :rtype: set of node
+
+        :raises DAGValueError: if the node is not in the graph
+        """
+        raise NotImplementedError() # pragma: no cover
+
+
+class BitsetReachability(Reachability):
+    """
+    The descendants of each node as a bitset over positions in the
+    topological order.
+
+    A query is a shift and a mask. Building takes time proportional to
+    the number of edges times the number of nodes divided by the word
+    size, and the bitsets take at most the square of the number of nodes
+    bits, which limits this index to small and medium graphs.
+    """
+
+    def __init__(self, index, edgetypes=None):
+        """
+        Initializer.
+
+        :param `GraphIndex` index: the index of the graph
+        :param edgetypes: the edge types to follow, or None for all
+        :type edgetypes: iterable of `EdgeType` or NoneType
+
+        :raises DAGGraphError: if the graph has a cycle
+        """
+        super(BitsetReachability, self).__init__(index, edgetypes)
+        successors = self._successors
+        positions = self.positions
+        descendants = [0] * len(self.nodes)
+        for (position, node) in reversed(list(enumerate(self.nodes))):
+            bits = 0
+            for succ in successors(node):
+                succ_position = positions[succ]
+                bits |= descendants[succ_position] | (1 << succ_position)
+            descendants[position] = bits
+        self._descendants = descendants
+        self._ancestors = None
+
+    def _get_ancestors(self):
+        """
+        The ancestors of each node as a bitset, computed on first use.
+
+        :rtype: list of int
+        """
+        if self._ancestors is None:
+            predecessors = self._predecessors
+            positions = self.positions
+            ancestors = [0] * len(self.nodes)
+            for (position, node) in enumerate(self.nodes):
+                bits = 0
+                for pred in predecessors(node):
+                    pred_position = positions[pred]
+                    bits |= ancestors[pred_position] | (1 << pred_position)
+                ancestors[position] = bits
+            self._ancestors = ancestors
+        return self._ancestors
+
+    def reaches(self, source, target):
+        bits = self._descendants[self._position(source)]
+        return (bits >> self._position(target)) & 1 == 1
+
+    def descendants(self, node):
+        return _members(self._descendants[self._position(node)], self.nodes)
+
+    def ancestors(self, node):
+        bits = self._get_ancestors()[self._position(node)]
+        return _members(bits, self.nodes)
+
+
+class IntervalReachability(Reachability):
+    """
+    Interval labels from several randomized post-order traversals.
+
+    If ``target`` is reachable from ``source`` then each interval of
+    ``target`` is contained in the corresponding interval of ``source``.
+    Most negative queries are answered by comparing the labels, in time
+    proportional to the number of labels. Other queries are answered by a
+    search that only enters nodes whose intervals contain those of the
+    target. The labels take space linear in the size of the graph.
+    """
+
+    LABELS = 3
+
+    def __init__(self, index, edgetypes=None):
+        """
+        Initializer.
+
+        :param `GraphIndex` index: the index of the graph
+        :param edgetypes: the edge types to follow, or None for all
+        :type edgetypes: iterable of `EdgeType` or NoneType
+
+        :raises DAGGraphError: if the graph has a cycle
+        """
+        super(IntervalReachability, self).__init__(index, edgetypes)
+        successors = self._successors
+        roots = index.roots_of(edgetypes)
+        randomizer = random.Random(len(self.nodes))
+        labels = [self._label(successors, roots, None)]
+        labels.extend(
+           self._label(successors, roots, randomizer) \
+              for _ in range(self.LABELS - 1)
+        )
+        self._labels = dict(
+           (n, tuple(l[n] for l in labels)) for n in self.nodes
+        )
+
+    @staticmethod
+    def _label(neighbours, roots, randomizer):
+        """
+        Label each node with an interval by a post-order traversal.
+
+        :param neighbours: function from a node to its successors
+        :type neighbours: node -> iterator of node
+        :param roots: the roots of the graph
+        :type roots: list of node
+        :param randomizer: source for shuffling the successors, or None
+        :type randomizer: `Random` or NoneType
+        :returns: map from nodes to low and post-order ranks
+        :rtype: dict of node * (tuple of int * int)
+        """
+        def successors(node):
+            """
+            The successors of ``node``, shuffled if there is a randomizer.
+            """
+            result = list(neighbours(node))
+            if randomizer is not None:
+                randomizer.shuffle(result)
+            return result
+
+        labels = dict()
+        started = set()
+        rank = 0
+        for root in roots:
+            started.add(root)
+            stack = [(root, iter(successors(root)))]
+            while stack:
+                (node, succs) = stack[-1]
+                for succ in succs:
+                    if succ not in started:
+                        started.add(succ)
+                        stack.append((succ, iter(successors(succ))))
+                        break
+                else:
+                    stack.pop()
+                    low = min(
+                       [rank] + \
+                       [labels[s][0] for s in neighbours(node)]
+                    )
+                    labels[node] = (low, rank)
+                    rank += 1
+        return labels
+
+    def _contains(self, source, target):
+        """
+        Whether each interval of ``source`` contains that of ``target``.
+
+        :param source: the source node
+        :param target: the target node
+        :rtype: bool
+        """
+        return all(
+           s_low <= t_low and t_rank <= s_rank for \
+              ((s_low, s_rank), (t_low, t_rank)) in \
+              zip(self._labels[source], self._labels[target])
+        )
+
+    def reaches(self, source, target):
+        self._position(source)
+        self._position(target)
+        if source == target or not self._contains(source, target):
+            return False
+
+        successors = self._successors
+        stack = [source]
+        seen = set(stack)
+        while stack:
+            for succ in successors(stack.pop()):
+                if succ == target:
+                    return True
+                if succ not in seen and self._contains(succ, target):
+                    seen.add(succ)
+                    stack.append(succ)
+        return False
+
+    def _search(self, node, neighbours):
+        """
+        The nodes reachable from ``node`` by ``neighbours``.
+
+        :param node: the node
+        :param neighbours: function from a node to its neighbours
+        :type neighbours: node -> iterator of node
+        :rtype: set of node
+        """
+        self._position(node)
+        result = set()
+        stack = [node]
+        while stack:
+            for other in neighbours(stack.pop()):
+                if other not in result:
+                    result.add(other)
+                    stack.append(other)
+        return result
+
+    def descendants(self, node):
+        return self._search(node, self._successors)
+
+    def ancestors(self, node):
+        return self._search(node, self._predecessors)
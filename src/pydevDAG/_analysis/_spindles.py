@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2016  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+# Red Hat Author(s): Anne Mulhern <amulhern@redhat.com>
+
+"""
+    pydevDAG._analysis._spindles
+    ============================
+
+    Signatures of the physical spindles on which each node depends.
+
+    .. moduleauthor::  Anne Mulhern  <amulhern@redhat.com>
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import weakref
+
+from .._attributes import NodeTypes
+from .._errors import DAGValueError
+from .._index import GraphIndex
+
+
+class SpindleSignatures(object):
+    """
+    For every node, a bitset over interned ids of the WWN nodes, made by
+    `SpindleGraphs`, which are reachable from it.
+
+    The signatures are computed in a single bottom-up pass over the nodes
+    in reverse topological order. Whether two nodes share a spindle is then
+    a single AND, and the spindles of a node are found in time
+    proportional to the number of its spindles.
+    """
+
+    _INDEXES = weakref.WeakKeyDictionary()
+
+    def __init__(self, graph, edgetypes=None):
+        """
+        Initializer.
+
+        :param `DiGraph` graph: the graph
+        :param edgetypes: the edge types to follow, or None for all
+        :type edgetypes: iterable of `EdgeType` or NoneType
+
+        :raises DAGGraphError: if the graph has a cycle
+        """
+        index = GraphIndex.get(graph)
+        self.spindles = [
+           n for n in index.order if \
+              graph.node[n].get('nodetype') is NodeTypes.WWN
+        ]
+        self.ids = dict((n, i) for (i, n) in enumerate(self.spindles))
+
+        if edgetypes is None:
+            successors = graph.successors_iter
+        else:
+            tables = [index.adjacency(t) for t in frozenset(edgetypes)]
+            successors = lambda n: [s for t in tables for s in t.get(n, ())]
+
+        signatures = dict()
+        for node in reversed(index.order):
+            signature = 0
+            for succ in successors(node):
+                signature |= signatures.get(succ, 0)
+            spindle_id = self.ids.get(node)
+            if spindle_id is not None:
+                signature |= 1 << spindle_id
+            if signature:
+                signatures[node] = signature
+        self._signatures = signatures
+        self._nodes = frozenset(index.order)
+        self._spindles_of = dict()
+
+    @classmethod
+    def get(cls, graph):
+        """
+        Get up to date signatures for ``graph``, following all edges.
+
+        :param `DiGraph` graph: the graph
+        :rtype: `SpindleSignatures`
+
+        :raises DAGGraphError: if the graph has a cycle
+        """
+        index = GraphIndex.get(graph)
+        result = cls._INDEXES.get(index)
+        if result is None:
+            result = cls(graph)
+            cls._INDEXES[index] = result
+        return result
+
+    def signature(self, node):
+        """
+        The signature of ``node``.
+
+        :param node: the node
+        :returns: a bitset over the ids of the spindles
+        :rtype: int
+
+        :raises DAGValueError: if the node is not in the graph
+        """
+        if node not in self._nodes:
+            raise DAGValueError("node %s not in graph" % node)
+        return self._signatures.get(node, 0)
+
+    def spindles_of(self, node):
+        """
+        The spindles which back ``node``.
+
+        :param node: the node
+        :returns: the WWN nodes, in id order
+        :rtype: list of node
+
+        :raises DAGValueError: if the node is not in the graph
+
+        The spindles of a node are found from the bits set in its
+        signature, in time proportional to their number, and are kept.
+        """
+        try:
+            return list(self._spindles_of[node])
+        except KeyError:
+            pass
+
+        signature = self.signature(node)
+        result = []
+        while signature:
+            lowest = signature & -signature
+            result.append(self.spindles[lowest.bit_length() - 1])
+            signature ^= lowest
+        self._spindles_of[node] = tuple(result)
+        return result
+
+    def share_spindles(self, node, other):
+        """
+        Whether ``node`` and ``other`` are backed by a common spindle.
+
+        :param node: a node
+        :param other: another node
+        :rtype: bool
+
+        :raises DAGValueError: if a node is not in the graph
+        """
+        return self.signature(node) & self.signature(other) != 0
@@ -54,6 +54,10 @@ class AttributeValue(object):
     def __copy__(self): # pragma: no cover
         return self
 
+    def __reduce__(self):
+        # the value is pickled as the module attribute named by its class
+        return self.__class__.__name__
+
 @six.add_metaclass(abc.ABCMeta)
 class AttributeValues(object):
     """
@@ -65,9 +69,33 @@ class AttributeValues(object):
     def values(cls):
         """
         Return a list of the values in the class.
+
+        The position of a value in the list is its code, so new values
+        must be added at the end.
         """
         raise NotImplementedError() # pragma: no cover
 
+    @classmethod
+    def _registry(cls):
+        """
+        Tables of the values of this class, built on first use.
+
+        :returns: map from names to values, map from values to codes, and
+           the values in code order
+        :rtype: tuple of dict * dict * tuple
+        """
+        try:
+            return cls.__dict__['_REGISTRY']
+        except KeyError:
+            values = tuple(cls.values())
+            registry = (
+               dict((str(v), v) for v in values),
+               dict((v, i) for (i, v) in enumerate(values)),
+               values
+            )
+            setattr(cls, '_REGISTRY', registry)
+            return registry
+
     @classmethod
     def get_value(cls, name):
         """
@@ -76,4 +104,27 @@ class AttributeValues(object):
         :returns: the type object that matches ``name`` or None
         :rtype: `NodeType` or NoneType
         """
-        return next((obj for obj in cls.values() if str(obj) == name), None)
+        return cls._registry()[0].get(name)
+
+    @classmethod
+    def get_code(cls, value):
+        """
+        Return the small integer code for ``value``.
+
+        :param `AttributeValue` value: the value
+        :returns: the code, or None if ``value`` is not a value of the class
+        :rtype: int or NoneType
+        """
+        return cls._registry()[1].get(value)
+
+    @classmethod
+    def from_code(cls, code):
+        """
+        Return the value for ``code``.
+
+        :param int code: the code
+        :returns: the value, or None if there is no value with ``code``
+        :rtype: `AttributeValue` or NoneType
+        """
+        values = cls._registry()[2]
+        return values[code] if 0 <= code < len(values) else None
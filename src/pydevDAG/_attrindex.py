@@ -0,0 +1,275 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2016  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+# Red Hat Author(s): Anne Mulhern <amulhern@redhat.com>
+
+"""
+    pydevDAG._attrindex
+    ===================
+
+    Hash indexes over the attributes of the nodes of a graph.
+
+    .. moduleauthor::  Anne Mulhern  <amulhern@redhat.com>
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import bisect
+import weakref
+
+import six
+
+from ._errors import DAGValueError
+from ._index import GraphIndex
+from ._utils import Dict
+
+
+class AttributeIndex(object):
+    """
+    An index from the values of one attribute, located by a list of keys
+    as for `Dict`, to the nodes of a graph that have them.
+
+    A node whose value is missing or unhashable is not indexed.
+
+    If the graph keeps a mutation count, as a `TrackedDiGraph` does, the
+    index is rebuilt before it is read whenever nodes or edges have been
+    added or removed since it was built.
+    """
+
+    _MISSING = object()
+
+    def __init__(self, keys, graph):
+        """
+        Initializer.
+
+        :param keys: the keys locating the attribute
+        :type keys: list of str
+        :param `DiGraph` graph: the graph
+        """
+        self.keys = tuple(keys)
+        self._accessor = Dict.accessor(keys, self._MISSING)
+        self._graph = weakref.ref(graph)
+        self.signature = None
+        self._nodes = dict()
+        self._values = dict()
+        self._strings = None
+        self.rebuild()
+
+    def rebuild(self):
+        """
+        Rebuild the index from the current attributes of the graph.
+        """
+        (self._nodes, self._values, self._strings) = (dict(), dict(), None)
+        graph = self._graph()
+        if graph is None: # pragma: no cover
+            return
+        self.signature = GraphIndex.signature_of(graph)
+        for (node, attrdict) in graph.nodes_iter(data=True):
+            self.update(node, attrdict)
+
+    def _current(self):
+        """
+        The nodes by value, rebuilt first if the graph has changed.
+
+        :rtype: dict of object * (set of node)
+        """
+        graph = self._graph()
+        if graph is not None and \
+           GraphIndex.signature_of(graph) != self.signature:
+            self.rebuild()
+        return self._nodes
+
+    def update(self, node, attrdict):
+        """
+        Index ``node`` by its current value.
+
+        :param node: the node
+        :param attrdict: the attributes of the node, or None if removed
+        :type attrdict: dict or NoneType
+        """
+        value = self._MISSING if attrdict is None else self._accessor(attrdict)
+        old = self._values.get(node, self._MISSING)
+        if old is not self._MISSING:
+            if old == value:
+                return
+            self._remove(node, old)
+
+        if value is self._MISSING:
+            return
+        try:
+            nodes = self._nodes.setdefault(value, set())
+        except TypeError:
+            return
+        if not nodes and isinstance(value, six.string_types):
+            self._strings = None
+        nodes.add(node)
+        self._values[node] = value
+
+    def _remove(self, node, value):
+        """
+        Remove ``node`` from the entry for ``value``.
+
+        :param node: the node
+        :param object value: the value by which the node is indexed
+        """
+        del self._values[node]
+        nodes = self._nodes[value]
+        nodes.discard(node)
+        if not nodes:
+            del self._nodes[value]
+            if isinstance(value, six.string_types):
+                self._strings = None
+
+    def lookup(self, value):
+        """
+        The nodes whose value equals ``value``.
+
+        :param object value: the value
+        :rtype: frozenset of node
+        """
+        try:
+            return frozenset(self._current().get(value, ()))
+        except TypeError:
+            return frozenset()
+
+    def count(self, value):
+        """
+        The number of nodes whose value equals ``value``.
+
+        :param object value: the value
+        :rtype: int
+        """
+        try:
+            return len(self._current().get(value, ()))
+        except TypeError:
+            return 0
+
+    def values(self):
+        """
+        The distinct values indexed.
+
+        :rtype: list of object
+        """
+        return list(self._current())
+
+    def prefix(self, prefix):
+        """
+        The nodes whose value is a string starting with ``prefix``.
+
+        :param str prefix: the prefix
+        :rtype: frozenset of node
+
+        The distinct string values are kept sorted, so the cost is
+        logarithmic in their number, plus the size of the result. The
+        sorted values are rebuilt after a string value is added or removed.
+        """
+        nodes = self._current()
+        if self._strings is None:
+            self._strings = sorted(
+               v for v in nodes if isinstance(v, six.string_types)
+            )
+        strings = self._strings
+        result = set()
+        position = bisect.bisect_left(strings, prefix)
+        while position < len(strings) and \
+           strings[position].startswith(prefix):
+            result.update(nodes[strings[position]])
+            position += 1
+        return frozenset(result)
+
+
+class AttributeIndexes(object):
+    """
+    The attribute indexes declared for each graph.
+
+    Indexes are declared once for a graph, and are kept up to date as its
+    nodes are decorated by `GenerateGraph` or `Decorator`, and, if the
+    graph keeps a mutation count, as nodes are added or removed. Code that
+    changes the attributes of nodes in some other way, or that adds or
+    removes nodes of a graph without a count, must call update() for the
+    nodes it changes, and code that renames nodes must call rebuild().
+    """
+
+    _INDEXES = weakref.WeakKeyDictionary()
+
+    @classmethod
+    def declare(cls, graph, keys):
+        """
+        Declare an index over the attribute located by ``keys``.
+
+        :param `DiGraph` graph: the graph
+        :param keys: the keys locating the attribute
+        :type keys: list of str
+        :returns: the index, built from the current attributes
+        :rtype: `AttributeIndex`
+
+        Declaring an index that already exists returns that index.
+        """
+        indexes = cls._INDEXES.setdefault(graph, dict())
+        keys = tuple(keys)
+        index = indexes.get(keys)
+        if index is None:
+            index = AttributeIndex(keys, graph)
+            indexes[keys] = index
+        return index
+
+    @classmethod
+    def get(cls, graph, keys):
+        """
+        Get the index over the attribute located by ``keys``.
+
+        :param `DiGraph` graph: the graph
+        :param keys: the keys locating the attribute
+        :type keys: list of str
+        :rtype: `AttributeIndex`
+
+        :raises DAGValueError: if no such index has been declared
+        """
+        try:
+            return cls._INDEXES[graph][tuple(keys)]
+        except KeyError:
+            raise DAGValueError("no index declared for %s" % list(keys))
+
+    @classmethod
+    def update(cls, graph, nodes):
+        """
+        Bring the indexes of ``graph`` up to date for ``nodes``.
+
+        :param `DiGraph` graph: the graph
+        :param nodes: the nodes which have changed or been removed
+        :type nodes: iterable of node
+        """
+        indexes = cls._INDEXES.get(graph)
+        if not indexes:
+            return
+        for node in nodes:
+            attrdict = graph.node.get(node)
+            for index in indexes.values():
+                index.update(node, attrdict)
+
+    @classmethod
+    def rebuild(cls, graph):
+        """
+        Rebuild the indexes of ``graph`` from the current attributes.
+
+        :param `DiGraph` graph: the graph
+        """
+        for index in cls._INDEXES.get(graph, dict()).values():
+            index.rebuild()
@@ -48,13 +48,28 @@ class _Config(object):
 
         :param str path: the path of the configuration file
 
+        The file is read when the configuration is first used.
+        """
+        self._path = path
+        self._config = None
+
+    @property
+    def config(self):
+        """
+        The configuration.
+
+        :returns: the configuration read from the file
+        :rtype: dict
+
         :raises DAGError: on unusable path
         """
-        try:
-            with open(path) as instream:
-                self.config = json.load(instream)
-        except (ValueError, EnvironmentError) as err: # pragma: no cover
-            raise DAGValueError(err)
+        if self._config is None:
+            try:
+                with open(self._path) as instream:
+                    self._config = json.load(instream)
+            except (ValueError, EnvironmentError) as err: # pragma: no cover
+                raise DAGValueError(err)
+        return self._config
 
     def get_node_decoration_spec(self):
         """
@@ -34,6 +34,9 @@ from __future__ import unicode_literals
 
 import networkx as nx
 
+from .._attrindex import AttributeIndexes
+from .._index import GraphIndex
+
 
 class Decorator(object):
     """
@@ -65,6 +68,13 @@ class Decorator(object):
         """
         cls._decorate(graph, properties, nx.set_node_attributes)
 
+        if any(not isinstance(v, dict) for v in properties.values()):
+            nodes = graph.nodes()
+        else:
+            nodes = set(n for v in properties.values() for n in v)
+        AttributeIndexes.update(graph, nodes)
+        GraphIndex.discard_orderings(graph)
+
     @classmethod
     def decorate_edges(cls, graph, properties):
         """
@@ -0,0 +1,703 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2016  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+# Red Hat Author(s): Anne Mulhern <amulhern@redhat.com>
+
+"""
+    pydevDAG._frozen
+    ================
+
+    A compact, read-only representation of a graph.
+
+    .. moduleauthor::  Anne Mulhern  <amulhern@redhat.com>
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from array import array
+from collections import defaultdict
+from collections import deque
+
+from ._attributes import EdgeTypes
+from ._errors import DAGEnvironmentError
+from ._errors import DAGGraphError
+from ._errors import DAGValueError
+from ._index import GraphIndex
+from ._index import TrackedDiGraph
+
+try:
+    from collections.abc import Mapping
+except ImportError: # pragma: no cover
+    from collections import Mapping # pylint: disable=deprecated-class
+
+try:
+    import numpy
+except ImportError: # pragma: no cover
+    numpy = None # pylint: disable=invalid-name
+
+
+# typecodes of the arrays of node ids and of edge type codes
+_IDS = 'i'
+_CODES = 'b'
+
+# the code of an edge without an edge type
+_NO_EDGETYPE = -1
+
+
+class _Adjacency(object):
+    """
+    Compressed sparse row adjacency in one direction.
+
+    The neighbours of the node with id i are the ids in
+    ``targets[offsets[i]:offsets[i + 1]]``, and the edge type codes of the
+    edges to them are in the same positions in ``codes``.
+    """
+    # pylint: disable=too-few-public-methods
+
+    def __init__(self, offsets, targets, codes):
+        """
+        Initializer.
+
+        :param array offsets: start of each node's neighbours in targets
+        :param array targets: ids of the neighbours
+        :param array codes: edge type codes, parallel to targets
+        """
+        self.offsets = offsets
+        self.targets = targets
+        self.codes = codes
+
+    @classmethod
+    def build(cls, names, ids, edges_of, codes_of):
+        """
+        Build the adjacency.
+
+        :param names: the nodes, in id order
+        :type names: list of node
+        :param ids: map from nodes to ids
+        :type ids: dict of node * int
+        :param edges_of: function from a node to its neighbours and edge data
+        :type edges_of: node -> iterable of tuple of node * dict
+        :param codes_of: function from edge types to codes or None
+        :type codes_of: `EdgeType` -> (int or NoneType)
+        :rtype: `_Adjacency`
+        """
+        offsets = array(_IDS, [0])
+        targets = array(_IDS)
+        codes = array(_CODES)
+        for name in names:
+            for (other, data) in edges_of(name):
+                targets.append(ids[other])
+                code = codes_of(data.get('edgetype'))
+                codes.append(_NO_EDGETYPE if code is None else code)
+            offsets.append(len(targets))
+        return cls(offsets, targets, codes)
+
+    def ends(self):
+        """
+        The ids of the nodes with no neighbours other than themselves.
+
+        :rtype: list of int
+        """
+        (offsets, targets) = (self.offsets, self.targets)
+        return [
+           i for (i, (start, stop)) in enumerate(zip(offsets, offsets[1:])) \
+              if start == stop or targets[start:stop].count(i) == stop - start
+        ]
+
+    def degrees(self):
+        """
+        The number of neighbours of each node, in id order.
+
+        :rtype: list of int
+        """
+        offsets = self.offsets
+        return [stop - start for (start, stop) in zip(offsets, offsets[1:])]
+
+    def degree(self, node_id):
+        """
+        The number of neighbours of the node with id ``node_id``.
+
+        :param int node_id: the id
+        :rtype: int
+        """
+        return self.offsets[node_id + 1] - self.offsets[node_id]
+
+    def neighbours(self, node_id):
+        """
+        The ids of the neighbours of the node with id ``node_id``.
+
+        :param int node_id: the id
+        :rtype: array of int
+        """
+        return self.targets[self.offsets[node_id]:self.offsets[node_id + 1]]
+
+    def edges(self, node_id):
+        """
+        The ids of the neighbours and the edge type codes.
+
+        :param int node_id: the id
+        :rtype: iterator of tuple of int * int
+        """
+        (start, stop) = (self.offsets[node_id], self.offsets[node_id + 1])
+        return zip(self.targets[start:stop], self.codes[start:stop])
+
+
+class _AdjacencyView(Mapping):
+    """
+    A read-only networkx adjacency, from nodes to their neighbours and the
+    data of the edges to them, computed from the arrays as it is read.
+    """
+
+    def __init__(self, graph, adjacency):
+        """
+        Initializer.
+
+        :param `FrozenDeviceGraph` graph: the graph
+        :param `_Adjacency` adjacency: the adjacency in one direction
+        """
+        self._graph = graph
+        self._adjacency = adjacency
+
+    def __getitem__(self, node):
+        graph = self._graph
+        names = graph.names
+        return dict(
+           (names[i], graph.edge_data(c)) for (i, c) in \
+              self._adjacency.edges(graph.ids[node])
+        )
+
+    def __iter__(self):
+        return iter(self._graph.names)
+
+    def __len__(self):
+        return len(self._graph.names)
+
+    def __contains__(self, node):
+        return node in self._graph
+
+
+class _FrozenIndex(GraphIndex):
+    """
+    The index of a `FrozenDeviceGraph`, computed from its arrays rather
+    than through its networkx interface.
+    """
+    # pylint: disable=protected-access
+
+    @staticmethod
+    def _ends(graph):
+        names = graph.names
+        return (
+           [names[i] for i in graph._pred.ends()],
+           [names[i] for i in graph._succ.ends()]
+        )
+
+    def _sort(self):
+        graph = self.graph
+        (offsets, targets) = (graph._succ.offsets, graph._succ.targets)
+        in_degrees = graph._pred.degrees()
+        ready = deque(i for (i, d) in enumerate(in_degrees) if d == 0)
+        levels = [0] * len(graph)
+        order = []
+        while ready:
+            node_id = ready.popleft()
+            order.append(node_id)
+            level = levels[node_id] + 1
+            for succ in targets[offsets[node_id]:offsets[node_id + 1]]:
+                if levels[succ] < level:
+                    levels[succ] = level
+                in_degrees[succ] -= 1
+                if in_degrees[succ] == 0:
+                    ready.append(succ)
+
+        if len(order) != len(graph):
+            raise DAGGraphError("graph has a cycle")
+
+        names = graph.names
+        self._order = [names[i] for i in order]
+        self._levels = dict(zip(names, levels))
+
+    def _neighbours(self, reverse, edgetypes):
+        if edgetypes is not None:
+            return super(_FrozenIndex, self)._neighbours(reverse, edgetypes)
+
+        graph = self.graph
+        (names, ids) = (graph.names, graph.ids)
+        adjacency = graph._pred if reverse else graph._succ
+        (offsets, targets) = (adjacency.offsets, adjacency.targets)
+
+        def neighbours(node):
+            """
+            The neighbours of ``node``, read from the arrays.
+            """
+            i = ids[node]
+            return [names[t] for t in targets[offsets[i]:offsets[i + 1]]]
+
+        return neighbours
+
+    def _get_adjacencies(self):
+        # pylint: disable=too-many-locals
+        if self._adjacencies is None:
+            graph = self.graph
+            (names, adjacency) = (graph.names, graph._succ)
+            (offsets, targets) = (adjacency.offsets, adjacency.targets)
+            edgetypes = dict(
+               (c, graph.edge_data(c).get('edgetype')) \
+                  for c in frozenset(adjacency.codes)
+            )
+            successors = defaultdict(lambda: defaultdict(list))
+            predecessors = defaultdict(lambda: defaultdict(list))
+            codes = adjacency.codes
+            for (source, start, stop) in zip(names, offsets, offsets[1:]):
+                for (target_id, code) in \
+                   zip(targets[start:stop], codes[start:stop]):
+                    edgetype = edgetypes[code]
+                    target = names[target_id]
+                    successors[edgetype][source].append(target)
+                    predecessors[edgetype][target].append(source)
+            self._adjacencies = tuple(
+               dict((k, dict(v)) for (k, v) in adjacencies.items()) \
+                  for adjacencies in (successors, predecessors)
+            )
+        return self._adjacencies
+
+
+class FrozenDeviceGraph(object):
+    """
+    An immutable graph with integer node ids and compressed sparse row
+    successor and predecessor arrays.
+
+    It implements the read-only part of the networkx 1.x DiGraph interface
+    used by the generators, `GraphIndex`, `GraphUtils` and many networkx
+    algorithms, so it can be passed to them in place of the graph it was
+    built from. The index used by traversals is computed directly from the
+    arrays. Node attribute dicts are shared with that graph. Of the edge
+    attributes, only the edge type is kept, as its `EdgeTypes` code in an
+    array parallel to the neighbours.
+    """
+    # pylint: disable=too-many-public-methods
+
+    # pylint: disable=too-many-public-methods
+
+    # changes only when reversed in place
+    mutations = 0
+
+    # traversals use an index computed from the arrays
+    index_class = _FrozenIndex
+
+    def __init__(self, graph):
+        """
+        Initializer.
+
+        :param `DiGraph` graph: the graph to freeze
+        """
+        names = list(graph.nodes_iter())
+        ids = dict((n, i) for (i, n) in enumerate(names))
+        codes_of = EdgeTypes.get_code
+
+        self._succ = _Adjacency.build(
+           names,
+           ids,
+           lambda n: ((t, d) for (_, t, d) in graph.out_edges_iter(n, True)),
+           codes_of
+        )
+        self._pred = _Adjacency.build(
+           names,
+           ids,
+           lambda n: ((s, d) for (s, _, d) in graph.in_edges_iter(n, True)),
+           codes_of
+        )
+        self.names = names
+        self.ids = ids
+        self.node = dict((n, graph.node[n]) for n in names)
+        self.graph = dict(graph.graph)
+
+    def _reversed(self):
+        """
+        A frozen graph with the edges reversed, sharing this one's arrays.
+
+        :rtype: `FrozenDeviceGraph`
+        """
+        # pylint: disable=protected-access
+        result = self.__class__.__new__(self.__class__)
+        result.names = self.names
+        result.ids = self.ids
+        result.node = self.node
+        result.graph = dict(self.graph)
+        (result._succ, result._pred) = (self._pred, self._succ)
+        return result
+
+    def reverse(self, copy=True):
+        """
+        Reverse the graph.
+
+        :param bool copy: if False, reverse this graph in place
+        :returns: the reversed graph, sharing this graph's arrays
+        :rtype: `FrozenDeviceGraph`
+
+        Reversing in place only exchanges the successor and predecessor
+        arrays, and counts as a mutation, so that any index of the graph is
+        rebuilt. networkx algorithms do so temporarily.
+        """
+        if copy:
+            return self._reversed()
+        (self._succ, self._pred) = (self._pred, self._succ)
+        self.mutations += 1
+        return self
+
+    def to_graph(self):
+        """
+        Build a networkx graph equal to this one.
+
+        :rtype: `TrackedDiGraph`
+        """
+        graph = TrackedDiGraph()
+        graph.graph.update(self.graph)
+        for name in self.names:
+            graph.add_node(name, attr_dict=self.node[name])
+        graph.add_edges_from(self.edges_iter(data=True))
+        return graph
+
+    def arrays(self):
+        """
+        The arrays of the graph as NumPy arrays, without copying.
+
+        :returns: offsets, targets and codes for successors and predecessors
+        :rtype: dict of str * `ndarray`
+
+        :raises DAGEnvironmentError: if NumPy is not available
+        """
+        if numpy is None: # pragma: no cover
+            raise DAGEnvironmentError("NumPy is not available")
+
+        result = dict()
+        for (prefix, adjacency) in (('succ', self._succ), ('pred', self._pred)):
+            for name in ('offsets', 'targets', 'codes'):
+                values = getattr(adjacency, name)
+                result['%s_%s' % (prefix, name)] = numpy.frombuffer(
+                   values,
+                   dtype=numpy.dtype(values.typecode)
+                )
+        return result
+
+    def successor_ids(self, node_id):
+        """
+        The ids of the successors of the node with id ``node_id``.
+
+        :param int node_id: the id
+        :rtype: array of int
+        """
+        return self._succ.neighbours(node_id)
+
+    def predecessor_ids(self, node_id):
+        """
+        The ids of the predecessors of the node with id ``node_id``.
+
+        :param int node_id: the id
+        :rtype: array of int
+        """
+        return self._pred.neighbours(node_id)
+
+    def __iter__(self):
+        return iter(self.names)
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, node):
+        return node in self.ids
+
+    def __getitem__(self, node):
+        """
+        The successors of ``node``, with the data of the edges to them.
+
+        :param node: the node
+        :rtype: dict of node * dict
+
+        :raises KeyError: if ``node`` is not in the graph
+        """
+        return self.succ[node]
+
+    @property
+    def succ(self):
+        """
+        The successors of each node, with the data of the edges to them.
+
+        :rtype: Mapping of node * (dict of node * dict)
+        """
+        return _AdjacencyView(self, self._succ)
+
+    adj = succ
+
+    @property
+    def pred(self):
+        """
+        The predecessors of each node, with the data of the edges from them.
+
+        :rtype: Mapping of node * (dict of node * dict)
+        """
+        return _AdjacencyView(self, self._pred)
+
+    def has_node(self, node):
+        """
+        Whether ``node`` is in the graph.
+
+        :param node: the node
+        :rtype: bool
+        """
+        return self._is_node(node)
+
+    def _is_node(self, nbunch):
+        """
+        Whether ``nbunch`` is a single node of the graph.
+
+        :param nbunch: a node, a list of nodes, or None
+        :rtype: bool
+        """
+        try:
+            return nbunch in self.ids
+        except TypeError:
+            return False
+
+    def _degrees(self, nbunch, weight, degree):
+        """
+        The degrees of the nodes in ``nbunch``.
+
+        :param nbunch: a node, a list of nodes, or None for all nodes
+        :param weight: must be None, as edge weights are not kept
+        :param degree: function from a node id to its degree
+        :type degree: int -> int
+        :returns: the degree of a node, or a map from nodes to degrees
+        :rtype: int or dict of node * int
+
+        :raises DAGValueError: if ``weight`` is not None
+        """
+        if weight is not None:
+            raise DAGValueError("a frozen graph keeps no edge weights")
+        if self._is_node(nbunch):
+            return degree(self.ids[nbunch])
+        ids = self.ids
+        return dict((n, degree(ids[n])) for n in self._nbunch(nbunch))
+
+    def degree(self, nbunch=None, weight=None):
+        """
+        The number of edges at the nodes in ``nbunch``.
+
+        :param nbunch: a node, a list of nodes, or None for all nodes
+        :param weight: must be None, as edge weights are not kept
+        :returns: the degree of a node, or a map from nodes to degrees
+        :rtype: int or dict of node * int
+        """
+        (succ, pred) = (self._succ, self._pred)
+        return self._degrees(
+           nbunch,
+           weight,
+           lambda i: succ.degree(i) + pred.degree(i)
+        )
+
+    def in_degree(self, nbunch=None, weight=None):
+        """
+        The number of edges entering the nodes in ``nbunch``.
+
+        :param nbunch: a node, a list of nodes, or None for all nodes
+        :param weight: must be None, as edge weights are not kept
+        :returns: the degree of a node, or a map from nodes to degrees
+        :rtype: int or dict of node * int
+        """
+        return self._degrees(nbunch, weight, self._pred.degree)
+
+    def out_degree(self, nbunch=None, weight=None):
+        """
+        The number of edges leaving the nodes in ``nbunch``.
+
+        :param nbunch: a node, a list of nodes, or None for all nodes
+        :param weight: must be None, as edge weights are not kept
+        :returns: the degree of a node, or a map from nodes to degrees
+        :rtype: int or dict of node * int
+        """
+        return self._degrees(nbunch, weight, self._succ.degree)
+
+    @staticmethod
+    def is_directed():
+        """
+        A frozen graph is always directed.
+        """
+        return True
+
+    @staticmethod
+    def is_multigraph():
+        """
+        A frozen graph is never a multigraph.
+        """
+        return False
+
+    def number_of_nodes(self):
+        """
+        The number of nodes.
+        """
+        return len(self.names)
+
+    def number_of_edges(self):
+        """
+        The number of edges.
+        """
+        return len(self._succ.targets)
+
+    def nodes_iter(self, data=False):
+        """
+        Iterate over the nodes.
+
+        :param bool data: if True, yield pairs of node and attributes
+        """
+        if data:
+            return ((n, self.node[n]) for n in self.names)
+        return iter(self.names)
+
+    def nodes(self, data=False):
+        """
+        The nodes.
+
+        :param bool data: if True, pairs of node and attributes
+        """
+        return list(self.nodes_iter(data))
+
+    def successors(self, node):
+        """
+        The successors of ``node``.
+
+        :param node: the node
+        :rtype: list of node
+        """
+        names = self.names
+        return [names[i] for i in self._succ.neighbours(self.ids[node])]
+
+    def predecessors(self, node):
+        """
+        The predecessors of ``node``.
+
+        :param node: the node
+        :rtype: list of node
+        """
+        names = self.names
+        return [names[i] for i in self._pred.neighbours(self.ids[node])]
+
+    def successors_iter(self, node):
+        """
+        Iterate over the successors of ``node``.
+
+        :param node: the node
+        """
+        return iter(self.successors(node))
+
+    def predecessors_iter(self, node):
+        """
+        Iterate over the predecessors of ``node``.
+
+        :param node: the node
+        """
+        return iter(self.predecessors(node))
+
+    neighbors = successors
+    neighbors_iter = successors_iter
+
+    def has_edge(self, source, target):
+        """
+        Whether there is an edge from ``source`` to ``target``.
+
+        :param source: the source node
+        :param target: the target node
+        :rtype: bool
+        """
+        try:
+            (source_id, target_id) = (self.ids[source], self.ids[target])
+        except KeyError:
+            return False
+        return target_id in self._succ.neighbours(source_id)
+
+    @staticmethod
+    def edge_data(code):
+        """
+        The edge data for an edge type code.
+
+        :param int code: the code
+        :rtype: dict
+        """
+        if code == _NO_EDGETYPE:
+            return dict()
+        return {'edgetype': EdgeTypes.from_code(code)}
+
+    def _edges(self, adjacency, node, data, outgoing):
+        """
+        Iterate over the edges at ``node`` in one direction.
+
+        :param `_Adjacency` adjacency: the adjacency to use
+        :param node: the node
+        :param bool data: if True, include the edge data
+        :param bool outgoing: if True, ``node`` is the source of the edges
+        """
+        names = self.names
+        for (other, code) in adjacency.edges(self.ids[node]):
+            edge = (node, names[other]) if outgoing else (names[other], node)
+            yield edge + (self.edge_data(code),) if data else edge
+
+    def out_edges_iter(self, nbunch=None, data=False):
+        """
+        Iterate over the edges leaving the nodes in ``nbunch``.
+
+        :param nbunch: a node, a list of nodes, or None for all nodes
+        :param bool data: if True, include the edge data
+        """
+        for node in self._nbunch(nbunch):
+            for edge in self._edges(self._succ, node, data, True):
+                yield edge
+
+    def in_edges_iter(self, nbunch=None, data=False):
+        """
+        Iterate over the edges entering the nodes in ``nbunch``.
+
+        :param nbunch: a node, a list of nodes, or None for all nodes
+        :param bool data: if True, include the edge data
+        """
+        for node in self._nbunch(nbunch):
+            for edge in self._edges(self._pred, node, data, False):
+                yield edge
+
+    edges_iter = out_edges_iter
+
+    def edges(self, nbunch=None, data=False):
+        """
+        The edges leaving the nodes in ``nbunch``.
+
+        :param nbunch: a node, a list of nodes, or None for all nodes
+        :param bool data: if True, include the edge data
+        """
+        return list(self.out_edges_iter(nbunch, data))
+
+    def _nbunch(self, nbunch):
+        """
+        The nodes in ``nbunch``.
+
+        :param nbunch: a node, a list of nodes, or None for all nodes
+        :rtype: list of node
+        """
+        if nbunch is None:
+            return self.names
+        if self._is_node(nbunch):
+            return [nbunch]
+        return [n for n in nbunch if n in self.ids]
@@ -28,3 +28,4 @@
 
 from ._breadth import BreadthFirst
 from ._depth import DepthFirst
+from ._reference import BackReference
@@ -28,17 +28,64 @@
 
 from collections import deque
 
-from .._utils import GraphUtils
+import itertools
+
+from .._errors import DAGValueError
+
+from ._cursor import Cursors
+from ._reference import BackReference
+from ._utils import TraversalUtils
 
 
 class BreadthFirst(object):
     """
     A depth-first traversal of the graph.
     """
-    # pylint: disable=too-few-public-methods
+
+    @staticmethod
+    def _walk(children, nodeinfos, visited, max_depth):
+        """
+        Yield the node infos in breadth first order from a queue.
+
+        :param children: function from a node to its sorted children
+        :type children: str -> list of str
+        :param nodeinfos: the node infos to start from, consumed
+        :type nodeinfos: deque of tuple of int * str * bool
+        :param visited: the nodes already yielded, or None if not shared
+        :type visited: set of str or NoneType
+        :param max_depth: the depth below which nodes are not visited
+        :type max_depth: int or NoneType
+
+        When a node info is yielded, ``nodeinfos`` holds exactly the node
+        infos that remain to be yielded.
+        """
+        while len(nodeinfos) != 0:
+            info = nodeinfos.popleft()
+            (depth, node, last) = info
+            if visited is not None:
+                if node in visited:
+                    yield (depth, BackReference(node), last)
+                    continue
+                visited.add(node)
+
+            if depth != max_depth:
+                successors = children(node)
+                nodeinfos.extend(
+                   (depth + 1, s, s is successors[-1]) for s in successors
+                )
+            yield info
 
     @classmethod
-    def breadth_first(cls, graph, key_func, nodeinfos):
+    def breadth_first(
+       cls,
+       graph,
+       key_func,
+       nodeinfos,
+       shared=False,
+       max_depth=None,
+       reverse=False,
+       edgetypes=None
+    ):
         """
         Do a breadth first search from nodes.
 
@@ -47,30 +94,280 @@ class BreadthFirst(object):
         :type key_func: str -> object
         :param nodeinfos: the node infos to start from
         :type nodeinfos: deque of tuple of int * str * bool
+        :param bool shared: if True, yield the subtree of a node only once
+        :param max_depth: the greatest depth to visit, or None for no limit
+        :type max_depth: int or NoneType
+        :param bool reverse: if True, follow edges from target to source
+        :param edgetypes: the edge types to follow, or None for all
+        :type edgetypes: iterable of `EdgeType` or NoneType
+
+        If ``shared`` is True, a node reached again after it has been
+        yielded is yielded as a BackReference, and its successors are not
+        visited again, so the output is linear in the size of the graph.
+
+        Edges not of ``edgetypes`` and nodes deeper than ``max_depth`` are
+        pruned as the walk proceeds. The graph is never copied or reversed;
+        a view is traversed as the graph it views.
         """
-        while len(nodeinfos) != 0:
-            info = nodeinfos.popleft()
-            (depth, node, _) = info
-            successors = sorted(graph.successors(node), key=key_func)
-            nodeinfos.extend(
-               (depth + 1, s, s is successors[-1]) for s in successors
-            )
-            yield info
+        # pylint: disable=too-many-arguments
+        resolved = TraversalUtils.resolve(graph, reverse, edgetypes)
+        return cls._walk(
+           TraversalUtils.children(resolved, key_func),
+           nodeinfos,
+           set() if shared else None,
+           max_depth
+        )
+
+    @staticmethod
+    def _roots(resolved, key_func, sources):
+        """
+        The node infos for the nodes to start from.
+
+        :param tuple resolved: the graph, as resolved by `TraversalUtils`
+        :param key_func: key function to allow sorting of nodes
+        :type key_func: str -> object
+        :param sources: the nodes to start from, or None
+        :type sources: list of str or NoneType
+        :rtype: deque of tuple of int * str * bool
+        """
+        roots = TraversalUtils.start_nodes(resolved, key_func, sources)
+        return deque((0, r, r is roots[-1]) for r in roots)
 
     @classmethod
-    def nodes(cls, graph, key_func):
+    def nodes(
+       cls,
+       graph,
+       key_func,
+       shared=False,
+       sources=None,
+       max_depth=None,
+       reverse=False,
+       edgetypes=None
+    ):
         """
         Yield the nodes in order, along with their depth.
 
         :param DiGraph graph: the graph, with nodes
         :param key_func: key function to allow sorting of nodes
         :type key_func: str -> object
+        :param bool shared: if True, yield the subtree of a node only once
+        :param sources: the nodes to start from, in order, or None for the
+           sorted roots, or leaves if ``reverse`` is True, of the graph with
+           only the edges of ``edgetypes``
+        :type sources: list of str or NoneType
+        :param max_depth: the greatest depth to visit, or None for no limit
+        :type max_depth: int or NoneType
+        :param bool reverse: if True, follow edges from target to source
+        :param edgetypes: the edge types to follow, or None for all
+        :type edgetypes: iterable of `EdgeType` or NoneType
 
         Each returned value has type tuple of node * int.
+
+        :raises DAGValueError: if a source is not in the graph
+        """
+        # pylint: disable=too-many-arguments
+        resolved = TraversalUtils.resolve(graph, reverse, edgetypes)
+        return cls._walk(
+           TraversalUtils.children(resolved, key_func),
+           cls._roots(resolved, key_func, sources),
+           set() if shared else None,
+           max_depth
+        )
+
+    @staticmethod
+    def _level(children, heights, roots, depth, start, path):
         """
-        roots = sorted(GraphUtils.get_roots(graph), key=key_func)
-        return cls.breadth_first(
-           graph,
-           key_func,
-           deque((0, r, r is roots[-1]) for r in roots)
+        Yield the node infos at ``depth`` in breadth first order.
+
+        :param children: function from a node to its sorted children
+        :type children: str -> list of str
+        :param heights: map from nodes to the lengths of the longest paths
+           from them
+        :type heights: dict of str * int
+        :param roots: the nodes the traversal starts from
+        :type roots: list of str
+        :param int depth: the depth of the level
+        :param start: the path from a root to the node to start from, or
+           the empty list to start from the first node
+        :type start: list of str
+        :param path: kept the path from a root to the node last yielded
+        :type path: list of str
+
+        :raises DAGValueError: if ``start`` is not in the graph
+
+        The nodes are found by a depth first search, limited to ``depth``,
+        which does not enter a node unless a path from it reaches that
+        depth. So the nodes visited between two nodes at ``depth`` are
+        those on the paths to them.
+        """
+        # pylint: disable=too-many-arguments
+        # each entry is a list of sorted nodes and the index of the node
+        # on the path
+        stack = []
+        nodes = roots
+        for node in start:
+            try:
+                stack.append([nodes, nodes.index(node)])
+            except (TypeError, ValueError):
+                raise DAGValueError("cursor does not match the graph")
+            nodes = children(node)
+        if stack:
+            stack[-1][1] -= 1
+        else:
+            stack.append([roots, -1])
+
+        del path[:]
+        path.extend(start[:-1])
+        while stack:
+            entry = stack[-1]
+            (nodes, index) = entry
+            level = len(stack) - 1
+            index += 1
+            while index < len(nodes) and heights[nodes[index]] < depth - level:
+                index += 1
+            entry[1] = index
+            if index == len(nodes):
+                stack.pop()
+                if stack:
+                    path.pop()
+                continue
+
+            node = nodes[index]
+            if level == depth:
+                path.append(node)
+                yield (depth, node, node is nodes[-1])
+                path.pop()
+            else:
+                path.append(node)
+                stack.append([children(node), -1])
+
+    @classmethod
+    def _levels(cls, children, heights, roots, max_depth, path):
+        """
+        Yield the node infos in breadth first order from the end of ``path``.
+
+        :param children: function from a node to its sorted children
+        :type children: str -> list of str
+        :param heights: map from nodes to the lengths of the longest paths
+           from them
+        :type heights: dict of str * int
+        :param roots: the nodes the traversal starts from
+        :type roots: list of str
+        :param max_depth: the depth below which nodes are not visited
+        :type max_depth: int or NoneType
+        :param path: the path from a root to the node to start from, or the
+           empty list to start from the first root; kept the path from a
+           root to the node last yielded
+        :type path: list of str
+
+        The order is that of _walk() when no node is yielded only once.
+        """
+        # pylint: disable=too-many-arguments
+        depth = max(len(path) - 1, 0)
+        start = list(path)
+        while max_depth is None or depth <= max_depth:
+            found = False
+            level = cls._level(children, heights, roots, depth, start, path)
+            for info in level:
+                found = True
+                yield info
+            if not found:
+                return
+            (depth, start) = (depth + 1, [])
+
+    @classmethod
+    def page(
+       cls,
+       graph,
+       key_func,
+       size,
+       cursor=None,
+       shared=False,
+       sources=None,
+       max_depth=None,
+       reverse=False,
+       edgetypes=None
+    ):
+        """
+        Get the next ``size`` node infos of ``nodes()``.
+
+        :param DiGraph graph: the graph, with nodes
+        :param key_func: key function to allow sorting of nodes
+        :type key_func: str -> object
+        :param int size: the maximum number of node infos in the page
+        :param cursor: a cursor returned for the previous page, or None
+        :type cursor: str or NoneType
+        :param bool shared: if True, yield the subtree of a node only once
+        :param sources: as for ``nodes()``
+        :param max_depth: as for ``nodes()``
+        :param bool reverse: as for ``nodes()``
+        :param edgetypes: as for ``nodes()``
+        :returns: the node infos, and a cursor for the next page or None
+        :rtype: tuple of (list of tuple of int * str * bool) * (str or None)
+
+        :raises DAGValueError: on a bad size, source or cursor
+        :raises DAGGraphError: if the graph has a cycle and ``shared`` is
+           False
+
+        The cursor records the path from a root to the next node. The nodes
+        of each level are found in order by a depth first search which
+        enters only nodes with paths to that level, so the cost of a page
+        depends on its size and on the depth and width of the graph, not on
+        its position. If ``shared`` is True, the queue and the nodes already
+        yielded are needed instead; they are held by `Cursors` and handed
+        to the next page. If they are no longer held, the traversal is
+        replayed up to the cursor, at a cost which depends on its position.
+        The graph, ``key_func`` and the traversal options must be the same
+        for every page.
+        """
+        # pylint: disable=too-many-arguments
+        # pylint: disable=too-many-locals
+        if size < 1:
+            raise DAGValueError("page size must be positive")
+
+        resolved = TraversalUtils.resolve(graph, reverse, edgetypes)
+        children = TraversalUtils.children(resolved, key_func)
+        position = None if cursor is None else \
+           Cursors.decode('breadth-first', cursor, shared)
+
+        if not shared:
+            path = [] if position is None else position.get('path')
+            if not isinstance(path, list) or (position and not path):
+                raise DAGValueError("malformed cursor")
+            walk = cls._levels(
+               children,
+               TraversalUtils.heights(resolved),
+               TraversalUtils.start_nodes(resolved, key_func, sources),
+               max_depth,
+               path
+            )
+            infos = list(itertools.islice(walk, size))
+            if next(walk, None) is None:
+                return (infos, None)
+            return (infos, Cursors.encode('breadth-first', {'path': path}))
+
+        done = 0 if position is None else position['count']
+        held = None if position is None else Cursors.take(position, graph)
+        if held is None:
+            nodeinfos = cls._roots(resolved, key_func, sources)
+            visited = set()
+            walk = cls._walk(children, nodeinfos, visited, max_depth)
+            if sum(1 for _ in itertools.islice(walk, done)) != done:
+                raise DAGValueError("cursor does not match the graph")
+        else:
+            (nodeinfos, visited) = (held['queue'], held['visited'])
+            walk = cls._walk(children, nodeinfos, visited, max_depth)
+
+        infos = list(itertools.islice(walk, size))
+        if len(nodeinfos) == 0:
+            return (infos, None)
+
+        return (
+           infos,
+           Cursors.encode(
+              'breadth-first',
+              {'count': done + len(infos)},
+              graph,
+              {'queue': nodeinfos, 'visited': visited}
+           )
         )
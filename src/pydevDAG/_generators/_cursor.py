@@ -0,0 +1,204 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2016  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+# Red Hat Author(s): Anne Mulhern <amulhern@redhat.com>
+
+"""
+    pydevDAG._generators._cursor
+    ============================
+
+    Encoding and decoding of opaque cursors for resuming a traversal.
+
+    .. moduleauthor::  Anne Mulhern  <amulhern@redhat.com>
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import base64
+import binascii
+import json
+import os
+import threading
+import weakref
+
+from collections import deque
+from collections import OrderedDict
+from itertools import count
+
+import six
+
+from .._errors import DAGValueError
+from .._index import GraphIndex
+
+
+class Cursors(object):
+    """
+    Cursors are short URL-safe strings from which a traversal is resumed.
+
+    A cursor encodes a position in the traversal from which the traversal
+    can be rebuilt from the graph, such as the path from a root to the
+    next node, so its size is bounded by the depth of the graph. The nodes
+    recorded in it must be JSON encodable strings or numbers, as the names
+    of the nodes in graphs built by this package are.
+
+    A traversal which yields shared subtrees once also depends on the nodes
+    already yielded. Its cursor records how many node infos were yielded,
+    from which the traversal can be replayed, and names the state of the
+    traversal, which is held in this process so that usually it need not
+    be. A held state is handed to the first page resumed from it, so it is
+    never copied. At most ``MAX_HELD`` states, of at most ``MAX_HELD_NODES``
+    nodes in all, are held; the least recently held are discarded first.
+    """
+
+    MAX_HELD = 256
+    MAX_HELD_NODES = 1 << 20
+
+    _HELD = OrderedDict()
+    _held_nodes = 0
+    _LOCK = threading.Lock()
+
+    # names are unique within a process, and unlikely to match across them
+    _PREFIX = binascii.hexlify(os.urandom(6)).decode('ascii')
+    _COUNTER = count()
+
+    @staticmethod
+    def _size(state):
+        """
+        The number of nodes in the collections of ``state``.
+
+        :param dict state: the state
+        :rtype: int
+        """
+        return sum(
+           len(v) for v in state.values() if isinstance(v, (list, set, deque))
+        )
+
+    @classmethod
+    def _hold(cls, graph, state):
+        """
+        Hold ``state`` of a traversal of ``graph``.
+
+        :param DiGraph graph: the graph
+        :param dict state: the state, which must not be changed afterwards
+        :returns: the name of the state
+        :rtype: str
+        """
+        name = '%s-%d' % (cls._PREFIX, next(cls._COUNTER))
+        size = cls._size(state)
+        state = dict(
+           state,
+           graph=(weakref.ref(graph), GraphIndex.signature_of(graph))
+        )
+        with cls._LOCK:
+            cls._HELD[name] = (state, size)
+            cls._held_nodes += size
+            while len(cls._HELD) > cls.MAX_HELD or \
+               (cls._held_nodes > cls.MAX_HELD_NODES and len(cls._HELD) > 1):
+                (_, (_, old_size)) = cls._HELD.popitem(last=False)
+                cls._held_nodes -= old_size
+        return name
+
+    @classmethod
+    def encode(cls, traversal, position, graph=None, state=None):
+        """
+        Encode ``position`` in a cursor, naming ``state`` if given.
+
+        :param str traversal: the kind of traversal
+        :param dict position: the position of the traversal, JSON encodable
+        :param graph: the graph traversed, if ``state`` is given
+        :type graph: DiGraph or NoneType
+        :param state: the state of the traversal at ``position``, or None
+        :type state: dict or NoneType
+        :returns: the cursor
+        :rtype: str
+
+        ``state`` is held, not copied, so it must not be changed afterwards.
+        """
+        position = dict(position, traversal=traversal)
+        if state is not None:
+            position['held'] = cls._hold(graph, state)
+        data = json.dumps(position, separators=(',', ':')).encode('utf-8')
+        return base64.urlsafe_b64encode(data).decode('ascii')
+
+    @classmethod
+    def decode(cls, traversal, cursor, shared):
+        """
+        Decode the position in ``cursor`` for ``traversal``.
+
+        :param str traversal: the kind of traversal
+        :param str cursor: the cursor
+        :param bool shared: whether the traversal yields shared subtrees once
+        :returns: the position of the traversal
+        :rtype: dict
+
+        :raises DAGValueError: if the cursor can not be used for traversal
+
+        The position of a traversal which yields shared subtrees once has
+        a ``count`` of the node infos already yielded.
+        """
+        try:
+            data = base64.urlsafe_b64decode(cursor.encode('ascii'))
+            position = json.loads(data.decode('utf-8'))
+        except (AttributeError, TypeError, ValueError, binascii.Error):
+            raise DAGValueError("malformed cursor")
+
+        if not isinstance(position, dict) or \
+           position.get('traversal') != traversal:
+            raise DAGValueError("cursor is not for a %s traversal" % traversal)
+
+        if ('count' in position) != shared:
+            raise DAGValueError("cursor does not match shared mode")
+
+        if shared and \
+           not isinstance(position['count'], six.integer_types):
+            raise DAGValueError("malformed cursor")
+
+        return position
+
+    @classmethod
+    def take(cls, position, graph):
+        """
+        Take the state named in ``position``, if it is still held.
+
+        :param dict position: the position decoded from a cursor
+        :param DiGraph graph: the graph traversed
+        :returns: the state, or None if it is no longer held, or was held
+           for another graph, or for the graph before it changed
+        :rtype: dict or NoneType
+
+        The state is no longer held once it is taken, so the caller may
+        change it.
+        """
+        name = position.get('held')
+        if not isinstance(name, six.string_types):
+            return None
+
+        with cls._LOCK:
+            try:
+                (state, size) = cls._HELD.pop(name)
+            except KeyError:
+                return None
+            cls._held_nodes -= size
+
+        (held, signature) = state['graph']
+        if held() is not graph or \
+           signature != GraphIndex.signature_of(graph):
+            return None
+        return state
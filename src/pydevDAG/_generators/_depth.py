@@ -26,60 +26,314 @@
     .. moduleauthor::  Anne Mulhern  <amulhern@redhat.com>
 """
 
-from .._utils import GraphUtils
+import itertools
+
+from .._errors import DAGValueError
+
+from ._cursor import Cursors
+from ._reference import BackReference
+from ._utils import TraversalUtils
 
 
 class DepthFirst(object):
     """
     A depth-first traversal of the graph.
     """
-    # pylint: disable=too-few-public-methods
+
+    @staticmethod
+    def _level(depth, nodes, start=0):
+        """
+        An iterator over the node infos for ``nodes``, from ``start``.
+
+        :param int depth: the depth of the nodes
+        :param nodes: the sorted nodes at one level
+        :type nodes: list of str
+        :param int start: the index of the first node to yield
+        """
+        last = nodes[-1] if nodes else None
+        return (
+           (depth, nodes[i], nodes[i] is last) \
+              for i in range(start, len(nodes))
+        )
+
+    @staticmethod
+    def _walk(children, stack, visited, max_depth):
+        """
+        Yield the node infos from an explicit stack of iterators.
+
+        :param children: function from a node to its sorted children
+        :type children: str -> list of str
+        :param stack: iterators over node infos, one per level
+        :type stack: list of iterator of tuple of int * str * bool
+        :param visited: the nodes already yielded, or None if not shared
+        :type visited: set of str or NoneType
+        :param max_depth: the depth below which nodes are not visited
+        :type max_depth: int or NoneType
+        """
+        while stack:
+            for info in stack[-1]:
+                (depth, node, last) = info
+                if visited is not None:
+                    if node in visited:
+                        yield (depth, BackReference(node), last)
+                        continue
+                    visited.add(node)
+
+                yield info
+
+                if depth == max_depth:
+                    continue
+
+                successors = children(node)
+                if successors:
+                    last = successors[-1]
+                    stack.append(
+                       iter([(depth + 1, s, s is last) for s in successors])
+                    )
+                    break
+            else:
+                stack.pop()
 
     @classmethod
-    def _nodes_recursive(cls, graph, key_func, node_info):
+    def depth_first(
+       cls,
+       graph,
+       key_func,
+       roots,
+       shared=False,
+       max_depth=None,
+       reverse=False,
+       edgetypes=None
+    ):
         """
-        Recursively yield the nodes in depth-first search.
+        Yield the nodes in depth-first search from ``roots``.
 
         :param DiGraph graph: the graph
         :param key_func: the key function for sorting
-        :param node_info: the information about the node, depth and id
-        :type node_info: tuple of str * int * bool
+        :type key_func: str -> object
+        :param roots: the nodes to start from, in order
+        :type roots: list of str
+        :param bool shared: if True, yield the subtree of a node only once
+        :param max_depth: the greatest depth to visit, or None for no limit
+        :type max_depth: int or NoneType
+        :param bool reverse: if True, follow edges from target to source
+        :param edgetypes: the edge types to follow, or None for all
+        :type edgetypes: iterable of `EdgeType` or NoneType
 
-        The type yielded is tuple of str * int * bool
-        """
-        yield node_info
+        The type yielded is tuple of int * str * bool.
 
-        (depth, node, _) = node_info
+        If ``shared`` is True, a node reached again after its subtree has
+        been yielded is yielded as a BackReference, and its successors are
+        not visited again, so the output is linear in the size of the graph.
 
-        next_depth = depth + 1
-        successors = sorted(graph.successors(node), key=key_func)
+        Edges not of ``edgetypes`` and nodes deeper than ``max_depth`` are
+        pruned as the walk proceeds. The graph is never copied or reversed;
+        a view is traversed as the graph it views.
 
-        for succ in successors:
-            infos = cls._nodes_recursive(
-               graph,
-               key_func,
-               (next_depth, succ, succ is successors[-1])
-            )
-            for info in infos:
-                yield info
+        An explicit stack of iterators is used, one per level, so the cost
+        of yielding a node does not depend on its depth, and the depth of
+        the graph is not limited by the recursion limit.
+        """
+        # pylint: disable=too-many-arguments
+        resolved = TraversalUtils.resolve(graph, reverse, edgetypes)
+        return cls._walk(
+           TraversalUtils.children(resolved, key_func),
+           [cls._level(0, roots)],
+           set() if shared else None,
+           max_depth
+        )
 
     @classmethod
-    def nodes(cls, graph, key_func):
+    def nodes(
+       cls,
+       graph,
+       key_func,
+       shared=False,
+       sources=None,
+       max_depth=None,
+       reverse=False,
+       edgetypes=None
+    ):
         """
         Yield the nodes in order, along with their depth.
 
         :param DiGraph graph: the graph, with nodes
         :param key_func: key function to allow sorting of nodes
         :type key_func: str -> object
+        :param bool shared: if True, yield the subtree of a node only once
+        :param sources: the nodes to start from, in order, or None for the
+           sorted roots, or leaves if ``reverse`` is True, of the graph with
+           only the edges of ``edgetypes``
+        :type sources: list of str or NoneType
+        :param max_depth: the greatest depth to visit, or None for no limit
+        :type max_depth: int or NoneType
+        :param bool reverse: if True, follow edges from target to source
+        :param edgetypes: the edge types to follow, or None for all
+        :type edgetypes: iterable of `EdgeType` or NoneType
 
         Each returned value has type tuple of node * int.
+
+        :raises DAGValueError: if a source is not in the graph
+        """
+        # pylint: disable=too-many-arguments
+        resolved = TraversalUtils.resolve(graph, reverse, edgetypes)
+        roots = TraversalUtils.start_nodes(resolved, key_func, sources)
+        return cls._walk(
+           TraversalUtils.children(resolved, key_func),
+           [cls._level(0, roots)],
+           set() if shared else None,
+           max_depth
+        )
+
+    @classmethod
+    def _resume(cls, children, roots, position):
         """
-        roots = sorted(GraphUtils.get_roots(graph), key=key_func)
-        for node in roots:
-            infos = cls._nodes_recursive(
-               graph,
-               key_func,
-               (0, node, node is roots[-1])
+        Rebuild the stack of a traversal from the position in a cursor.
+
+        :param children: function from a node to its sorted children
+        :type children: str -> list of str
+        :param roots: the nodes the traversal started from
+        :type roots: list of str
+        :param dict position: the decoded cursor
+        :returns: the stack of iterators over node infos
+        :rtype: list of iterator of tuple of int * str * bool
+
+        :raises DAGValueError: if the path is not in the graph
+        """
+        stack = []
+        level = roots
+        for (depth, node) in enumerate(position['path']):
+            try:
+                index = level.index(node)
+            except (TypeError, ValueError):
+                raise DAGValueError("cursor does not match the graph")
+            stack.append(cls._level(depth, level, index + 1))
+            level = children(level[index])
+
+        if position['expand']:
+            stack.append(cls._level(len(stack), level))
+        return stack
+
+    @staticmethod
+    def _follow(path, infos, max_depth, expand=False):
+        """
+        Follow ``infos``, keeping ``path`` the path to the last node.
+
+        :param path: the path from a root to the last node followed
+        :type path: list of str
+        :param infos: the node infos which follow in the traversal
+        :type infos: iterable of tuple of int * str * bool
+        :param max_depth: the depth below which nodes are not visited
+        :type max_depth: int or NoneType
+        :param bool expand: whether the subtree of the last node is yet to
+           be visited
+        :returns: whether the subtree of the last node is yet to be
+           visited, and the number of node infos followed
+        :rtype: tuple of bool * int
+        """
+        number = 0
+        for (depth, node, _) in infos:
+            if isinstance(node, BackReference):
+                (node, expand) = (node.node, False)
+            else:
+                expand = depth != max_depth
+            del path[depth:]
+            path.append(node)
+            number += 1
+        return (expand, number)
+
+    @classmethod
+    def page(
+       cls,
+       graph,
+       key_func,
+       size,
+       cursor=None,
+       shared=False,
+       sources=None,
+       max_depth=None,
+       reverse=False,
+       edgetypes=None
+    ):
+        """
+        Get the next ``size`` node infos of ``nodes()``.
+
+        :param DiGraph graph: the graph, with nodes
+        :param key_func: key function to allow sorting of nodes
+        :type key_func: str -> object
+        :param int size: the maximum number of node infos in the page
+        :param cursor: a cursor returned for the previous page, or None
+        :type cursor: str or NoneType
+        :param bool shared: if True, yield the subtree of a node only once
+        :param sources: as for ``nodes()``
+        :param max_depth: as for ``nodes()``
+        :param bool reverse: as for ``nodes()``
+        :param edgetypes: as for ``nodes()``
+        :returns: the node infos, and a cursor for the next page or None
+        :rtype: tuple of (list of tuple of int * str * bool) * (str or None)
+
+        :raises DAGValueError: on a bad size, source or cursor
+
+        The cursor records the path from a root to the last node in the
+        page, so the cost of a page depends on its size and on the depth of
+        the graph, not on its position. If ``shared`` is True, the nodes
+        already yielded are also needed; they are held by `Cursors` and
+        handed to the next page. If they are no longer held, the traversal
+        is replayed up to the cursor, at a cost which depends on its
+        position. The graph, ``key_func`` and the traversal options must be
+        the same for every page.
+        """
+        # pylint: disable=too-many-arguments
+        # pylint: disable=too-many-locals
+        if size < 1:
+            raise DAGValueError("page size must be positive")
+
+        resolved = TraversalUtils.resolve(graph, reverse, edgetypes)
+        roots = TraversalUtils.start_nodes(resolved, key_func, sources)
+        children = TraversalUtils.children(resolved, key_func)
+
+        (path, expand, done, held) = ([], False, 0, None)
+        if cursor is not None:
+            position = Cursors.decode('depth-first', cursor, shared)
+            if shared:
+                done = position['count']
+                held = Cursors.take(position, graph)
+
+        if cursor is None or (shared and held is None):
+            visited = set() if shared else None
+            stack = [cls._level(0, roots)]
+            walk = cls._walk(children, stack, visited, max_depth)
+            (expand, number) = cls._follow(
+               path,
+               itertools.islice(walk, done),
+               max_depth
             )
-            for info in infos:
-                yield info
+            if number != done:
+                raise DAGValueError("cursor does not match the graph")
+        else:
+            try:
+                (path, expand) = (list(position['path']), position['expand'])
+            except (KeyError, TypeError):
+                raise DAGValueError("malformed cursor")
+            visited = None if held is None else held['visited']
+            stack = cls._resume(children, roots, position)
+            walk = cls._walk(children, stack, visited, max_depth)
+
+        infos = list(itertools.islice(walk, size))
+        (expand, _) = cls._follow(path, infos, max_depth, expand)
+
+        following = next(walk, None)
+        if following is None:
+            return (infos, None)
+
+        position = {'path': path, 'expand': expand}
+        if visited is None:
+            return (infos, Cursors.encode('depth-first', position))
+
+        if not isinstance(following[1], BackReference):
+            visited.discard(following[1])
+        position['count'] = done + len(infos)
+        return (
+           infos,
+           Cursors.encode('depth-first', position, graph, {'visited': visited})
+        )
@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2016  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+# Red Hat Author(s): Anne Mulhern <amulhern@redhat.com>
+
+"""
+    pydevDAG._generators._utils
+    ===========================
+
+    Utilities shared by the traversals.
+
+    .. moduleauthor::  Anne Mulhern  <amulhern@redhat.com>
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from .._errors import DAGValueError
+from .._index import GraphIndex
+from .._views import GraphViews
+
+
+class TraversalUtils(object):
+    """
+    Methods shared by the traversals.
+
+    A traversal resolves its graph once, with resolve(), and passes the
+    result to the other methods, so that it uses one `GraphIndex`
+    throughout, even for a graph whose index is not kept.
+    """
+
+    @staticmethod
+    def resolve(graph, reverse=False, edgetypes=None):
+        """
+        The index to traverse ``graph`` with, the direction, and the edge
+        types to follow.
+
+        :param DiGraph graph: the graph, or a view of it
+        :param bool reverse: if True, the traversal follows edges backwards
+        :param edgetypes: the edge types to follow, or None for all
+        :type edgetypes: iterable of `EdgeType` or NoneType
+        :rtype: tuple of `GraphIndex` * bool * frozenset of `EdgeType` or
+           NoneType
+
+        A view is traversed as the graph it views, in the direction and
+        with the edge types of the view, so the traversal uses the graph's
+        index.
+        """
+        (graph, reverse, edgetypes) = \
+           GraphViews.resolve(graph, reverse, edgetypes)
+        return (GraphIndex.get(graph), reverse, edgetypes)
+
+    @staticmethod
+    def start_nodes(resolved, key_func, sources=None):
+        """
+        The nodes from which a traversal starts.
+
+        :param tuple resolved: the result of resolve()
+        :param key_func: key function to allow sorting of nodes
+        :type key_func: str -> object
+        :param sources: the nodes to start from, in order, or None
+        :type sources: list of str or NoneType
+        :returns: ``sources`` or else the sorted roots, or leaves if reversed
+        :rtype: list of str
+
+        The roots of a view restricted to edge types, or of a graph when
+        edge types are given, are those of the graph with only the edges
+        of those types.
+
+        :raises DAGValueError: if a source is not in the graph
+        """
+        (index, reverse, edgetypes) = resolved
+        if sources is None:
+            return index.sorted_roots(key_func, reverse, edgetypes)
+
+        graph = index.graph
+        sources = list(sources)
+        missing = [s for s in sources if s not in graph]
+        if missing:
+            raise DAGValueError("sources %s not in graph" % missing)
+        return sources
+
+    @staticmethod
+    def children(resolved, key_func):
+        """
+        A function from a node to its children in the traversal.
+
+        :param tuple resolved: the result of resolve()
+        :param key_func: key function to allow sorting of nodes
+        :type key_func: str -> object
+        :returns: function from a node to its sorted children
+        :rtype: str -> list of str
+        """
+        (index, reverse, edgetypes) = resolved
+        return index.sorted_children(key_func, reverse, edgetypes)
+
+    @staticmethod
+    def heights(resolved):
+        """
+        Map from each node to the length of the longest path from it in
+        the traversal.
+
+        :param tuple resolved: the result of resolve()
+        :rtype: dict of str * int
+
+        :raises DAGGraphError: if the graph has a cycle
+        """
+        (index, reverse, edgetypes) = resolved
+        return index.heights(reverse, edgetypes)
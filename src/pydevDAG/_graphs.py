@@ -33,8 +33,13 @@ from __future__ import unicode_literals
 
 import os
 
+from ._attrindex import AttributeIndexes
+from ._index import GraphIndex
+
 from ._decorations import NodeDecorator
 
+from ._interning import NodeIds
+
 from ._config import _Config
 
 from . import _structure
@@ -50,11 +55,12 @@ class GenerateGraph(object):
     )
 
     @classmethod
-    def get_graph(cls, context, name):
+    def get_graph(cls, context, name, interned=False):
         """
         Get a complete graph storage graph.
 
         :param `Context` context: the libudev context
+        :param bool interned: if True, intern the graph with `NodeIds`
         :return: the generated graph
         :rtype: `DiGraph`
         """
@@ -62,7 +68,8 @@ class GenerateGraph(object):
         graph = _structure.PyudevAggregateGraph.graph(
            context,
            name,
-           [getattr(_structure.PyudevGraphs, name) for name in graph_classes]
+           [getattr(_structure.PyudevGraphs, name) for name in graph_classes],
+           interned
         )
         graph.graph['structure'] = graph_classes
         return graph
@@ -77,7 +84,11 @@ class GenerateGraph(object):
         spec = cls.CONFIG.get_node_decoration_spec()
         decorator = NodeDecorator(spec)
 
+        names = NodeIds.names(graph)
         for node in graph.nodes():
-            decorator.decorate(node, graph.node[node])
+            decorator.decorate(names(node), graph.node[node])
 
+        NodeIds.update(graph, graph.nodes())
+        AttributeIndexes.update(graph, graph.nodes())
+        GraphIndex.discard_orderings(graph)
         graph.graph['decorations'] = spec
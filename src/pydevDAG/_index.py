@@ -0,0 +1,583 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2016  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+# Red Hat Author(s): Anne Mulhern <amulhern@redhat.com>
+
+"""
+    pydevDAG._index
+    ===============
+
+    Structural information about graphs, kept until the graph changes.
+
+    .. moduleauthor::  mulhern <amulhern@redhat.com>
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import functools
+import inspect
+import types
+import weakref
+
+from collections import defaultdict
+from collections import deque
+from collections import OrderedDict
+
+import networkx as nx
+
+from ._errors import DAGGraphError
+
+
+# key for the sorted roots in a table of sorted successors
+_ROOTS = object()
+
+# weak references to bound methods, which are created anew on each access
+_WeakMethod = getattr(weakref, 'WeakMethod', None)
+
+
+class TrackedDiGraph(nx.DiGraph):
+    """
+    A DiGraph that counts the changes made to its structure.
+
+    The count allows a `GraphIndex` to detect any change to the nodes or
+    edges of the graph in constant time.
+    """
+
+    mutations = 0
+
+
+def _counted(name):
+    """
+    Wrap a DiGraph method so that it increments the mutation count.
+
+    :param str name: the name of the method
+    :returns: the wrapped method
+    """
+    method = getattr(nx.DiGraph, name)
+
+    @functools.wraps(method)
+    def new_method(self, *args, **kwargs):
+        """
+        Increment the count, then call the method.
+        """
+        self.mutations += 1
+        return method(self, *args, **kwargs)
+
+    return new_method
+
+for _name in (
+   'add_edge',
+   'add_edges_from',
+   'add_node',
+   'add_nodes_from',
+   'clear',
+   'remove_edge',
+   'remove_edges_from',
+   'remove_node',
+   'remove_nodes_from',
+   'reverse'
+):
+    setattr(TrackedDiGraph, _name, _counted(_name))
+
+
+class GraphIndex(object):
+    # pylint: disable=too-many-instance-attributes
+    """
+    Roots, leaves, topological order, levels, heights, adjacency and
+    degrees by edge type, and successors sorted by key function.
+
+    Everything is computed in time linear in the size of the graph, either
+    on construction or on first use. An index is obtained with get(), which
+    reuses the index of a graph until the graph's structure changes.
+
+    A change is detected by the mutation count of a `TrackedDiGraph`, or
+    of any other graph which keeps a ``mutations`` count. Any other graph
+    has no reliable signature, so its index is rebuilt on every get().
+    invalidate() must be called after changing edge types, and
+    discard_orderings() after changing attributes on which the keys of an
+    ordering depend.
+    """
+
+    _INDEXES = weakref.WeakKeyDictionary()
+
+    # the number of key functions for which orderings are kept
+    _MAX_ORDERINGS = 8
+
+    def __init__(self, graph):
+        """
+        Initializer.
+
+        :param `DiGraph` graph: the graph
+        """
+        self._graph = weakref.ref(graph)
+        self.signature = self.signature_of(graph)
+        (self.roots, self.leaves) = self._ends(graph)
+
+        self._order = None
+        self._levels = None
+        self._adjacencies = None
+        self._typed_roots = dict()
+        self._heights = dict()
+        self._orderings = OrderedDict()
+
+    @staticmethod
+    def _ends(graph):
+        """
+        The roots and the leaves of ``graph``.
+
+        :param `DiGraph` graph: the graph
+        :rtype: tuple of (list of node) * (list of node)
+        """
+        # a node is a root iff no other node is its ancestor
+        roots = [
+           n for n in graph if \
+              all(p == n for p in graph.predecessors_iter(n))
+        ]
+        leaves = [
+           n for n in graph if all(s == n for s in graph.successors_iter(n))
+        ]
+        return (roots, leaves)
+
+    @staticmethod
+    def signature_of(graph):
+        """
+        A value which changes when the structure of ``graph`` changes.
+
+        :param `DiGraph` graph: the graph
+        :returns: the mutation count, or None if the graph keeps none
+        :rtype: int or NoneType
+        """
+        return getattr(graph, 'mutations', None)
+
+    @classmethod
+    def is_tracked(cls, graph):
+        """
+        Whether changes to the structure of ``graph`` can be detected.
+
+        :param `DiGraph` graph: the graph
+        :rtype: bool
+        """
+        return cls.signature_of(graph) is not None
+
+    @classmethod
+    def get(cls, graph):
+        """
+        Get an up to date index for ``graph``.
+
+        An index is kept only for a graph which can be tracked. A graph
+        may name a subclass of `GraphIndex` to build its index as its
+        ``index_class``.
+
+        :param `DiGraph` graph: the graph
+        :returns: the index
+        :rtype: `GraphIndex`
+        """
+        factory = getattr(graph, 'index_class', cls)
+        signature = cls.signature_of(graph)
+        if signature is None:
+            return factory(graph)
+
+        index = cls._INDEXES.get(graph)
+        if index is None or index.signature != signature:
+            index = factory(graph)
+            cls._INDEXES[graph] = index
+        return index
+
+    @classmethod
+    def invalidate(cls, graph):
+        """
+        Discard the index for ``graph``, if any.
+
+        :param `DiGraph` graph: the graph
+        """
+        cls._INDEXES.pop(graph, None)
+
+    @property
+    def graph(self):
+        """
+        The graph indexed.
+
+        :raises DAGGraphError: if the graph no longer exists
+        """
+        graph = self._graph()
+        if graph is None: # pragma: no cover
+            raise DAGGraphError("indexed graph no longer exists")
+        return graph
+
+    def _sort(self):
+        """
+        Compute the topological order and the levels of the nodes.
+
+        :raises DAGGraphError: if the graph has a cycle
+        """
+        graph = self.graph
+        in_degrees = dict(
+           (n, sum(1 for _ in graph.predecessors_iter(n))) for n in graph
+        )
+        ready = deque(n for n in graph if in_degrees[n] == 0)
+        levels = dict.fromkeys(ready, 0)
+        order = []
+        while ready:
+            node = ready.popleft()
+            order.append(node)
+            level = levels[node] + 1
+            for succ in graph.successors_iter(node):
+                if levels.get(succ, -1) < level:
+                    levels[succ] = level
+                in_degrees[succ] -= 1
+                if in_degrees[succ] == 0:
+                    ready.append(succ)
+
+        if len(order) != len(graph):
+            raise DAGGraphError("graph has a cycle")
+
+        (self._order, self._levels) = (order, levels)
+
+    @property
+    def order(self):
+        """
+        The nodes in topological order.
+
+        :rtype: list of node
+        :raises DAGGraphError: if the graph has a cycle
+        """
+        if self._order is None:
+            self._sort()
+        return self._order
+
+    @property
+    def levels(self):
+        """
+        Map from each node to the length of the longest path to it from a root.
+
+        :rtype: dict of node * int
+        :raises DAGGraphError: if the graph has a cycle
+        """
+        if self._levels is None:
+            self._sort()
+        return self._levels
+
+    def _get_adjacencies(self):
+        """
+        Partition the edges by edge type, in one pass over the edges.
+
+        :returns: successors and predecessors, by edge type and node
+        :rtype: tuple of (dict of object * (dict of node * list of node))
+        """
+        if self._adjacencies is None:
+            successors = defaultdict(lambda: defaultdict(list))
+            predecessors = defaultdict(lambda: defaultdict(list))
+            for (source, target, data) in self.graph.edges_iter(data=True):
+                edgetype = data.get('edgetype')
+                successors[edgetype][source].append(target)
+                predecessors[edgetype][target].append(source)
+            self._adjacencies = tuple(
+               dict((k, dict(v)) for (k, v) in adjacencies.items()) \
+                  for adjacencies in (successors, predecessors)
+            )
+        return self._adjacencies
+
+    def adjacency(self, edgetype, reverse=False):
+        """
+        The neighbours of nodes along edges of ``edgetype``.
+
+        :param edgetype: the edge type, or None for edges without one
+        :type edgetype: `EdgeType` or NoneType
+        :param bool reverse: if True, predecessors, otherwise successors
+        :returns: map from nodes with such edges to their neighbours
+        :rtype: dict of node * (list of node)
+
+        The result is shared and must not be modified.
+        """
+        return self._get_adjacencies()[1 if reverse else 0].get(
+           edgetype,
+           dict()
+        )
+
+    def number_of_edges(self, edgetypes):
+        """
+        The number of edges of any of ``edgetypes``.
+
+        :param edgetypes: the edge types
+        :type edgetypes: iterable of `EdgeType`
+        :rtype: int
+        """
+        return sum(
+           len(neighbours) for edgetype in frozenset(edgetypes) \
+              for neighbours in self.adjacency(edgetype).values()
+        )
+
+    def out_degree(self, node, edgetype):
+        """
+        The number of edges of ``edgetype`` leaving ``node``.
+
+        :param node: the node
+        :param `EdgeType` edgetype: the edge type
+        :rtype: int
+        """
+        return len(self.adjacency(edgetype).get(node, ()))
+
+    def in_degree(self, node, edgetype):
+        """
+        The number of edges of ``edgetype`` entering ``node``.
+
+        :param node: the node
+        :param `EdgeType` edgetype: the edge type
+        :rtype: int
+        """
+        return len(self.adjacency(edgetype, True).get(node, ()))
+
+    def roots_of(self, edgetypes=None, reverse=False):
+        """
+        The roots of the graph with only the edges of ``edgetypes``.
+
+        :param edgetypes: the edge types, or None for all
+        :type edgetypes: iterable of `EdgeType` or NoneType
+        :param bool reverse: if True, the leaves instead of the roots
+        :rtype: list of node
+
+        The result is shared and must not be modified.
+        """
+        if edgetypes is None:
+            return self.leaves if reverse else self.roots
+
+        edgetypes = frozenset(edgetypes)
+        try:
+            return self._typed_roots[(reverse, edgetypes)]
+        except KeyError:
+            incoming = self._neighbours(not reverse, edgetypes)
+            result = [
+               n for n in self.graph if all(p == n for p in incoming(n))
+            ]
+            self._typed_roots[(reverse, edgetypes)] = result
+            return result
+
+    def heights(self, reverse=False, edgetypes=None):
+        """
+        Map from each node to the length of the longest path from it.
+
+        :param bool reverse: if True, the longest path to it instead
+        :param edgetypes: the edge types of the paths, or None for all
+        :type edgetypes: iterable of `EdgeType` or NoneType
+        :rtype: dict of node * int
+        :raises DAGGraphError: if the graph has a cycle
+
+        The result is shared and must not be modified.
+        """
+        if edgetypes is not None:
+            edgetypes = frozenset(edgetypes)
+        try:
+            return self._heights[(reverse, edgetypes)]
+        except KeyError:
+            neighbours = self._neighbours(reverse, edgetypes)
+            heights = dict()
+            for node in (self.order if reverse else reversed(self.order)):
+                heights[node] = max(
+                   [heights[n] + 1 for n in neighbours(node)] or [0]
+                )
+            self._heights[(reverse, edgetypes)] = heights
+            return heights
+
+    @classmethod
+    def discard_orderings(cls, graph):
+        """
+        Discard the orderings in the index of ``graph``, if any.
+
+        Must be called after changing attributes on which the keys of an
+        ordering may depend.
+
+        :param `DiGraph` graph: the graph
+        """
+        index = cls._INDEXES.get(graph)
+        if index is not None:
+            index._orderings.clear() # pylint: disable=protected-access
+
+    @staticmethod
+    def _ordering_key(key_func):
+        """
+        A key for the orderings of ``key_func`` which does not keep it alive.
+
+        :param key_func: key function for sorting nodes
+        :type key_func: node -> object
+        :returns: a weak reference to ``key_func``, or ``key_func`` itself
+           if it can refer to no graph, or None if it can not be kept
+        :rtype: object
+        """
+        if _WeakMethod is not None and inspect.ismethod(key_func):
+            return _WeakMethod(key_func)
+        try:
+            return weakref.ref(key_func)
+        except TypeError:
+            bound = getattr(key_func, '__self__', None)
+            if bound is None or isinstance(bound, types.ModuleType):
+                return key_func
+            return None
+
+    def _ordering(self, key_func):
+        """
+        Get the tables of sort keys and of sorted neighbours for ``key_func``.
+
+        :param key_func: key function for sorting nodes
+        :type key_func: node -> object
+        :returns: map from nodes to keys, map from direction and edge types
+           to maps from nodes to sorted neighbours
+        :rtype: tuple of dict * dict
+
+        The tables for the least recently used key function are discarded
+        if there are too many. Key functions are only weakly referenced,
+        as they are often closures over the graph.
+        """
+        key = self._ordering_key(key_func)
+        if key is None:
+            return (dict(), dict())
+        try:
+            ordering = self._orderings.pop(key)
+        except KeyError:
+            ordering = (dict(), dict())
+            if len(self._orderings) >= self._MAX_ORDERINGS:
+                self._orderings.popitem(last=False)
+        self._orderings[key] = ordering
+        return ordering
+
+    @staticmethod
+    def _sorted(nodes, keys, key_func):
+        """
+        Sort nodes, computing only those keys not already known.
+
+        :param nodes: the nodes
+        :type nodes: list of node
+        :param dict keys: map from nodes to keys, updated as necessary
+        :param key_func: key function for sorting nodes
+        :type key_func: node -> object
+        :returns: the sorted nodes
+        :rtype: list of node
+        """
+        for node in nodes:
+            if node not in keys:
+                keys[node] = key_func(node)
+        return sorted(nodes, key=keys.__getitem__)
+
+    def _neighbours(self, reverse, edgetypes):
+        """
+        Get a function from a node to its neighbours.
+
+        :param bool reverse: if True, predecessors, otherwise successors
+        :param edgetypes: the edge types to follow, or None for all
+        :type edgetypes: frozenset of `EdgeType` or NoneType
+        :rtype: node -> list of node
+        """
+        if edgetypes is None:
+            graph = self.graph
+            return graph.predecessors if reverse else graph.successors
+
+        tables = [self.adjacency(t, reverse) for t in edgetypes]
+        if len(tables) == 1:
+            table = tables[0]
+            return lambda node: table.get(node, [])
+        return lambda node: [n for t in tables for n in t.get(node, ())]
+
+    def _table(self, key_func, reverse, edgetypes):
+        """
+        Get the map from nodes to sorted neighbours.
+
+        :param key_func: key function for sorting nodes
+        :type key_func: node -> object
+        :param bool reverse: if True, predecessors, otherwise successors
+        :param edgetypes: the edge types to follow, or None for all
+        :type edgetypes: frozenset of `EdgeType` or NoneType
+        :returns: map from node to keys, map from nodes to sorted neighbours
+        :rtype: tuple of dict * dict
+        """
+        (keys, tables) = self._ordering(key_func)
+        return (keys, tables.setdefault((reverse, edgetypes), dict()))
+
+    def sorted_roots(self, key_func, reverse=False, edgetypes=None):
+        """
+        The roots, sorted by ``key_func``.
+
+        :param key_func: key function for sorting nodes
+        :type key_func: node -> object
+        :param bool reverse: if True, the leaves, which are the roots of
+           the reversed graph
+        :param edgetypes: the edge types of the graph, or None for all
+        :type edgetypes: iterable of `EdgeType` or NoneType
+        :rtype: list of node
+
+        The result is shared and must not be modified.
+        """
+        if edgetypes is not None:
+            edgetypes = frozenset(edgetypes)
+        (keys, table) = self._table(key_func, reverse, edgetypes)
+        try:
+            return table[_ROOTS]
+        except KeyError:
+            nodes = self.roots_of(edgetypes, reverse)
+            result = self._sorted(nodes, keys, key_func)
+            table[_ROOTS] = result
+            return result
+
+    def sorted_children(self, key_func, reverse=False, edgetypes=None):
+        """
+        Get a function from a node to its successors sorted by ``key_func``.
+
+        :param key_func: key function for sorting nodes
+        :type key_func: node -> object
+        :param bool reverse: if True, predecessors instead of successors
+        :param edgetypes: the edge types to follow, or None for all
+        :type edgetypes: iterable of `EdgeType` or NoneType
+        :rtype: node -> list of node
+
+        The sorted lists are computed on demand and kept until the index is
+        discarded; they are shared and must not be modified.
+        """
+        if edgetypes is not None:
+            edgetypes = frozenset(edgetypes)
+        (keys, table) = self._table(key_func, reverse, edgetypes)
+        neighbours = self._neighbours(reverse, edgetypes)
+        sort = self._sorted
+
+        def children(node):
+            """
+            The sorted neighbours of ``node``.
+            """
+            try:
+                return table[node]
+            except KeyError:
+                result = sort(neighbours(node), keys, key_func)
+                table[node] = result
+                return result
+
+        return children
+
+    def children(self, node, key_func, reverse=False, edgetypes=None):
+        """
+        The successors of ``node``, sorted by ``key_func``.
+
+        :param node: the node
+        :param key_func: key function for sorting nodes
+        :type key_func: node -> object
+        :param bool reverse: if True, predecessors instead of successors
+        :param edgetypes: the edge types to follow, or None for all
+        :type edgetypes: iterable of `EdgeType` or NoneType
+        :rtype: list of node
+
+        The result is shared and must not be modified.
+        """
+        return self.sorted_children(key_func, reverse, edgetypes)(node)
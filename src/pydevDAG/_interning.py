@@ -0,0 +1,257 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2016  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+# Red Hat Author(s): Anne Mulhern <amulhern@redhat.com>
+
+"""
+    pydevDAG._interning
+    ===================
+
+    Integer node ids, backed by a table of strings.
+
+    .. moduleauthor::  Anne Mulhern  <amulhern@redhat.com>
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import six
+
+from ._errors import DAGValueError
+
+
+class StringTable(object):
+    """
+    A bidirectional map between strings and consecutive integer ids.
+
+    Each string is held once, however many times it is interned.
+    """
+
+    def __init__(self):
+        """
+        Initializer.
+        """
+        self._ids = dict()
+        self._strings = []
+
+    def __len__(self):
+        return len(self._strings)
+
+    def __contains__(self, string):
+        return string in self._ids
+
+    def intern(self, string):
+        """
+        The id of ``string``, assigning the next id if it has none.
+
+        :param str string: the string
+        :returns: the id
+        :rtype: int
+        """
+        try:
+            return self._ids[string]
+        except KeyError:
+            string_id = len(self._strings)
+            self._ids[string] = string_id
+            self._strings.append(string)
+            return string_id
+
+    def canonical(self, string):
+        """
+        The string in the table equal to ``string``, interning it.
+
+        :param str string: the string
+        :returns: the table's copy of the string
+        :rtype: str
+        """
+        return self._strings[self.intern(string)]
+
+    def get_id(self, string):
+        """
+        The id of ``string``.
+
+        :param str string: the string
+        :returns: the id
+        :rtype: int
+
+        :raises DAGValueError: if the string has not been interned
+        """
+        try:
+            return self._ids[string]
+        except KeyError:
+            raise DAGValueError("string %s not in table" % string)
+
+    def get_string(self, string_id):
+        """
+        The string with id ``string_id``.
+
+        :param int string_id: the id
+        :returns: the string
+        :rtype: str
+
+        :raises DAGValueError: if there is no string with the id
+        """
+        if not 0 <= string_id < len(self._strings):
+            raise DAGValueError("no string with id %s in table" % string_id)
+        return self._strings[string_id]
+
+
+class NodeIds(object):
+    """
+    Convert graphs between string and integer node keys.
+
+    In an interned graph, every node is an integer id in the graph's own
+    `StringTable`, which is the value of the graph attribute 'interned'.
+    The 'identifier' attribute of every node that has one, and UDEV
+    DEVPATH values, are the table's copies of the strings. A graph made
+    from an interned graph by networkx, for example by composition or
+    subgraph, shares its table. Graphs interned separately may only be
+    composed if they were interned with the same table. A table is held
+    only by the graphs that use it, and is dropped when they are restored
+    or discarded.
+
+    The builders intern when asked to, the readers when asked to, and
+    the writers and getters map ids back to strings, so the strings
+    appear only at the boundaries.
+    """
+
+    @staticmethod
+    def is_interned(graph):
+        """
+        Whether ``graph`` is interned.
+
+        :param `DiGraph` graph: the graph
+        :rtype: bool
+        """
+        return isinstance(graph.graph.get('interned'), StringTable)
+
+    @classmethod
+    def table(cls, graph):
+        """
+        The table of the ids of the nodes of ``graph``.
+
+        :param `DiGraph` graph: the graph
+        :rtype: `StringTable`
+
+        :raises DAGValueError: if the graph is not interned
+        """
+        if not cls.is_interned(graph):
+            raise DAGValueError("graph is not interned")
+        return graph.graph['interned']
+
+    @classmethod
+    def names(cls, graph):
+        """
+        A function from the nodes of ``graph`` to their names.
+
+        :param `DiGraph` graph: the graph
+        :returns: a function from node to string
+        :rtype: node -> str
+        """
+        if cls.is_interned(graph):
+            return cls.table(graph).get_string
+        return lambda node: node
+
+    @classmethod
+    def update(cls, graph, nodes):
+        """
+        Intern the attributes of ``nodes``, if ``graph`` is interned.
+
+        :param `DiGraph` graph: the graph
+        :param nodes: the nodes whose attributes may have changed
+        :type nodes: iterable of node
+        """
+        if not cls.is_interned(graph):
+            return
+
+        table = cls.table(graph)
+        for node in nodes:
+            attrdict = graph.node[node]
+            identifier = attrdict.get('identifier')
+            if isinstance(identifier, six.string_types):
+                attrdict['identifier'] = table.canonical(identifier)
+            udev = attrdict.get('UDEV')
+            if isinstance(udev, dict) and \
+               isinstance(udev.get('DEVPATH'), six.string_types):
+                udev['DEVPATH'] = table.canonical(udev['DEVPATH'])
+
+    @classmethod
+    def intern_graph(cls, graph, table=None):
+        """
+        Intern ``graph`` in place.
+
+        :param `DiGraph` graph: a graph with string nodes
+        :param table: the table to intern with, or None for a new one
+        :type table: `StringTable` or NoneType
+        :returns: the graph
+        :rtype: `DiGraph`
+
+        :raises DAGValueError: if the graph is interned with another table
+        """
+        if cls.is_interned(graph):
+            if table is not None and table is not cls.table(graph):
+                raise DAGValueError("graph is interned with another table")
+            return graph
+
+        import networkx as nx
+        table = StringTable() if table is None else table
+        nx.relabel_nodes(
+           graph,
+           dict((n, table.intern(n)) for n in graph),
+           copy=False
+        )
+        graph.graph['interned'] = table
+        cls.update(graph, graph.nodes_iter())
+        cls._renamed(graph)
+        return graph
+
+    @classmethod
+    def restore_graph(cls, graph):
+        """
+        Replace the ids in an interned ``graph`` with strings, in place.
+
+        :param `DiGraph` graph: the graph
+        :returns: the graph, with string nodes
+        :rtype: `DiGraph`
+        """
+        if not cls.is_interned(graph):
+            return graph
+
+        import networkx as nx
+        get_string = cls.table(graph).get_string
+        nx.relabel_nodes(
+           graph,
+           dict((n, get_string(n)) for n in graph),
+           copy=False
+        )
+        del graph.graph['interned']
+        cls._renamed(graph)
+        return graph
+
+    @staticmethod
+    def _renamed(graph):
+        """
+        Bring the indexes of ``graph`` up to date after renaming its nodes.
+
+        :param `DiGraph` graph: the graph
+        """
+        from ._attrindex import AttributeIndexes
+        from ._index import GraphIndex
+        GraphIndex.invalidate(graph)
+        AttributeIndexes.rebuild(graph)
@@ -34,17 +34,128 @@ from __future__ import unicode_literals
 import abc
 import os
 
-import six
-
-import justbytes
+from collections import OrderedDict
 
-import parseudev
+import six
 
 from ._attributes import NodeTypes
-from ._errors import DAGValueError
 from ._utils import Dict
 
 
+# compiled accessors for the attributes read by the getters
+_devlink_by_path = Dict.accessor(['DEVLINK', 'by-path'])
+_devno = Dict.accessor(['DEVNO'])
+_sysfs_size = Dict.accessor(['SYSFS', 'size'])
+_sysname = Dict.accessor(['SYSNAME'])
+_udev_devname = Dict.accessor(['UDEV', 'DEVNAME'])
+_udev_devpath = Dict.accessor(['UDEV', 'DEVPATH'])
+_udev_devtype = Dict.accessor(['UDEV', 'DEVTYPE'])
+_udev_dm_name = Dict.accessor(['UDEV', 'DM_NAME'])
+_udev_dm_uuid = Dict.accessor(['UDEV', 'DM_UUID'])
+_udev_id_path = Dict.accessor(['UDEV', 'ID_PATH'])
+_udev_id_sas_path = Dict.accessor(['UDEV', 'ID_SAS_PATH'])
+_udev_subsystem = Dict.accessor(['UDEV', 'SUBSYSTEM'])
+
+
+class _Memo(object):
+    """
+    A bounded memo of the values of a function of one hashable argument.
+
+    When the memo is full, the least recently used value is discarded.
+    """
+
+    def __init__(self, function, maxsize=1024):
+        """
+        Initializer.
+
+        :param function: the function to memoize
+        :type function: hashable -> object
+        :param int maxsize: the maximum number of values to keep
+        """
+        self._function = function
+        self._maxsize = maxsize
+        self._values = OrderedDict()
+
+    def __call__(self, key):
+        """
+        The value of the function for ``key``.
+
+        :param key: the argument to the function
+        :type key: hashable
+        :returns: the value of the function
+        :rtype: object
+        """
+        values = self._values
+        try:
+            value = values.pop(key)
+        except KeyError:
+            value = self._function(key)
+            if len(values) >= self._maxsize:
+                values.popitem(last=False)
+        values[key] = value
+        return value
+
+    def __len__(self):
+        return len(self._values)
+
+    def clear(self):
+        """
+        Discard all memoized values.
+        """
+        self._values.clear()
+
+
+_BINARY_UNITS = ('B', 'KiB', 'MiB', 'GiB', 'TiB', 'PiB', 'EiB')
+
+
+def _size_str(size):
+    """
+    The string representation of a size in 512 byte sectors.
+
+    :param str size: the number of sectors
+    :returns: a string representing the size in bytes
+    :rtype: str
+
+    Sizes which are a whole number of some binary unit are formatted
+    directly; justbytes is used for all others, and the two agree.
+    justbytes is imported only when needed.
+    """
+    if isinstance(size, six.string_types) and size.isdigit():
+        try:
+            nbytes = int(size) * 512
+        except ValueError:
+            nbytes = None
+
+        if nbytes is not None and nbytes < 1024 ** len(_BINARY_UNITS):
+            exponent = 0
+            while exponent + 1 < len(_BINARY_UNITS) and \
+               nbytes >= 1024 ** (exponent + 1):
+                exponent += 1
+            (quotient, remainder) = divmod(nbytes, 1024 ** exponent)
+            if remainder == 0:
+                return "%d %s" % (quotient, _BINARY_UNITS[exponent])
+
+    import justbytes
+    return str(justbytes.Range(size, justbytes.Range(512)))
+
+
+def _dmuuid_subsystem(dmuuid):
+    """
+    The subsystem prefix of a DM_UUID.
+
+    :param str dmuuid: the DM_UUID
+    :returns: the subsystem, if any
+    :rtype: str or NoneType
+    """
+    import parseudev
+    return parseudev.DMUUIDParse().parse(dmuuid).get('subsystem')
+
+
+# memos for getters whose values are derived from their raw input
+_DMUUID_SUBSYSTEM_MEMO = _Memo(_dmuuid_subsystem)
+_SIZE_MEMO = _Memo(_size_str)
+
+
 @six.add_metaclass(abc.ABCMeta)
 class NodeGetter(object):
     """
@@ -73,14 +184,11 @@ class ByPath(NodeGetter):
 
     @staticmethod
     def getter(node):
-        try:
-            links = Dict.get_value(node, ['DEVLINK', 'by-path'])
-            if links is None:
-                return None
-            else:
-                return "; ".join(str(link.value) for link in links)
-        except DAGValueError:
+        links = _devlink_by_path(node)
+        if links is None:
             return None
+        else:
+            return "; ".join(str(link.value) for link in links)
 
 
 class Devname(NodeGetter):
@@ -91,10 +199,7 @@ class Devname(NodeGetter):
 
     @staticmethod
     def getter(node):
-        try:
-            return Dict.get_value(node, ['UDEV', 'DEVNAME'])
-        except DAGValueError:
-            return None
+        return _udev_devname(node)
 
 
 class Devpath(NodeGetter):
@@ -105,10 +210,7 @@ class Devpath(NodeGetter):
 
     @staticmethod
     def getter(node):
-        try:
-            return Dict.get_value(node, ['UDEV', 'DEVPATH'])
-        except DAGValueError:
-            return None
+        return _udev_devpath(node)
 
 
 class Devtype(NodeGetter):
@@ -119,10 +221,7 @@ class Devtype(NodeGetter):
 
     @staticmethod
     def getter(node):
-        try:
-            return Dict.get_value(node, ['UDEV', 'DEVTYPE'])
-        except DAGValueError:
-            return None
+        return _udev_devtype(node)
 
 
 class Dmname(NodeGetter):
@@ -133,10 +232,7 @@ class Dmname(NodeGetter):
 
     @staticmethod
     def getter(node):
-        try:
-            return Dict.get_value(node, ['UDEV', 'DM_NAME'])
-        except DAGValueError:
-            return None
+        return _udev_dm_name(node)
 
 
 class DmUuidSubsystem(NodeGetter):
@@ -147,14 +243,10 @@ class DmUuidSubsystem(NodeGetter):
 
     @staticmethod
     def getter(node):
-        try:
-            dmuuid = Dict.get_value(node, ['UDEV', 'DM_UUID'])
-            if dmuuid is None:
-                return None
-            match_dict = parseudev.DMUUIDParse().parse(dmuuid)
-            return match_dict.get('subsystem')
-        except DAGValueError:
+        dmuuid = _udev_dm_uuid(node)
+        if dmuuid is None:
             return None
+        return _DMUUID_SUBSYSTEM_MEMO(dmuuid)
 
 
 class Identifier(NodeGetter):
@@ -176,10 +268,7 @@ class IdPath(NodeGetter):
 
     @staticmethod
     def getter(node):
-        try:
-            return Dict.get_value(node, ['UDEV', 'ID_PATH'])
-        except DAGValueError:
-            return None
+        return _udev_id_path(node)
 
 
 class IdSasPath(NodeGetter):
@@ -190,10 +279,7 @@ class IdSasPath(NodeGetter):
 
     @staticmethod
     def getter(node):
-        try:
-            return Dict.get_value(node, ['UDEV', 'ID_SAS_PATH'])
-        except DAGValueError:
-            return None
+        return _udev_id_sas_path(node)
 
 
 class Major(NodeGetter):
@@ -204,10 +290,10 @@ class Major(NodeGetter):
 
     @staticmethod
     def getter(node):
-        try:
-            return os.major(Dict.get_value(node, ['DEVNO']))
-        except DAGValueError:
+        devno = _devno(node)
+        if devno is None:
             return None
+        return os.major(devno)
 
 
 class NodeType(NodeGetter):
@@ -235,14 +321,11 @@ class Size(NodeGetter):
 
     @staticmethod
     def getter(node):
-        try:
-            size = Dict.get_value(node, ['SYSFS', 'size'])
-            if size is None:
-                return None
-            else:
-                return str(justbytes.Range(size, justbytes.Range(512)))
-        except DAGValueError:
+        size = _sysfs_size(node)
+        if size is None:
             return None
+        else:
+            return _SIZE_MEMO(size)
 
 
 class Subsystem(NodeGetter):
@@ -253,10 +336,7 @@ class Subsystem(NodeGetter):
 
     @staticmethod
     def getter(node):
-        try:
-            return Dict.get_value(node, ['UDEV', 'SUBSYSTEM'])
-        except DAGValueError:
-            return None
+        return _udev_subsystem(node)
 
 
 class Sysname(NodeGetter):
@@ -267,17 +347,13 @@ class Sysname(NodeGetter):
 
     @staticmethod
     def getter(node):
-        try:
-            return Dict.get_value(node, ['SYSNAME'])
-        except DAGValueError:
-            return None
+        return _sysname(node)
 
 
 class NodeGetters(object):
     """
     Class for managing NodeGetters.
     """
-    # pylint: disable=too-few-public-methods
 
     BY_PATH = ByPath # may be deprecated
     DEVNAME = Devname
@@ -293,3 +369,41 @@ class NodeGetters(object):
     SIZE = Size
     SUBSYSTEM = Subsystem
     SYSNAME = Sysname
+
+    @classmethod
+    def name(cls, getter):
+        """
+        The name of a getter.
+
+        :param getter: the getter
+        :type getter: `NodeGetter`
+        :returns: the name of ``getter`` in this class, or its class name
+        :rtype: str
+        """
+        return next(
+           (k for (k, v) in vars(cls).items() if v is getter),
+           getter.__name__
+        )
+
+    @staticmethod
+    def columns(graph, getters, nodes=None):
+        """
+        Get the values of several getters for many nodes.
+
+        :param `DiGraph` graph: the graph
+        :param getters: the getters
+        :type getters: list of `NodeGetter`
+        :param nodes: the nodes, or None for all nodes in the graph
+        :type nodes: iterable of node or NoneType
+        :returns: the nodes, and a column of values for each getter, in
+           the order of the nodes
+        :rtype: tuple of (list of node) * (list of list of object)
+
+        The attributes of each node are looked up in the graph only once.
+        """
+        nodes = list(graph.nodes_iter() if nodes is None else nodes)
+        attrdicts = [graph.node[n] for n in nodes]
+        return (
+           nodes,
+           [[g.getter(a) for a in attrdicts] for g in getters]
+        )
@@ -26,9 +26,65 @@
     .. moduleauthor::  Anne Mulhern  <amulhern@redhat.com>
 """
 
-from ._readwrite import Reader
-from ._readwrite import Writer
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
 
-from ._write import Rewriter
+import importlib
+import sys
 
-from ._utils import StringUtils
+
+# the submodule which defines each public name; a submodule is imported
+# only when one of its names is first used, so that reading a graph does
+# not import the sinks, the store or the background writer
+_SUBMODULES = {
+   'BackgroundWriter': '_background',
+
+   'Compressions': '_compression',
+
+   'Reader': '_readwrite',
+   'Writer': '_readwrite',
+
+   'CSVSink': '_sinks',
+   'DOTSink': '_sinks',
+   'Exporter': '_sinks',
+   'ExportSink': '_sinks',
+   'JSONLinesSink': '_sinks',
+
+   'SQLiteStore': '_sqlite',
+
+   'Rewriter': '_write',
+
+   'StringUtils': '_utils',
+}
+
+__all__ = sorted(_SUBMODULES)
+
+
+def __getattr__(name):
+    """
+    Import the submodule which defines ``name`` and get ``name`` from it.
+
+    :param str name: the name
+    :returns: the value of the name
+    :raises AttributeError: if the name is not public
+    """
+    try:
+        submodule = _SUBMODULES[name]
+    except KeyError:
+        raise AttributeError(
+           "module %r has no attribute %r" % (__name__, name)
+        )
+    value = getattr(importlib.import_module('.' + submodule, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_SUBMODULES))
+
+
+# module level __getattr__ is available only from Python 3.7
+if sys.version_info < (3, 7): # pragma: no cover
+    for _name in __all__:
+        __getattr__(_name)
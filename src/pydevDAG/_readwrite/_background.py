@@ -0,0 +1,244 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2016  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+# Red Hat Author(s): Anne Mulhern <amulhern@redhat.com>
+
+"""
+    pydevDAG._readwrite._background
+    ===============================
+
+    Writing graphs to files without waiting for the writes to complete.
+
+    .. moduleauthor::  mulhern <amulhern@redhat.com>
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import multiprocessing
+import os
+import pickle
+import threading
+
+from six.moves import queue
+
+from .._errors import DAGEnvironmentError
+from .._errors import DAGValueError
+
+from ._readwrite import JSONWriter
+from ._write import Rewriter
+
+
+def _write_file(graph, path, compression):
+    """
+    Write a stringized graph to a file, atomically and durably.
+
+    :param DiGraph graph: a graph, converted by `Rewriter.stringize`
+    :param str path: the path of the file
+    :param compression: a compression format, or None
+    :type compression: type or NoneType
+
+    The graph is written to a temporary file, which is synced and then
+    renamed to ``path``, and the directory is synced after the rename.
+    The temporary file is removed if the write fails.
+    """
+    temp = path + '.tmp'
+    try:
+        with open(temp, 'w' if compression is None else 'wb') as out:
+            JSONWriter.write_stringized(graph, out, compression)
+            out.flush()
+            os.fsync(out.fileno())
+        os.rename(temp, path)
+    finally:
+        if os.path.exists(temp):
+            os.unlink(temp)
+
+    directory = os.open(os.path.dirname(path) or os.curdir, os.O_RDONLY)
+    try:
+        os.fsync(directory)
+    finally:
+        os.close(directory)
+
+
+def _write_pickled(data, path, compression):
+    """
+    Write a pickled graph to a file; runs in a worker process.
+
+    :param bytes data: the pickled graph
+    :param str path: the path of the file
+    :param compression: a compression format, or None
+    :type compression: type or NoneType
+    """
+    graph = pickle.loads(data)
+    Rewriter.stringize(graph)
+    _write_file(graph, path, compression)
+
+
+class BackgroundWriter(object):
+    """
+    Write graphs to files on a background thread.
+
+    Each graph is copied when it is handed off, so the caller may continue
+    to modify it. Graphs with at least ``process_threshold`` nodes are
+    pickled instead of copied, which is faster, and are converted and
+    serialized in a separate worker process rather than on the background
+    thread, so that their serialization does not contend for the GIL.
+
+    An error that occurs while writing is raised by the next call to
+    write(), flush() or close().
+    """
+    # pylint: disable=too-many-instance-attributes
+
+    def __init__(
+       self,
+       compression=None,
+       max_pending=2,
+       process_threshold=None
+    ):
+        """
+        Initializer.
+
+        :param compression: a compression format, from `Compressions`
+        :type compression: type or NoneType
+        :param int max_pending: the maximum number of graphs waiting
+        :param process_threshold: size of graph to write in a process
+        :type process_threshold: int or NoneType
+
+        If ``process_threshold`` is None, no graph is written in a process.
+        Otherwise the worker process is started here, before the background
+        thread, and where the platform allows it, by spawning a new
+        interpreter rather than by forking this one.
+        """
+        if max_pending < 1:
+            raise DAGValueError("max_pending must be at least 1")
+
+        self.compression = compression
+        self.process_threshold = process_threshold
+
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._lock = threading.Lock()
+        self._error = None
+        self._closed = False
+
+        self._pool = None
+        if process_threshold is not None:
+            get_context = getattr(multiprocessing, 'get_context', None)
+            context = multiprocessing if get_context is None else \
+               get_context('spawn')
+            self._pool = context.Pool(1)
+
+        self._thread = threading.Thread(
+           target=self._run,
+           name="pydevDAG-background-writer"
+        )
+        self._thread.daemon = True
+        self._thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _check(self):
+        """
+        Raise an error if a previous write failed.
+
+        :raises DAGEnvironmentError: if a previous write failed
+        """
+        with self._lock:
+            (error, self._error) = (self._error, None)
+        if error is not None:
+            raise DAGEnvironmentError(error)
+
+    def _write(self, graph, path):
+        """
+        Write a single graph.
+
+        :param graph: the graph, owned by this writer, or the pickled graph
+        :type graph: DiGraph or bytes
+        :param str path: the path of the file
+        """
+        if isinstance(graph, bytes):
+            self._pool.apply(_write_pickled, (graph, path, self.compression))
+        else:
+            Rewriter.stringize(graph)
+            _write_file(graph, path, self.compression)
+
+    def _run(self):
+        """
+        Write graphs from the queue until told to stop.
+        """
+        while True:
+            job = self._queue.get()
+            try:
+                if job is None:
+                    return
+                self._write(*job)
+            except Exception as err: # pylint: disable=broad-except
+                with self._lock:
+                    if self._error is None:
+                        self._error = err
+            finally:
+                self._queue.task_done()
+
+    def write(self, graph, path):
+        """
+        Hand off a graph to be written to ``path``.
+
+        :param DiGraph graph: the graph
+        :param str path: the path of the file
+
+        Blocks only if the maximum number of graphs is already pending.
+
+        :raises DAGEnvironmentError: if a previous write failed
+        :raises DAGValueError: if this writer is closed
+        """
+        self._check()
+        if self._closed:
+            raise DAGValueError("writer is closed")
+        if self._pool is not None and len(graph) >= self.process_threshold:
+            self._queue.put((pickle.dumps(graph, -1), path))
+        else:
+            self._queue.put((graph.copy(), path))
+
+    def flush(self):
+        """
+        Wait until every graph handed off has been written.
+
+        :raises DAGEnvironmentError: if a write failed
+        """
+        self._queue.join()
+        self._check()
+
+    def close(self):
+        """
+        Write every pending graph and stop the background thread.
+
+        :raises DAGEnvironmentError: if a write failed
+        """
+        if not self._closed:
+            self._closed = True
+            self._queue.put(None)
+            self._thread.join()
+            if self._pool is not None:
+                self._pool.close()
+                self._pool.join()
+                self._pool = None
+        self._check()
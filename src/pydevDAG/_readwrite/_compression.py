@@ -0,0 +1,217 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2016  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+# Red Hat Author(s): Anne Mulhern <amulhern@redhat.com>
+
+"""
+    pydevDAG._readwrite._compression
+    ================================
+
+    Compressed streams for reading and writing.
+
+    .. moduleauthor::  mulhern <amulhern@redhat.com>
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import abc
+import bz2
+import contextlib
+import gzip
+import io
+
+import six
+
+try:
+    import lzma
+except ImportError: # pragma: no cover
+    lzma = None
+
+from .._errors import DAGValueError
+
+
+@six.add_metaclass(abc.ABCMeta)
+class Compression(object):
+    """
+    Abstract parent class of compression formats.
+    """
+    # pylint: disable=too-few-public-methods
+
+    MAGIC = None
+
+    @staticmethod
+    @abc.abstractmethod
+    def open(fileobj, mode):
+        """
+        Wrap a binary stream in a compressing or decompressing stream.
+
+        :param fileobj: a binary stream
+        :param str mode: 'rb' for reading, 'wb' for writing
+        :returns: a binary stream
+        """
+        raise NotImplementedError() # pragma: no cover
+
+
+class Bz2(Compression):
+    """
+    bzip2 compression.
+    """
+    # pylint: disable=too-few-public-methods
+
+    MAGIC = b'BZh'
+
+    @staticmethod
+    def open(fileobj, mode):
+        return bz2.BZ2File(fileobj, mode=mode)
+
+
+class Gzip(Compression):
+    """
+    gzip compression.
+    """
+    # pylint: disable=too-few-public-methods
+
+    MAGIC = b'\x1f\x8b'
+
+    @staticmethod
+    def open(fileobj, mode):
+        # mtime is fixed so that identical graphs compress identically
+        return gzip.GzipFile(fileobj=fileobj, mode=mode, mtime=0)
+
+
+class Lzma(Compression):
+    """
+    xz compression.
+    """
+    # pylint: disable=too-few-public-methods
+
+    MAGIC = b'\xfd7zXZ\x00'
+
+    @staticmethod
+    def open(fileobj, mode):
+        if lzma is None: # pragma: no cover
+            raise DAGValueError("lzma compression is unavailable")
+        return lzma.LZMAFile(fileobj, mode=mode)
+
+
+class Compressions(object):
+    """
+    Enumeration of compression formats.
+    """
+
+    BZ2 = Bz2
+    GZIP = Gzip
+    LZMA = Lzma
+
+    @classmethod
+    def values(cls):
+        """
+        Return a list of the supported compression formats.
+        """
+        return [cls.BZ2, cls.GZIP, cls.LZMA]
+
+    @classmethod
+    def detect(cls, head):
+        """
+        Identify a compression format from the first bytes of a stream.
+
+        :param bytes head: the first bytes of the stream
+        :returns: the matching compression format or None
+        :rtype: type or NoneType
+        """
+        return next(
+           (c for c in cls.values() if head.startswith(c.MAGIC)),
+           None
+        )
+
+
+class CompressedStreams(object):
+    """
+    Manage text streams layered over possibly compressed binary streams.
+
+    The streams yielded never close the stream they are layered over, so
+    that the caller remains in charge of it.
+    """
+
+    _ENCODING = 'utf-8'
+
+    @classmethod
+    @contextlib.contextmanager
+    def writing(cls, out, compression=None):
+        """
+        Yield a text stream that writes to ``out``.
+
+        :param out: an output stream, binary if ``compression`` is set
+        :param compression: a compression format or None
+        :type compression: type or NoneType
+
+        If ``compression`` is None, ``out`` is yielded unchanged.
+        """
+        if compression is None:
+            yield out
+            return
+
+        compressed = compression.open(out, 'wb')
+        text = io.TextIOWrapper(compressed, encoding=cls._ENCODING)
+        try:
+            yield text
+            text.flush()
+        finally:
+            text.detach()
+            compressed.close()
+
+    @classmethod
+    @contextlib.contextmanager
+    def reading(cls, instream):
+        """
+        Yield a text stream that reads from ``instream``.
+
+        :param instream: an input stream, text or binary
+
+        If ``instream`` is binary, compression is detected from its magic
+        bytes, and the data is decompressed as it is read.
+        """
+        if isinstance(instream, io.TextIOBase) or \
+           not isinstance(instream, io.IOBase):
+            yield instream
+            return
+
+        if hasattr(instream, 'peek'):
+            buffered = instream
+        else:
+            buffered = io.BufferedReader(instream)
+
+        size = max(len(c.MAGIC) for c in Compressions.values())
+        compression = Compressions.detect(buffered.peek(size)[:size])
+        if compression is None:
+            decompressed = None
+            text = io.TextIOWrapper(buffered, encoding=cls._ENCODING)
+        else:
+            decompressed = compression.open(buffered, 'rb')
+            text = io.TextIOWrapper(decompressed, encoding=cls._ENCODING)
+
+        try:
+            yield text
+        finally:
+            text.detach()
+            if decompressed is not None:
+                decompressed.close()
+            if buffered is not instream:
+                buffered.detach()
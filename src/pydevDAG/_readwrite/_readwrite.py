@@ -33,10 +33,18 @@ from __future__ import unicode_literals
 
 import os
 
-import json
+from itertools import count
+
+import networkx as nx
 
 from networkx.readwrite import json_graph
 
+from .._index import TrackedDiGraph
+from .._interning import NodeIds
+
+from ._compression import CompressedStreams
+from ._stream import JSONObjectWriter
+from ._stream import NodeLinkStream
 from ._write import Rewriter
 
 
@@ -44,21 +52,105 @@ class JSONWriter(object):
     """
     Write graph to a file.
     """
-    # pylint: disable=too-few-public-methods
 
     @staticmethod
-    def write(graph, out):
+    def _write(graph, out, compression, node_func, edge_func):
+        """
+        Write a graph, a node and a link at a time.
+
+        :param DiGraph graph: a graph
+        :param out: an output stream, binary if ``compression`` is set
+        :param compression: a compression format, from `Compressions`
+        :type compression: type or NoneType
+        :param node_func: function from a node to its attributes for output
+        :type node_func: node -> dict
+        :param edge_func: function from an edge and its attributes to its
+           attributes for output
+        :type edge_func: node * node * dict -> dict
+
+        The output is the same as that of json.dump of the node-link data
+        of the graph, but the node-link data is never built as a whole.
+        """
+        # pylint: disable=too-many-arguments
+        name = NodeIds.names(graph)
+        attrs = dict(graph.graph)
+        if NodeIds.is_interned(graph):
+            del attrs['interned']
+
+        mapping = dict(zip(graph, count()))
+
+        def nodes():
+            # pylint: disable=missing-docstring
+            for node in graph:
+                datum = node_func(node)
+                datum['id'] = name(node)
+                yield datum
+
+        def links():
+            # pylint: disable=missing-docstring
+            if graph.is_multigraph():
+                for (source, target, key, edgedict) in \
+                   graph.edges_iter(keys=True, data=True):
+                    datum = edge_func(source, target, edgedict)
+                    datum['source'] = mapping[source]
+                    datum['target'] = mapping[target]
+                    datum['key'] = key
+                    yield datum
+            else:
+                for (source, target, edgedict) in graph.edges_iter(data=True):
+                    datum = edge_func(source, target, edgedict)
+                    datum['source'] = mapping[source]
+                    datum['target'] = mapping[target]
+                    yield datum
+
+        with CompressedStreams.writing(out, compression) as stream:
+            writer = JSONObjectWriter(stream)
+            writer.member('directed', graph.is_directed())
+            writer.member('multigraph', graph.is_multigraph())
+            writer.member('graph', attrs)
+            writer.array('nodes', nodes())
+            writer.array('links', links())
+            writer.close()
+            print(end=os.linesep, file=stream)
+
+    @classmethod
+    def write(cls, graph, out, compression=None):
         """
         Write a graph to an output stream.
 
         :param DiGraph graph: a graph
-        :param out: an output stream
+        :param out: an output stream, binary if ``compression`` is set
+        :param compression: a compression format, from `Compressions`
+        :type compression: type or NoneType
+
+        Each node and edge is stringized as it is written; the graph is
+        neither copied nor changed.
+        """
+        cls._write(
+           graph,
+           out,
+           compression,
+           lambda n: Rewriter.stringize_node(graph, n),
+           Rewriter.stringize_edge
+        )
+
+    @classmethod
+    def write_stringized(cls, graph, out, compression=None):
         """
-        graph = graph.copy()
-        Rewriter.stringize(graph)
-        data = json_graph.node_link_data(graph)
-        json.dump(data, out, indent=4)
-        print(end=os.linesep, file=out)
+        Write a graph that has already been stringized to an output stream.
+
+        :param DiGraph graph: a graph, converted by `Rewriter.stringize`
+        :param out: an output stream, binary if ``compression`` is set
+        :param compression: a compression format, from `Compressions`
+        :type compression: type or NoneType
+        """
+        cls._write(
+           graph,
+           out,
+           compression,
+           lambda n: dict(graph.node[n]),
+           lambda s, t, d: dict(d)
+        )
 
 
 class JSONReader(object):
@@ -67,28 +159,59 @@ class JSONReader(object):
     """
 
     @staticmethod
-    def readin(data):
+    def readin(data, interned=False):
         """
         Read data from a string input.
 
         :param data: the JSON formatted data
+        :param bool interned: if True, intern the graph with `NodeIds`
         :returns: the graph
         :rtype: DiGraph
         """
         graph = json_graph.node_link_graph(data)
+        if type(graph) is nx.DiGraph: # pylint: disable=unidiomatic-typecheck
+            graph = TrackedDiGraph(graph)
         Rewriter.destringize(graph)
+        if interned:
+            NodeIds.intern_graph(graph)
         return graph
 
-    @classmethod
-    def read(cls, instream):
+    @staticmethod
+    def read(
+       instream,
+       node_attributes=None,
+       edge_attributes=None,
+       interned=False
+    ):
         """
         Read a graph from an input stream
 
         :param instream: the input stream
+        :param node_attributes: node attributes to keep, None for all
+        :type node_attributes: dict (JSON) or NoneType
+        :param edge_attributes: edge attributes to keep, None for all
+        :type edge_attributes: dict (JSON) or NoneType
+        :param bool interned: if True, intern the graph with `NodeIds`
         :returns: a graph corresponding to the JSON data in the stream
+
+        If ``instream`` is a binary stream, any compression is detected
+        automatically. The data is decoded as it is read.
+
+        Attributes to keep are specified in the format of `ExtendedLookup`,
+        e.g., {'nodetype': {}, 'UDEV': {'args': {'DEVNAME': {}}}}. Other
+        attributes are discarded as each node or edge is read and are never
+        converted from their string representation.
         """
-        data = json.load(instream)
-        return cls.readin(data)
+        with CompressedStreams.reading(instream) as stream:
+            graph = NodeLinkStream.read(
+               stream,
+               node_attributes,
+               edge_attributes
+            )
+        Rewriter.destringize(graph)
+        if interned:
+            NodeIds.intern_graph(graph)
+        return graph
 
 Reader = JSONReader
 Writer = JSONWriter
@@ -0,0 +1,292 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2016  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+# Red Hat Author(s): Anne Mulhern <amulhern@redhat.com>
+
+"""
+    pydevDAG._readwrite._sinks
+    ==========================
+
+    Export graphs to various formats in a single pass.
+
+    .. moduleauthor::  mulhern <amulhern@redhat.com>
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import abc
+import csv
+import json
+import os
+
+import six
+
+from .._generators import BackReference
+from .._interning import NodeIds
+from .._item_str import NodeGetters
+
+
+@six.add_metaclass(abc.ABCMeta)
+class ExportSink(object):
+    """
+    Abstract parent class of sinks which receive a graph a piece at a time.
+    """
+
+    def __init__(self, out, getters):
+        """
+        Initializer.
+
+        :param out: an output stream
+        :param getters: the getters for node values
+        :type getters: list of `NodeGetter`
+        """
+        self.out = out
+        self.getters = list(getters)
+        self.names = [NodeGetters.name(g) for g in self.getters]
+
+    def values(self, attrdict):
+        """
+        Get the values for a node.
+
+        :param dict attrdict: the attributes of the node
+        :returns: the value of each getter
+        :rtype: list of object
+        """
+        return [g.getter(attrdict) for g in self.getters]
+
+    def begin(self, graph):
+        """
+        Start the export.
+
+        :param `DiGraph` graph: the graph
+        """
+        pass
+
+    @abc.abstractmethod
+    def node(self, node, attrdict):
+        """
+        Export a node.
+
+        :param node: the node
+        :param dict attrdict: the attributes of the node
+        """
+        raise NotImplementedError() # pragma: no cover
+
+    @abc.abstractmethod
+    def edge(self, source, target, attrdict):
+        """
+        Export an edge.
+
+        :param source: the source node
+        :param target: the target node
+        :param dict attrdict: the attributes of the edge
+        """
+        raise NotImplementedError() # pragma: no cover
+
+    def end(self):
+        """
+        Finish the export.
+        """
+        pass
+
+
+class JSONLinesSink(ExportSink):
+    """
+    Export nodes and edges as JSON objects, one per line.
+    """
+
+    @staticmethod
+    def _write(out, obj):
+        """
+        Write a single line.
+
+        :param out: an output stream
+        :param dict obj: the object to write
+        """
+        print(json.dumps(obj, default=str, sort_keys=True), file=out)
+
+    def node(self, node, attrdict):
+        obj = dict(zip(self.names, self.values(attrdict)))
+        obj['node'] = node
+        self._write(self.out, obj)
+
+    def edge(self, source, target, attrdict):
+        edgetype = attrdict.get('edgetype')
+        self._write(
+           self.out,
+           {
+              'source': source,
+              'target': target,
+              'edgetype': None if edgetype is None else str(edgetype)
+           }
+        )
+
+
+class CSVSink(ExportSink):
+    """
+    Export nodes as rows of a table, and, optionally, edges as another.
+    """
+
+    def __init__(self, out, getters, edges_out=None):
+        """
+        Initializer.
+
+        :param out: an output stream for node rows
+        :param getters: the getters for node values
+        :type getters: list of `NodeGetter`
+        :param edges_out: an output stream for edge rows, or None
+        """
+        super(CSVSink, self).__init__(out, getters)
+        self._nodes = csv.writer(out, lineterminator=os.linesep)
+        self._edges = None if edges_out is None else \
+           csv.writer(edges_out, lineterminator=os.linesep)
+
+    def begin(self, graph):
+        self._nodes.writerow(['node'] + self.names)
+        if self._edges is not None:
+            self._edges.writerow(['source', 'target', 'edgetype'])
+
+    def node(self, node, attrdict):
+        self._nodes.writerow(
+           [node] + ['' if v is None else v for v in self.values(attrdict)]
+        )
+
+    def edge(self, source, target, attrdict):
+        if self._edges is not None:
+            self._edges.writerow(
+               [source, target, attrdict.get('edgetype', '')]
+            )
+
+
+class DOTSink(ExportSink):
+    """
+    Export the graph in graphviz's DOT language.
+
+    Nodes are labeled with the values of the getters, one per line, and
+    edges with their edge types.
+    """
+
+    @staticmethod
+    def _escape(value):
+        """
+        Escape a value for use within a DOT quoted string.
+
+        :param object value: the value
+        :rtype: str
+        """
+        value = six.text_type(value)
+        return value.replace('\\', '\\\\').replace('"', '\\"')
+
+    @classmethod
+    def _quote(cls, value):
+        """
+        Quote a value as a DOT identifier.
+
+        :param object value: the value
+        :rtype: str
+        """
+        return '"%s"' % cls._escape(value)
+
+    def begin(self, graph):
+        name = graph.graph.get('name', '') if \
+           isinstance(graph.graph, dict) else ''
+        print("digraph %s {" % self._quote(name), file=self.out)
+
+    def node(self, node, attrdict):
+        label = "\\n".join(
+           self._escape(v) for v in self.values(attrdict) if v is not None
+        )
+        print(
+           '    %s [label="%s"];' % (self._quote(node), label),
+           file=self.out
+        )
+
+    def edge(self, source, target, attrdict):
+        edgetype = attrdict.get('edgetype')
+        label = "" if edgetype is None else \
+           " [label=%s]" % self._quote(edgetype)
+        print(
+           "    %s -> %s%s;" % \
+              (self._quote(source), self._quote(target), label),
+           file=self.out
+        )
+
+    def end(self):
+        print("}", file=self.out)
+
+
+class Exporter(object):
+    """
+    Feed a graph to any number of sinks in a single pass.
+    """
+    # pylint: disable=too-few-public-methods
+
+    @staticmethod
+    def export(graph, sinks, nodes=None):
+        """
+        Export ``graph`` to every sink.
+
+        :param `DiGraph` graph: the graph
+        :param sinks: the sinks
+        :type sinks: list of `ExportSink`
+        :param nodes: the nodes in the order to export them, None for all
+        :type nodes: iterable of node or NoneType
+
+        ``nodes`` may be the output of a traversal, with nodes repeated or,
+        if the traversal was shared, replaced by a `BackReference`; each
+        node is exported only the first time it is encountered.
+        Each node is followed by the edges that leave it for other exported
+        nodes, so a partial traversal yields no edge to a node that is not
+        exported. The nodes of an interned graph are passed to the sinks
+        as strings.
+        """
+        sinks = list(sinks)
+        name = NodeIds.names(graph)
+
+        if nodes is None:
+            (order, exported) = (graph.nodes_iter(), graph)
+        else:
+            (order, exported) = ([], set())
+            for node in nodes:
+                if isinstance(node, BackReference):
+                    node = node.node
+                if node not in exported:
+                    exported.add(node)
+                    order.append(node)
+
+        for sink in sinks:
+            sink.begin(graph)
+
+        for node in order:
+            attrdict = graph.node[node]
+            node_name = name(node)
+            for sink in sinks:
+                sink.node(node_name, attrdict)
+
+            for (_, target, edgedict) in \
+               graph.out_edges_iter(node, data=True):
+                if target not in exported:
+                    continue
+                target_name = name(target)
+                for sink in sinks:
+                    sink.edge(node_name, target_name, edgedict)
+
+        for sink in sinks:
+            sink.end()
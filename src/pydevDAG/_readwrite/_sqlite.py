@@ -0,0 +1,503 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2016  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+# Red Hat Author(s): Anne Mulhern <amulhern@redhat.com>
+
+"""
+    pydevDAG._readwrite._sqlite
+    ===========================
+
+    Storing graphs in an SQLite database.
+
+    .. moduleauthor::  mulhern <amulhern@redhat.com>
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import json
+import sqlite3
+
+import six
+
+from .._errors import DAGValueError
+from .._index import TrackedDiGraph
+from .._interning import NodeIds
+from .._utils import Dict
+
+from ._write import Rewriter
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS graphs (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    attributes TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS nodes (
+    graph INTEGER NOT NULL REFERENCES graphs(id) ON DELETE CASCADE,
+    id INTEGER NOT NULL,
+    name NOT NULL,
+    nodetype TEXT,
+    PRIMARY KEY (graph, id)
+);
+CREATE UNIQUE INDEX IF NOT EXISTS nodes_name ON nodes(graph, name);
+CREATE INDEX IF NOT EXISTS nodes_nodetype ON nodes(nodetype, graph);
+CREATE TABLE IF NOT EXISTS edges (
+    graph INTEGER NOT NULL REFERENCES graphs(id) ON DELETE CASCADE,
+    source INTEGER NOT NULL,
+    target INTEGER NOT NULL,
+    edgetype TEXT,
+    attributes TEXT NOT NULL,
+    PRIMARY KEY (graph, source, target)
+);
+CREATE INDEX IF NOT EXISTS edges_target ON edges(graph, target);
+CREATE INDEX IF NOT EXISTS edges_edgetype ON edges(edgetype, graph);
+CREATE TABLE IF NOT EXISTS node_attributes (
+    graph INTEGER NOT NULL REFERENCES graphs(id) ON DELETE CASCADE,
+    node INTEGER NOT NULL,
+    key TEXT NOT NULL,
+    value,
+    encoded INTEGER NOT NULL,
+    PRIMARY KEY (graph, node, key)
+);
+CREATE INDEX IF NOT EXISTS node_attributes_value
+    ON node_attributes(key, value, graph);
+"""
+
+
+class _Attributes(object):
+    """
+    Conversion between nested attribute dicts and attribute rows.
+
+    Every leaf of an attribute dict becomes a row. The key of a row is the
+    JSON encoding of the list of keys that lead to the leaf. Strings and
+    numbers are stored as themselves, so that they can be indexed and
+    compared in SQL, all other values are stored JSON encoded.
+    """
+
+    _SCALARS = six.string_types + six.integer_types + (float, type(None))
+
+    @staticmethod
+    def key(keys):
+        """
+        The key of the row for the attribute at ``keys``.
+
+        :param keys: list of keys
+        :type keys: list of str
+        :returns: the key
+        :rtype: str
+        """
+        return json.dumps(list(keys), separators=(',', ':'))
+
+    @classmethod
+    def encode(cls, value):
+        """
+        Encode a leaf value.
+
+        :param object value: the value
+        :returns: the value to store and whether it is JSON encoded
+        :rtype: tuple of object * int
+        """
+        if isinstance(value, cls._SCALARS) and not isinstance(value, bool):
+            return (value, 0)
+        return (json.dumps(value), 1)
+
+    @staticmethod
+    def decode(value, encoded):
+        """
+        Inverse of encode.
+
+        :param object value: the stored value
+        :param int encoded: whether the value is JSON encoded
+        :returns: the original value
+        :rtype: object
+        """
+        return json.loads(value) if encoded else value
+
+    @classmethod
+    def flatten(cls, tree, prefix=None):
+        """
+        Generate the leaves of ``tree``.
+
+        :param dict tree: arbitrarily nested dict
+        :param prefix: the keys which lead to ``tree``
+        :type prefix: list of str or NoneType
+
+        Yields pairs of row key, value. Empty dicts are leaves.
+        """
+        prefix = prefix or []
+        for (key, value) in tree.items():
+            keys = prefix + [key]
+            if isinstance(value, dict) and value:
+                for leaf in cls.flatten(value, keys):
+                    yield leaf
+            else:
+                yield (cls.key(keys), value)
+
+
+def _placeholders(number):
+    """
+    Parameter placeholders for an SQL list of ``number`` values.
+
+    :param int number: the number of values
+    :rtype: str
+    """
+    return ", ".join(["?"] * number)
+
+
+class SQLiteStore(object):
+    """
+    Store any number of graphs in a single SQLite database.
+
+    Nodes, edges, and node attributes are stored in separate tables, indexed
+    so that nodes may be found by node type or attribute value, and edges
+    by edge type, without loading any graph into memory.
+    """
+
+    _CHUNK_SIZE = 500
+
+    def __init__(self, database):
+        """
+        Initializer.
+
+        :param database: a path or an open connection
+        :type database: str or `sqlite3.Connection`
+        """
+        if isinstance(database, sqlite3.Connection):
+            self.connection = database
+        else:
+            self.connection = sqlite3.connect(database)
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        self.connection.executescript(_SCHEMA)
+
+    def close(self):
+        """
+        Close the underlying connection.
+        """
+        self.connection.close()
+
+    def execute(self, sql, parameters=()):
+        """
+        Execute an SQL statement against the store.
+
+        :param str sql: the statement
+        :param parameters: the parameters for the statement
+        :returns: a cursor over the result
+        :rtype: `sqlite3.Cursor`
+        """
+        return self.connection.execute(sql, parameters)
+
+    def names(self):
+        """
+        The names of all stored graphs.
+
+        :rtype: list of str
+        """
+        return [r[0] for r in self.execute("SELECT name FROM graphs")]
+
+    def _graph_id(self, name):
+        """
+        The id of the graph called ``name``.
+
+        :param str name: the name of the graph
+        :rtype: int
+
+        :raises DAGValueError: if there is no such graph
+        """
+        row = self.execute(
+           "SELECT id FROM graphs WHERE name = ?",
+           (name,)
+        ).fetchone()
+        if row is None:
+            raise DAGValueError("no graph named %s in store" % name)
+        return row[0]
+
+    def save(self, graph, name):
+        """
+        Save a graph, replacing any graph of the same name.
+
+        :param `DiGraph` graph: the graph
+        :param str name: the name to save the graph under
+        """
+        if graph.is_multigraph():
+            raise DAGValueError("multigraphs can not be stored")
+
+        graph = graph.copy()
+        Rewriter.stringize(graph)
+
+        ids = dict((n, i) for (i, n) in enumerate(graph.nodes_iter()))
+
+        with self.connection:
+            self.execute("DELETE FROM graphs WHERE name = ?", (name,))
+            graph_id = self.execute(
+               "INSERT INTO graphs (name, attributes) VALUES (?, ?)",
+               (name, json.dumps(graph.graph))
+            ).lastrowid
+
+            self.connection.executemany(
+               "INSERT INTO nodes VALUES (?, ?, ?, ?)",
+               ((graph_id, i, n, graph.node[n].get('nodetype')) \
+                  for (n, i) in ids.items())
+            )
+
+            self.connection.executemany(
+               "INSERT INTO node_attributes VALUES (?, ?, ?, ?, ?)",
+               ((graph_id, ids[n], k) + _Attributes.encode(v) \
+                  for n in graph.nodes_iter() \
+                  for (k, v) in _Attributes.flatten(
+                     dict((x, y) for (x, y) in graph.node[n].items() \
+                        if x != 'nodetype')
+                  ))
+            )
+
+            self.connection.executemany(
+               "INSERT INTO edges VALUES (?, ?, ?, ?, ?)",
+               ((graph_id, ids[s], ids[t], d.get('edgetype'),
+                  json.dumps(dict((x, y) for (x, y) in d.items() \
+                     if x != 'edgetype'))) \
+                  for (s, t, d) in graph.edges_iter(data=True))
+            )
+
+    def delete(self, name):
+        """
+        Delete the graph called ``name``.
+
+        :param str name: the name of the graph
+        """
+        with self.connection:
+            self.execute("DELETE FROM graphs WHERE name = ?", (name,))
+
+    def _chunks(self, values):
+        """
+        Generate lists of values short enough to bind in a single statement.
+
+        :param values: the values
+        :type values: iterable of object
+        """
+        chunk = []
+        for value in values:
+            chunk.append(value)
+            if len(chunk) == self._CHUNK_SIZE:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def _node_rows(self, graph_id, nodes):
+        """
+        Get id, name and nodetype for nodes.
+
+        :param int graph_id: the id of the graph
+        :param nodes: the names of the nodes, or None for all nodes
+        :type nodes: iterable of object or NoneType
+        :returns: rows of id, name, nodetype
+        :rtype: list of tuple
+        """
+        sql = "SELECT id, name, nodetype FROM nodes WHERE graph = ?"
+        if nodes is None:
+            return self.execute(sql, (graph_id,)).fetchall()
+
+        rows = []
+        for chunk in self._chunks(nodes):
+            rows.extend(
+               self.execute(
+                  sql + " AND name IN (%s)" % _placeholders(len(chunk)),
+                  [graph_id] + chunk
+               )
+            )
+        return rows
+
+    def _rows(self, sql, column, graph_id, ids):
+        """
+        Generate rows for a query on a graph, restricted to some nodes.
+
+        :param str sql: a query with a single graph parameter
+        :param str column: the column to match against ``ids``
+        :param int graph_id: the id of the graph
+        :param ids: ids of nodes, or None for no restriction
+        :type ids: list of int or NoneType
+        """
+        if ids is None:
+            for row in self.execute(sql, (graph_id,)):
+                yield row
+            return
+
+        for chunk in self._chunks(ids):
+            statement = "%s AND %s IN (%s)" % \
+               (sql, column, _placeholders(len(chunk)))
+            for row in self.execute(statement, [graph_id] + chunk):
+                yield row
+
+    def load(self, name, nodes=None, interned=False):
+        """
+        Load a graph, or the subgraph induced by some of its nodes.
+
+        :param str name: the name of the graph
+        :param nodes: the names of the nodes to load, None for all
+        :type nodes: iterable of object or NoneType
+        :param bool interned: if True, intern the graph with `NodeIds`
+        :returns: the graph
+        :rtype: `TrackedDiGraph`
+
+        Nodes which are not in the stored graph are ignored.
+        """
+        # pylint: disable=too-many-locals
+        graph_id = self._graph_id(name)
+        (attributes,) = self.execute(
+           "SELECT attributes FROM graphs WHERE id = ?",
+           (graph_id,)
+        ).fetchone()
+
+        graph = TrackedDiGraph()
+        graph.graph = json.loads(attributes)
+
+        rows = self._node_rows(graph_id, nodes)
+        names = dict((i, n) for (i, n, _) in rows)
+        for (_, node, nodetype) in rows:
+            graph.add_node(node)
+            if nodetype is not None:
+                graph.node[node]['nodetype'] = nodetype
+
+        ids = None if nodes is None else list(names)
+
+        attribute_rows = self._rows(
+           "SELECT node, key, value, encoded FROM node_attributes "
+           "WHERE graph = ?",
+           "node",
+           graph_id,
+           ids
+        )
+        for (node, key, value, encoded) in attribute_rows:
+            Dict.set_value(
+               graph.node[names[node]],
+               json.loads(key),
+               _Attributes.decode(value, encoded),
+               force=True
+            )
+
+        edge_rows = self._rows(
+           "SELECT source, target, edgetype, attributes FROM edges "
+           "WHERE graph = ?",
+           "source",
+           graph_id,
+           ids
+        )
+        for (source, target, edgetype, attributes) in edge_rows:
+            if target in names:
+                attrs = json.loads(attributes)
+                attrs['edgetype'] = edgetype
+                graph.add_edge(names[source], names[target], attrs)
+
+        Rewriter.destringize(graph)
+        if interned:
+            NodeIds.intern_graph(graph)
+        return graph
+
+    def find_nodes(self, attributes=None, nodetype=None, names=None):
+        """
+        Find nodes by node type and attribute values.
+
+        :param attributes: map from lists of keys to required values
+        :type attributes: dict of (tuple of str) * object or NoneType
+        :param nodetype: the required node type, or None
+        :type nodetype: `NodeType` or NoneType
+        :param names: the graphs to search, or None for all graphs
+        :type names: list of str or NoneType
+        :returns: pairs of graph name and node name
+        :rtype: list of tuple of str * object
+        """
+        clauses = []
+        parameters = []
+
+        for (index, (keys, value)) in enumerate((attributes or {}).items()):
+            (value, encoded) = _Attributes.encode(value)
+            clauses.append(
+               "EXISTS (SELECT 1 FROM node_attributes AS a%(i)s "
+               "WHERE a%(i)s.graph = n.graph AND a%(i)s.node = n.id "
+               "AND a%(i)s.key = ? AND a%(i)s.value IS ? "
+               "AND a%(i)s.encoded = ?)" % {'i': index}
+            )
+            parameters.extend([_Attributes.key(keys), value, encoded])
+
+        if nodetype is not None:
+            clauses.append("n.nodetype = ?")
+            parameters.append(str(nodetype))
+
+        if names is not None:
+            clauses.append("g.name IN (%s)" % _placeholders(len(names)))
+            parameters.extend(names)
+
+        sql = "SELECT g.name, n.name FROM nodes AS n " \
+           "JOIN graphs AS g ON g.id = n.graph"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        return self.execute(sql, parameters).fetchall()
+
+    def reachable(self, name, nodes, reverse=False, edgetypes=None):
+        """
+        Find the nodes reachable from ``nodes``, computed within SQL.
+
+        :param str name: the name of the graph
+        :param nodes: the names of the nodes to start from
+        :type nodes: iterable of object
+        :param bool reverse: if True, follow edges backwards
+        :param edgetypes: the edge types to follow, or None for all
+        :type edgetypes: list of `EdgeType` or NoneType
+        :returns: the names of the nodes reachable by at least one edge
+        :rtype: list of object
+
+        A node in ``nodes`` is included only if it is reachable from
+        another. The nodes are looked up in chunks, so that any number may
+        be given.
+        """
+        # pylint: disable=too-many-locals
+        graph_id = self._graph_id(name)
+        (start, end) = ('target', 'source') if reverse else \
+           ('source', 'target')
+
+        edge_clause = ""
+        edge_parameters = []
+        if edgetypes is not None:
+            edge_clause = \
+               " AND e.edgetype IN (%s)" % _placeholders(len(edgetypes))
+            edge_parameters = [str(e) for e in edgetypes]
+
+        sql = (
+           "WITH RECURSIVE reached(id) AS ("
+           "SELECT e.%(end)s FROM edges AS e JOIN nodes AS s "
+           "ON e.%(start)s = s.id WHERE s.graph = ? "
+           "AND s.name IN (%%s)%(edges)s "
+           "UNION "
+           "SELECT e.%(end)s FROM edges AS e JOIN reached AS r "
+           "ON e.%(start)s = r.id WHERE e.graph = ?%(edges)s) "
+           "SELECT n.name FROM nodes AS n JOIN reached AS r ON n.id = r.id"
+        ) % {'start': start, 'end': end, 'edges': edge_clause}
+
+        result = []
+        seen = set()
+        for chunk in self._chunks(nodes):
+            parameters = [graph_id] + chunk + edge_parameters + \
+               [graph_id] + edge_parameters
+            for (node,) in \
+               self.execute(sql % _placeholders(len(chunk)), parameters):
+                if node not in seen:
+                    seen.add(node)
+                    result.append(node)
+        return result
@@ -0,0 +1,446 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2016  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+# Red Hat Author(s): Anne Mulhern <amulhern@redhat.com>
+
+"""
+    pydevDAG._readwrite._stream
+    ===========================
+
+    Incremental encoding and decoding of node-link formatted JSON.
+
+    .. moduleauthor::  mulhern <amulhern@redhat.com>
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import json
+import re
+
+from itertools import count
+
+import networkx as nx
+
+from networkx.utils import make_str
+
+from .._errors import DAGValueError
+from .._index import TrackedDiGraph
+from .._utils import ExtendedLookup
+
+
+class JSONStream(object):
+    """
+    Decode the members of a top-level JSON object as they are read.
+
+    Array members are not decoded as a whole, each element is decoded
+    only when it is requested, so that only a single element of an array
+    need be held in memory.
+    """
+
+    _CHUNK_SIZE = 2 ** 16
+    _WHITESPACE = re.compile(r'\s*')
+
+    def __init__(self, instream):
+        """
+        Initializer.
+
+        :param instream: a text input stream
+        """
+        self._instream = instream
+        self._buffer = ''
+        self._pos = 0
+        self._eof = False
+        self._decoder = json.JSONDecoder()
+
+    def _fill(self):
+        """
+        Read more data into the buffer, discarding the consumed prefix.
+
+        :returns: False if the stream is exhausted, otherwise True
+        :rtype: bool
+
+        The amount read grows with the amount that is buffered, so that
+        decoding an element larger than a chunk does not become quadratic.
+        """
+        if self._eof:
+            return False
+        remaining = self._buffer[self._pos:]
+        chunk = self._instream.read(max(self._CHUNK_SIZE, len(remaining)))
+        if not chunk:
+            self._eof = True
+            return False
+        self._buffer = remaining + chunk
+        self._pos = 0
+        return True
+
+    def _peek(self):
+        """
+        Skip whitespace and return the next character.
+
+        :returns: the next character, or the empty string at end of stream
+        :rtype: str
+        """
+        while True:
+            self._pos = self._WHITESPACE.match(self._buffer, self._pos).end()
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                return ''
+
+    def _expect(self, chars):
+        """
+        Consume the next character, which must be one of ``chars``.
+
+        :param str chars: the permissible characters
+        :returns: the character consumed
+        :rtype: str
+
+        :raises DAGValueError: if the next character is not permissible
+        """
+        char = self._peek()
+        if char == '' or char not in chars:
+            raise DAGValueError(
+               "expected one of '%s' at offset %s" % (chars, self._pos)
+            )
+        self._pos += 1
+        return char
+
+    def _value(self):
+        """
+        Decode the next complete JSON value.
+
+        :returns: the value
+        :rtype: object
+
+        :raises DAGValueError: if no value can be decoded
+        """
+        self._peek()
+        while True:
+            try:
+                (value, end) = self._decoder.raw_decode(self._buffer, self._pos)
+            except ValueError as err:
+                if not self._fill():
+                    raise DAGValueError(err)
+                continue
+
+            # a value which ends the buffer may be a truncated number
+            if end < len(self._buffer) or not self._fill():
+                self._pos = end
+                return value
+
+    def _elements(self):
+        """
+        Generate the elements of an array whose '[' has been consumed.
+        """
+        if self._peek() == ']':
+            self._pos += 1
+            return
+        while True:
+            yield self._value()
+            if self._expect(',]') == ']':
+                return
+
+    def members(self):
+        """
+        Generate the members of the top-level object.
+
+        Yields pairs of key and value. If the value is an array, an iterator
+        over its elements is yielded in its place; any elements that are not
+        consumed before the next member is requested are skipped.
+        """
+        self._expect('{')
+        if self._peek() == '}':
+            self._pos += 1
+            return
+        while True:
+            key = self._value()
+            self._expect(':')
+            if self._peek() == '[':
+                self._pos += 1
+                elements = self._elements()
+                yield (key, elements)
+                for _ in elements:
+                    pass
+            else:
+                yield (key, self._value())
+            if self._expect(',}') == '}':
+                return
+
+
+class JSONObjectWriter(object):
+    """
+    Encode the members of a top-level JSON object as they are written.
+
+    Array members are not encoded as a whole, each element is encoded as
+    it is written, so that only a single element of an array need be held
+    in memory. The output is the same as that of json.dump with an indent
+    of 4.
+    """
+
+    _INDENT = ' ' * 4
+
+    def __init__(self, outstream):
+        """
+        Initializer.
+
+        :param outstream: a text output stream
+        """
+        self._outstream = outstream
+        self._members = 0
+        self._outstream.write('{')
+
+    def _encode(self, value, level):
+        """
+        Encode a value nested ``level`` deep.
+
+        :param object value: the value
+        :param int level: the depth of the value
+        :returns: the encoded value
+        :rtype: str
+        """
+        return json.dumps(value, indent=4, separators=(',', ': ')).replace(
+           '\n',
+           '\n' + self._INDENT * level
+        )
+
+    def _key(self, key):
+        """
+        Begin a member.
+
+        :param str key: the key of the member
+        """
+        self._outstream.write(
+           '%s\n%s%s: ' % (
+              ',' if self._members else '',
+              self._INDENT,
+              json.dumps(key)
+           )
+        )
+        self._members += 1
+
+    def member(self, key, value):
+        """
+        Write a member.
+
+        :param str key: the key of the member
+        :param object value: the value of the member
+        """
+        self._key(key)
+        self._outstream.write(self._encode(value, 1))
+
+    def array(self, key, elements):
+        """
+        Write an array member, an element at a time.
+
+        :param str key: the key of the member
+        :param elements: the elements of the array
+        :type elements: iterable of object
+        """
+        self._key(key)
+        separator = '[\n' + self._INDENT * 2
+        for element in elements:
+            self._outstream.write(separator)
+            self._outstream.write(self._encode(element, 2))
+            separator = ',\n' + self._INDENT * 2
+
+        if separator[0] == '[':
+            self._outstream.write('[]')
+        else:
+            self._outstream.write('\n%s]' % self._INDENT)
+
+    def close(self):
+        """
+        End the top-level object.
+        """
+        self._outstream.write('\n}' if self._members else '}')
+
+
+class NodeLinkStream(object):
+    """
+    Build a graph from a stream of node-link formatted JSON.
+
+    The result is the same as that of networkx's node_link_graph, but
+    nodes and links are added to the graph as they are decoded.
+
+    Optionally, only some attributes of nodes and links are kept. All others
+    are discarded as soon as each node or link is decoded.
+    """
+    # pylint: disable=too-few-public-methods
+
+    _NODE_KEYS = ('id',)
+    _LINK_KEYS = ('source', 'target', 'key')
+
+    @classmethod
+    def _to_tuple(cls, value):
+        """
+        Convert lists to tuples, as node_link_graph does for node ids.
+
+        :param object value: a decoded JSON value
+        :returns: the value, with every list converted to a tuple
+        :rtype: object
+        """
+        if isinstance(value, list):
+            return tuple(cls._to_tuple(v) for v in value)
+        return value
+
+    @staticmethod
+    def _projector(config, keys):
+        """
+        Get a function that selects attributes of a node or link.
+
+        :param config: the attributes to keep, None for all
+        :type config: dict (JSON) or NoneType
+        :param keys: keys that are always kept
+        :type keys: tuple of str
+        :returns: a function that selects attributes
+        :rtype: dict -> dict
+        """
+        if config is None:
+            return lambda datum: datum
+
+        config = dict(config)
+        config.update((k, {}) for k in keys)
+        return ExtendedLookup(config).project
+
+    @staticmethod
+    def _new_graph(data, multigraph=True, directed=False):
+        """
+        Make an empty graph of the kind described by ``data``.
+
+        :param dict data: the top-level members read so far
+        :param bool multigraph: default if data does not specify
+        :param bool directed: default if data does not specify
+        :returns: an empty graph
+        :rtype: Graph
+        """
+        multigraph = data.get('multigraph', multigraph)
+        directed = data.get('directed', directed)
+        if directed:
+            return nx.MultiDiGraph() if multigraph else TrackedDiGraph()
+        return nx.MultiGraph() if multigraph else nx.Graph()
+
+    @classmethod
+    def _convert(cls, graph, data):
+        """
+        Convert ``graph`` to the kind described by ``data``.
+
+        :param Graph graph: a graph, directed and a multigraph
+        :param dict data: all the top-level members
+        :returns: a graph of the kind described by ``data``
+        :rtype: Graph
+
+        Only necessary if nodes precede the description of the graph kind
+        in the input, in which case the most general kind is used until the
+        end of the input is reached.
+        """
+        result = cls._new_graph(data)
+        if type(result) is type(graph):
+            return graph
+        result.add_nodes_from(graph.nodes_iter(data=True))
+        if result.is_multigraph():
+            result.add_edges_from(graph.edges_iter(keys=True, data=True))
+        else:
+            result.add_edges_from(graph.edges_iter(data=True))
+        return result
+
+    @classmethod
+    def read(cls, instream, node_attributes=None, edge_attributes=None):
+        """
+        Read a graph from a text stream.
+
+        :param instream: the text input stream
+        :param node_attributes: node attributes to keep, None for all
+        :type node_attributes: dict (JSON) or NoneType
+        :param edge_attributes: edge attributes to keep, None for all
+        :type edge_attributes: dict (JSON) or NoneType
+        :returns: the graph
+        :rtype: Graph
+
+        :raises DAGValueError: on malformed input
+
+        Attributes to keep are specified in the format of `ExtendedLookup`.
+        """
+        # pylint: disable=too-many-locals
+        node_projector = cls._projector(node_attributes, cls._NODE_KEYS)
+        link_projector = cls._projector(edge_attributes, cls._LINK_KEYS)
+
+        data = dict()
+        graph = None
+        mapping = []
+        ids = count()
+        links = []
+
+        for (key, value) in JSONStream(instream).members():
+            if key == 'nodes':
+                graph = cls._new_graph(data, multigraph=True, directed=True)
+                for datum in (node_projector(d) for d in value):
+                    node = cls._to_tuple(datum.get('id', next(ids)))
+                    mapping.append(node)
+                    graph.add_node(
+                       node,
+                       dict((make_str(k), v) for k, v in datum.items() \
+                          if k != 'id')
+                    )
+                for datum in links:
+                    cls._add_link(graph, mapping, datum)
+                links = None
+            elif key == 'links':
+                value = (link_projector(d) for d in value)
+                if links is None:
+                    for datum in value:
+                        cls._add_link(graph, mapping, datum)
+                else:
+                    links.extend(value)
+            else:
+                data[key] = value
+
+        if graph is None:
+            raise DAGValueError("no nodes in graph data")
+
+        graph = cls._convert(graph, data)
+        graph.graph = data.get('graph', {})
+        return graph
+
+    @staticmethod
+    def _add_link(graph, mapping, datum):
+        """
+        Add a single link to the graph.
+
+        :param Graph graph: the graph
+        :param mapping: map from node indices to nodes
+        :type mapping: list of object
+        :param dict datum: the link data
+        """
+        try:
+            source = mapping[datum['source']]
+            target = mapping[datum['target']]
+        except (IndexError, KeyError, TypeError) as err:
+            raise DAGValueError("bad link %s: %s" % (datum, err))
+
+        if graph.is_multigraph():
+            ignore = ('source', 'target', 'key')
+            attrs = dict((make_str(k), v) for k, v in datum.items() \
+               if k not in ignore)
+            graph.add_edge(source, target, datum.get('key'), attrs)
+        else:
+            ignore = ('source', 'target')
+            attrs = dict((make_str(k), v) for k, v in datum.items() \
+               if k not in ignore)
+            graph.add_edge(source, target, attrs)
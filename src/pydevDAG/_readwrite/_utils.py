@@ -43,16 +43,23 @@ class StringUtils(object):
     # pylint: disable=too-few-public-methods
 
     @staticmethod
-    def as_string(graph, write_func):
+    def as_string(graph, write_func, compression=None):
         """
         Return the entire graph as a single string in a structured format.
 
         :param `DiGraph` graph: the graph
         :param write_func: the function to write the graph
         :type write_func: `DiGraph` * file -> NoneType
-        :returns: the graph as a stringlike thing
+        :param compression: a compression format, from `Compressions`
+        :type compression: type or NoneType
+        :returns: the graph as a stringlike thing, bytes if compressed
         """
         # pylint: disable=redefined-variable-type
+        if compression is not None:
+            output = io.BytesIO()
+            write_func(graph, output, compression=compression)
+            return output.getvalue()
+
         if six.PY2:
             output = io.BytesIO()
         else:
@@ -65,10 +72,13 @@ class StringUtils(object):
         """
         Get a graph from a string.
 
+        :param instr: the string, bytes if compressed
         :param read_func: a function that reads data from an input stream
         """
         # pylint: disable=redefined-variable-type
-        if six.PY2:
+        if not isinstance(instr, six.text_type):
+            infile = io.BytesIO(instr)
+        elif six.PY2:
             infile = io.BytesIO(instr.encode())
         else:
             infile = io.StringIO(instr)
@@ -42,11 +42,17 @@ from parseudev import Devlink
 from pydevDAG._attributes import EdgeTypes
 from pydevDAG._attributes import NodeTypes
 
+from pydevDAG._interning import NodeIds
+
 
 @add_metaclass(abc.ABCMeta)
 class ElementRewriter(object):
     """
     Generic interface of an element rewriter.
+
+    A rewriter replaces the values of attributes, and never changes a
+    value in place, so an element may be rewritten in a shallow copy of
+    its attributes.
     """
 
     @staticmethod
@@ -145,8 +151,10 @@ class DevlinkRewriter(ElementRewriter):
             devlink = graph.node[node]['DEVLINK']
         except KeyError:
             return
-        for key, value in devlink.items():
-            devlink[key] = None if value is None else [str(d) for d in value]
+        graph.node[node]['DEVLINK'] = dict(
+           (key, None if value is None else [str(d) for d in value]) \
+              for (key, value) in devlink.items()
+        )
 
     @staticmethod
     def destringize(graph, node):
@@ -154,9 +162,10 @@ class DevlinkRewriter(ElementRewriter):
             devlink = graph.node[node]['DEVLINK']
         except KeyError:
             return
-        for key, value in devlink.items():
-            devlink[key] = \
-               None if value is None else [Devlink(d) for d in value]
+        graph.node[node]['DEVLINK'] = dict(
+           (key, None if value is None else [Devlink(d) for d in value]) \
+              for (key, value) in devlink.items()
+        )
 
 class EdgeTypeRewriter(ElementRewriter):
     """
@@ -176,6 +185,22 @@ class EdgeTypeRewriter(ElementRewriter):
            EdgeTypes.get_value
         )
 
+class _Single(object):
+    """
+    A graph of one node, with a copy of its attributes, for the rewriters.
+    """
+    # pylint: disable=too-few-public-methods
+
+    def __init__(self, node, attrdict):
+        """
+        Initializer.
+
+        :param node: the node
+        :param dict attrdict: the attributes of the node, which are copied
+        """
+        self.node = {node: dict(attrdict)}
+
+
 class Rewriter(object):
     """
     Rewrite graph for output.
@@ -219,8 +244,11 @@ class Rewriter(object):
         """
         Xform objects in graph to strings as necessary.
         :param graph: the graph
+
+        An interned graph is restored to string nodes.
         """
         cls._rewrite(graph, True)
+        NodeIds.restore_graph(graph)
 
     @classmethod
     def destringize(cls, graph):
@@ -229,3 +257,35 @@ class Rewriter(object):
         :param graph: the graph
         """
         cls._rewrite(graph, False)
+
+    @classmethod
+    def stringize_node(cls, graph, node):
+        """
+        The attributes of ``node`` as stringize() makes them.
+
+        :param graph: the graph, which is not changed
+        :param node: the node
+        :returns: new attributes
+        :rtype: dict
+        """
+        single = _Single(node, graph.node[node])
+        for rewriter in cls._NODE_REWRITERS:
+            rewriter.stringize(single, node)
+        return single.node[node]
+
+    @classmethod
+    def stringize_edge(cls, source, target, edgedict):
+        """
+        The attributes of an edge as stringize() makes them.
+
+        :param source: the source of the edge
+        :param target: the target of the edge
+        :param dict edgedict: the attributes of the edge, which are not
+           changed
+        :returns: new attributes
+        :rtype: dict
+        """
+        single = {source: {target: dict(edgedict)}}
+        for rewriter in cls._EDGE_REWRITERS:
+            rewriter.stringize(single, (source, target))
+        return single[source][target]
@@ -32,8 +32,14 @@ from __future__ import division
 from __future__ import print_function
 from __future__ import unicode_literals
 
+from itertools import chain
+
 import networkx as nx
 
+from ..._index import TrackedDiGraph
+from ..._interning import NodeIds
+from ..._interning import StringTable
+
 
 class PyudevAggregateGraph(object):
     """
@@ -42,7 +48,7 @@ class PyudevAggregateGraph(object):
     # pylint: disable=too-few-public-methods
 
     @staticmethod
-    def graph(context, name, classes):
+    def graph(context, name, classes, interned=False):
         """
         Build a graph using the designated classes.
 
@@ -50,10 +56,16 @@ class PyudevAggregateGraph(object):
         :param str name: a name for the graph
         :param classes: a list of graph classes
         :type classes: list of type, each type must be subtype of PyudevGraph
+        :param bool interned: if True, intern the graph with `NodeIds`
         :returns: a graph
-        :rtype: nx.DiGraph
+        :rtype: `TrackedDiGraph`
+
+        If ``interned`` is True, the graph of each class is interned with
+        one table as soon as it is built, so the composed graph never has
+        string nodes.
         """
-        return nx.compose_all(
-            (t.complete(context) for t in classes),
-            name=name
-        )
+        graphs = (t.complete(context) for t in classes)
+        if interned:
+            table = StringTable()
+            graphs = (NodeIds.intern_graph(g, table) for g in graphs)
+        return nx.compose_all(chain([TrackedDiGraph()], graphs), name=name)
@@ -0,0 +1,430 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2016  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+# Red Hat Author(s): Anne Mulhern <amulhern@redhat.com>
+
+"""
+    pydevDAG._table
+    ===============
+
+    A columnar table of the attributes of the nodes of a graph.
+
+    .. moduleauthor::  Anne Mulhern  <amulhern@redhat.com>
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from array import array
+from collections import OrderedDict
+from itertools import compress
+
+import six
+
+from ._errors import DAGEnvironmentError
+from ._errors import DAGValueError
+from ._item_str import NodeGetters
+
+try:
+    import numpy
+except ImportError: # pragma: no cover
+    numpy = None # pylint: disable=invalid-name
+
+
+class GraphTable(object):
+    """
+    A table with a row for each node and a column for each getter.
+
+    A column of integers or of floats is stored as a typed array, any
+    other column as a list. Each operation makes a single pass over the
+    columns it uses, and returns a new table; the nodes of its rows are
+    always available, in ``nodes``.
+    """
+
+    def __init__(self, nodes, names, columns):
+        """
+        Initializer.
+
+        :param nodes: the node of each row
+        :type nodes: list of node
+        :param names: the names of the columns
+        :type names: list of str
+        :param columns: the columns, parallel to ``nodes``
+        :type columns: list of (array or list)
+        """
+        self.nodes = nodes
+        self.names = names
+        self._columns = OrderedDict(zip(names, columns))
+
+    @staticmethod
+    def _typed(values):
+        """
+        Store ``values`` as a typed array if possible.
+
+        :param values: the values
+        :type values: list of object
+        :returns: an array of long or of double, or ``values``
+        :rtype: array or list
+
+        Booleans are not stored as integers.
+        """
+        # pylint: disable=unidiomatic-typecheck
+        if values and all(type(v) in six.integer_types for v in values):
+            try:
+                return array(str('l'), values)
+            except OverflowError:
+                return values
+        if values and all(type(v) is float for v in values):
+            return array(str('d'), values)
+        return values
+
+    @classmethod
+    def from_graph(cls, graph, getters, nodes=None):
+        """
+        Build a table from a graph.
+
+        :param `DiGraph` graph: the graph
+        :param getters: the columns, each a `NodeGetter`, or a pair of a
+           name and a function from the attributes of a node to a value
+        :type getters: list of (`NodeGetter` or tuple of str * (dict -> object))
+        :param nodes: the nodes, or None for all nodes in the graph
+        :type nodes: iterable of node or NoneType
+        :rtype: `GraphTable`
+        """
+        names = []
+        functions = []
+        for getter in getters:
+            if hasattr(getter, 'getter'):
+                names.append(NodeGetters.name(getter))
+                functions.append(getter)
+            else:
+                (name, function) = getter
+                names.append(name)
+                functions.append(_Function(function))
+
+        (nodes, columns) = NodeGetters.columns(graph, functions, nodes)
+        return cls(nodes, names, [cls._typed(c) for c in columns])
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def column(self, name):
+        """
+        The column called ``name``.
+
+        :param str name: the name
+        :returns: the values of the column, which must not be modified
+        :rtype: array or list
+
+        :raises DAGValueError: if there is no such column
+        """
+        try:
+            return self._columns[name]
+        except KeyError:
+            raise DAGValueError("no column %s" % name)
+
+    def numpy(self, name):
+        """
+        The column called ``name`` as a NumPy array.
+
+        :param str name: the name
+        :returns: an array, sharing memory with a typed column
+        :rtype: `ndarray`
+
+        :raises DAGEnvironmentError: if NumPy is not available
+        :raises DAGValueError: if there is no such column
+        """
+        if numpy is None: # pragma: no cover
+            raise DAGEnvironmentError("NumPy is not available")
+        values = self.column(name)
+        if isinstance(values, array):
+            return numpy.frombuffer(values, dtype=numpy.dtype(values.typecode))
+        return numpy.array(values, dtype=object)
+
+    def rows(self):
+        """
+        Iterate over the rows.
+
+        :returns: an iterator over tuples of the node and the values
+        """
+        return six.moves.zip(self.nodes, *self._columns.values())
+
+    @staticmethod
+    def _array(values):
+        """
+        A typed column as a NumPy array, if NumPy is available.
+
+        :param values: the values of a column
+        :type values: array or list
+        :returns: an array sharing memory with ``values``, or None
+        :rtype: `ndarray` or NoneType
+        """
+        if numpy is None or not isinstance(values, array):
+            return None
+        return numpy.frombuffer(values, dtype=numpy.dtype(values.typecode))
+
+    def _take(self, indices):
+        """
+        A table of the rows at ``indices``.
+
+        :param indices: the indices of the rows, in order
+        :type indices: list of int or `ndarray`
+        :rtype: `GraphTable`
+        """
+        if numpy is not None:
+            positions = numpy.asarray(indices, dtype=numpy.intp)
+            indices = positions.tolist()
+
+        def take(values):
+            """
+            The values at ``indices``, in the same type of sequence.
+            """
+            if not isinstance(values, array):
+                return list(six.moves.map(values.__getitem__, indices))
+            typed = self._array(values)
+            if typed is None:
+                return array(values.typecode, [values[i] for i in indices])
+            return array(values.typecode, typed[positions].tobytes())
+
+        return self.__class__(
+           take(self.nodes),
+           self.names,
+           [take(c) for c in self._columns.values()]
+        )
+
+    def select(self, mask):
+        """
+        A table of the rows for which ``mask`` is true.
+
+        :param mask: a boolean for each row, e.g., a NumPy boolean array
+        :type mask: sequence of bool
+        :rtype: `GraphTable`
+
+        :raises DAGValueError: if the mask is not the same length as the table
+        """
+        if len(mask) != len(self.nodes):
+            raise DAGValueError("mask does not match the rows")
+        if numpy is not None and isinstance(mask, numpy.ndarray):
+            return self._take(numpy.flatnonzero(mask))
+        return self._take(list(compress(range(len(self.nodes)), mask)))
+
+    def filter(self, name, predicate):
+        """
+        A table of the rows whose value in ``name`` satisfies ``predicate``.
+
+        :param str name: the name of the column
+        :param predicate: the predicate
+        :type predicate: object -> bool
+        :rtype: `GraphTable`
+
+        If the column is typed and NumPy is available, ``predicate`` is
+        first applied to the whole column, as a NumPy array. If the result
+        is a boolean array with a value for each row, such as that of a
+        comparison, it is the mask. Otherwise ``predicate`` is applied to
+        each value in turn.
+        """
+        values = self.column(name)
+        typed = self._array(values)
+        if typed is not None:
+            try:
+                mask = predicate(typed)
+            except (TypeError, ValueError):
+                mask = None
+            if isinstance(mask, numpy.ndarray) and \
+               mask.dtype == numpy.bool_ and mask.shape == typed.shape:
+                return self.select(mask)
+        return self.select([predicate(v) for v in values])
+
+    def sort(self, names, reverse=False):
+        """
+        A table of the rows sorted by the columns in ``names``.
+
+        :param names: the names of the columns to sort by
+        :type names: list of str
+        :param bool reverse: if True, sort in descending order
+        :rtype: `GraphTable`
+
+        The sort is stable, and None sorts after any other value, whichever
+        the order. Typed columns are sorted by NumPy, if it is available.
+        """
+        columns = [self.column(n) for n in names]
+        typed = [self._array(c) for c in columns]
+        if columns and all(t is not None for t in typed):
+            # lexsort is stable and sorts by its last key first
+            if not reverse:
+                return self._take(numpy.lexsort(typed[::-1]))
+            # a stable descending order is the reverse of the stable
+            # ascending order of the reversed rows
+            last = len(self.nodes) - 1
+            order = numpy.lexsort([t[::-1] for t in typed[::-1]])
+            return self._take(last - order[::-1])
+
+        keys = [
+           tuple(((v is None) != reverse, v) for v in values) for values in \
+              six.moves.zip(*columns)
+        ]
+        order = sorted(
+           range(len(self.nodes)),
+           key=keys.__getitem__,
+           reverse=reverse
+        )
+        return self._take(order)
+
+    def _codes(self, name):
+        """
+        The distinct values in column ``name`` and the code of each row.
+
+        :param str name: the name of the column
+        :returns: the values, in order of their first row, and for each
+           row the position of its value
+        :rtype: tuple of (list of object) * (list of int or `ndarray`)
+
+        A typed column is encoded by NumPy, if it is available.
+        """
+        values = self.column(name)
+        typed = self._array(values)
+        if typed is None:
+            positions = OrderedDict()
+            codes = [positions.setdefault(v, len(positions)) for v in values]
+            return (list(positions), codes)
+
+        (keys, firsts, inverse) = \
+           numpy.unique(typed, return_index=True, return_inverse=True)
+        # renumber the values by their first row
+        by_first = numpy.argsort(firsts)
+        renumber = numpy.empty_like(by_first)
+        renumber[by_first] = numpy.arange(len(by_first))
+        return (keys[by_first].tolist(), renumber[inverse.ravel()])
+
+    @staticmethod
+    def _order(keys, codes):
+        """
+        The indices of the rows grouped by code, and the start of each group.
+
+        :param keys: the distinct values
+        :param codes: the code of each row
+        :type codes: list of int or `ndarray`
+        :rtype: tuple of `ndarray` * `ndarray`
+
+        Requires NumPy.
+        """
+        codes = numpy.asarray(codes, dtype=numpy.intp)
+        order = numpy.argsort(codes, kind='stable')
+        counts = numpy.bincount(codes, minlength=len(keys))
+        return (order, numpy.concatenate(([0], numpy.cumsum(counts)[:-1])))
+
+    def _groups(self, name):
+        """
+        The indices of the rows for each value in column ``name``.
+
+        :param str name: the name of the column
+        :returns: the values, in order of their first row, each with the
+           indices of its rows
+        :rtype: list of tuple of object * (list of int or `ndarray`)
+        """
+        (keys, codes) = self._codes(name)
+        if numpy is None:
+            groups = [[] for _ in keys]
+            for (index, code) in enumerate(codes):
+                groups[code].append(index)
+            return list(six.moves.zip(keys, groups))
+
+        (order, starts) = self._order(keys, codes)
+        return list(six.moves.zip(keys, numpy.split(order, starts[1:])))
+
+    def group_by(self, name):
+        """
+        A table for each value in column ``name``.
+
+        :param str name: the name of the column
+        :returns: map from values to the tables of rows with that value
+        :rtype: dict of object * `GraphTable`
+        """
+        return dict(
+           (value, self._take(indices)) for (value, indices) in \
+              self._groups(name)
+        )
+
+    def count_by(self, name):
+        """
+        The number of rows for each value in column ``name``.
+
+        :param str name: the name of the column
+        :rtype: dict of object * int
+        """
+        (keys, codes) = self._codes(name)
+        if numpy is None:
+            counts = [0] * len(keys)
+            for code in codes:
+                counts[code] += 1
+        else:
+            counts = numpy.bincount(
+               numpy.asarray(codes, dtype=numpy.intp),
+               minlength=len(keys)
+            ).tolist()
+        return dict(six.moves.zip(keys, counts))
+
+    def aggregate(self, name, value_name, function=sum):
+        """
+        Aggregate column ``value_name`` over the rows for each value in
+        column ``name``.
+
+        :param str name: the name of the column to group by
+        :param str value_name: the name of the column to aggregate
+        :param function: the aggregate function, by default sum
+        :type function: list of object -> object
+        :rtype: dict of object * object
+
+        If the column to aggregate is typed, NumPy is available, and the
+        function is sum, min or max, all the groups are reduced at once
+        by NumPy; integers are then summed in the precision of the column.
+        """
+        values = self.column(value_name)
+        typed = self._array(values)
+        reduction = _REDUCTIONS.get(function)
+        if typed is None or reduction is None or len(values) == 0:
+            return dict(
+               (k, function([values[i] for i in indices])) for \
+                  (k, indices) in self._groups(name)
+            )
+
+        (keys, codes) = self._codes(name)
+        (order, starts) = self._order(keys, codes)
+        reduced = getattr(numpy, reduction).reduceat(typed[order], starts)
+        return dict(six.moves.zip(keys, reduced.tolist()))
+
+
+# NumPy ufuncs whose reduction is equivalent to a builtin aggregate function
+_REDUCTIONS = {sum: 'add', min: 'minimum', max: 'maximum'}
+
+
+class _Function(object):
+    """
+    Adapts a function on the attributes of a node to the getter protocol.
+    """
+    # pylint: disable=too-few-public-methods
+
+    def __init__(self, function):
+        """
+        Initializer.
+
+        :param function: function from the attributes of a node to a value
+        :type function: dict -> object
+        """
+        self.getter = function
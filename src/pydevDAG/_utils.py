@@ -31,9 +31,17 @@ from __future__ import division
 from __future__ import print_function
 from __future__ import unicode_literals
 
-import networkx as nx
+try:
+    from collections.abc import Mapping
+except ImportError: # pragma: no cover
+    from collections import Mapping # pylint: disable=deprecated-class
 
 from ._errors import DAGValueError
+from ._views import GraphViews
+from ._views import ReversedView
+
+# GraphIndex and Reachability are imported by the methods that use them,
+# so that Dict and ExtendedLookup do not require networkx to be imported.
 
 
 class GraphUtils(object):
@@ -52,18 +60,149 @@ class GraphUtils(object):
         :returns: the roots of the graph
         :rtype: list of `Node`
         """
-        return [n for n in graph if not nx.ancestors(graph, n)]
+        from ._index import GraphIndex
+        (graph, reverse, edgetypes) = GraphViews.resolve(graph)
+        return list(GraphIndex.get(graph).roots_of(edgetypes, reverse))
 
     @staticmethod
-    def reverse(graph, copy=True):
+    def get_leaves(graph):
+        """
+        Get the leaves of a graph.
+
+        :param `DiGraph` graph: the graph
+
+        :returns: the leaves of the graph
+        :rtype: list of `Node`
+        """
+        from ._index import GraphIndex
+        (graph, reverse, edgetypes) = GraphViews.resolve(graph)
+        return list(GraphIndex.get(graph).roots_of(edgetypes, not reverse))
+
+    @staticmethod
+    def _reachability(graph):
+        """
+        Get the reachability of a graph, seeing through views.
+
+        :param `DiGraph` graph: the graph, or a view of it
+        :returns: the reachability, and True if it is of the reverse of
+           ``graph``, or None if the graph can not be tracked
+        :rtype: tuple of (`Reachability` or NoneType) * bool
+
+        The reachability is that of the graph underlying any views,
+        following only the edge types of the views.
+        """
+        from ._analysis import Reachability
+        from ._index import GraphIndex
+        (base, reverse, edgetypes) = GraphViews.resolve(graph)
+        if not GraphIndex.is_tracked(base):
+            return (None, False)
+        return (Reachability.get(base, edgetypes), reverse)
+
+    @staticmethod
+    def _walk(graph, node, reverse=False):
+        """
+        Yield the nodes reachable from ``node``, each once.
+
+        Used for graphs which can not be tracked, for which a reachability
+        index would have to be rebuilt for every query.
+
+        :param `DiGraph` graph: the graph, or a view of it
+        :param node: the node
+        :param bool reverse: if True, follow edges from target to source
+
+        :raises DAGValueError: if the node is not in the graph
+        """
+        if node not in graph:
+            raise DAGValueError("node %s not in graph" % node)
+        neighbours = graph.predecessors_iter if reverse else \
+           graph.successors_iter
+        seen = set([node])
+        stack = [node]
+        while stack:
+            for other in neighbours(stack.pop()):
+                if other not in seen:
+                    seen.add(other)
+                    stack.append(other)
+                    yield other
+
+    @staticmethod
+    def get_ancestors(graph, node):
+        """
+        Get the ancestors of a node.
+
+        :param `DiGraph` graph: the graph
+        :param node: the node
+
+        :returns: the nodes from which ``node`` is reachable
+        :rtype: set of `Node`
+        """
+        (reachability, reverse) = GraphUtils._reachability(graph)
+        if reachability is None:
+            return set(GraphUtils._walk(graph, node, True))
+        return reachability.descendants(node) if reverse else \
+           reachability.ancestors(node)
+
+    @staticmethod
+    def get_descendants(graph, node):
+        """
+        Get the descendants of a node.
+
+        :param `DiGraph` graph: the graph
+        :param node: the node
+
+        :returns: the nodes reachable from ``node``
+        :rtype: set of `Node`
+        """
+        (reachability, reverse) = GraphUtils._reachability(graph)
+        if reachability is None:
+            return set(GraphUtils._walk(graph, node))
+        return reachability.ancestors(node) if reverse else \
+           reachability.descendants(node)
+
+    @staticmethod
+    def is_ancestor(graph, ancestor, node):
+        """
+        Whether ``ancestor`` is an ancestor of ``node``.
+
+        :param `DiGraph` graph: the graph
+        :param ancestor: the possible ancestor
+        :param node: the node
+
+        :returns: True if ``node`` is reachable from ``ancestor``
+        :rtype: bool
+        """
+        (reachability, reverse) = GraphUtils._reachability(graph)
+        if reachability is None:
+            if node not in graph:
+                raise DAGValueError("node %s not in graph" % node)
+            return ancestor != node and \
+               any(n == node for n in GraphUtils._walk(graph, ancestor))
+        if reverse:
+            (ancestor, node) = (node, ancestor)
+        return reachability.reaches(ancestor, node)
+
+    @staticmethod
+    def reverse(graph, copy=True, view=False):
         """
         Reverse a graph and indicate its status.
 
         :param `DiGraph` graph: the graph
         :param bool copy: if True, make a new copy of the graph
+        :param bool view: if True, return a `ReversedView` of the graph, or
+           the graph underlying ``graph`` if it is a view; ``copy`` is ignored
         :returns: a reversed graph
-        :rtype: `DiGraph`
+        :rtype: `DiGraph` or `ReversedView`
+
+        A view is made in constant time and memory, and shares the graph
+        attributes of the graph it views, so its direction is given by
+        `GraphViews.is_reversed`. Reversing a view yields the graph it
+        views, or a copy of it.
         """
+        if isinstance(graph, ReversedView):
+            return graph.reverse(copy=copy and not view)
+        if view:
+            return ReversedView(graph)
+
         key = 'reversed'
         graph = graph.reverse(copy=copy)
         try:
@@ -73,23 +212,19 @@ class GraphUtils(object):
         return graph
 
     @classmethod
-    def set_direction(cls, graph, set_reversed=False, copy=True):
+    def set_direction(cls, graph, set_reversed=False, copy=True, view=False):
         """
         Set a graph's direction.
 
         :param `DiGraph` graph: the graph
         :param bool set_reversed: if True, direction is reversed
         :param bool copy: if True, make a new copy of the graph
+        :param bool view: if True, reverse by means of a `ReversedView`
         :returns: a reversed graph
-        :rtype: `DiGraph`
+        :rtype: `DiGraph` or `ReversedView`
         """
-        try:
-            is_reversed = graph.graph['reversed']
-        except KeyError:
-            is_reversed = False
-
-        if set_reversed != is_reversed:
-            graph = cls.reverse(graph, copy=copy)
+        if set_reversed != GraphViews.is_reversed(graph):
+            graph = cls.reverse(graph, copy=copy, view=view)
 
         return graph
 
@@ -120,6 +255,54 @@ class Dict(object):
                 raise DAGValueError("value for sequence %s not found" % keys)
         return result
 
+    @staticmethod
+    def accessor(keys, default=None):
+        """
+        Compile a function that gets the value at ``keys``.
+
+        :param keys: list of keys
+        :type keys: list of str
+        :param object default: the result if the value can not be found
+        :returns: a function from a tree to the value or ``default``
+        :rtype: dict -> object
+
+        Unlike get_value(), the function does not raise an exception if the
+        value is missing, so it is cheap to apply to many trees in which
+        the value is often absent. Any mapping is traversed; dicts, which
+        are checked for first, most cheaply.
+        """
+        keys = tuple(keys)
+        is_mapping = lambda tree: tree is not None and \
+           isinstance(tree, Mapping)
+        if len(keys) == 1:
+            (first,) = keys
+            def access(tree):
+                # pylint: disable=missing-docstring
+                if isinstance(tree, dict) or is_mapping(tree):
+                    return tree.get(first, default)
+                return default
+        elif len(keys) == 2:
+            (first, second) = keys
+            def access(tree):
+                # pylint: disable=missing-docstring
+                if isinstance(tree, dict) or is_mapping(tree):
+                    tree = tree.get(first)
+                    if isinstance(tree, dict) or is_mapping(tree):
+                        return tree.get(second, default)
+                return default
+        else:
+            missing = object()
+            def access(tree):
+                # pylint: disable=missing-docstring
+                for key in keys:
+                    if not (isinstance(tree, dict) or is_mapping(tree)):
+                        return default
+                    tree = tree.get(key, missing)
+                    if tree is missing:
+                        return default
+                return tree
+        return access
+
     @staticmethod
     def set_value(tree, keys, value, force=False):
         """
@@ -162,8 +345,17 @@ class Dict(object):
 class ExtendedLookup(object):
     """
     Get the result of looking at multiple attributes of a node at once.
+
+    The config is compiled once into a flat plan: the list of key paths to
+    its leaves, in the order in which their values are generated, each with
+    a compiled accessor.
     """
-    # pylint: disable=too-few-public-methods
+
+    # a sentinel which callers may ask to stand for a missing value
+    MISSING = object()
+
+    # the default for missing, meaning raise an exception
+    _RAISE = object()
 
     def __init__(self, config):
         """
@@ -173,6 +365,30 @@ class ExtendedLookup(object):
         :type config: dict(JSON)
         """
         self.config = config
+        self.paths = self._compile(config)
+        self._accessors = [
+           Dict.accessor(p, self.MISSING) for p in self.paths
+        ]
+
+    @classmethod
+    def _compile(cls, config, prefix=()):
+        """
+        The key paths to the leaves of ``config``.
+
+        :param config: the config
+        :type config: dict (JSON)
+        :param prefix: the keys leading to ``config``
+        :type prefix: tuple of str
+        :rtype: list of tuple of str
+        """
+        paths = []
+        for (key, val) in config.items():
+            args = val.get('args')
+            if args is None:
+                paths.append(prefix + (key,))
+            else:
+                paths.extend(cls._compile(args, prefix + (key,)))
+        return paths
 
     def get_values(self, tree):
         """
@@ -180,31 +396,97 @@ class ExtendedLookup(object):
 
         :param dict tree: arbitrarily nested dict
 
-        Yields in sequence, the values for each key, None if no value found.
+        Yields in sequence, the values for each key.
+
+        :raises DAGValueError: if any key not found
         """
-        if self.config == {}:
-            return
-        for val in self._get_values(tree, self.config):
-            yield val
+        for (path, accessor) in zip(self.paths, self._accessors):
+            value = accessor(tree)
+            if value is self.MISSING:
+                raise DAGValueError('no key path %s in tree' % list(path))
+            yield value
 
-    def _get_values(self, tree, config):
+    def get_tuple(self, tree, missing=_RAISE):
         """
-        Generate values for keys.
+        Get the values for keys.
+
+        :param dict tree: arbitrarily nested dict
+        :param object missing: the value for any key not found; if omitted
+           an exception is raised instead
+        :returns: the value for each key path in ``paths``
+        :rtype: tuple
+
+        :raises DAGValueError: if any key not found and missing is omitted
+        """
+        if missing is self._RAISE:
+            return tuple(self.get_values(tree))
+        if missing is self.MISSING:
+            return tuple(a(tree) for a in self._accessors)
+        return tuple(
+           missing if v is self.MISSING else v for v in \
+              (a(tree) for a in self._accessors)
+        )
+
+    def batch(self, trees, missing=_RAISE):
+        """
+        Get the values for keys for each of ``trees``.
+
+        :param trees: arbitrarily nested dicts
+        :type trees: iterable of dict
+        :param object missing: as for get_tuple()
+        :returns: a tuple of values for each tree
+        :rtype: list of tuple
+
+        :raises DAGValueError: if any key not found and missing is omitted
+        """
+        return [self.get_tuple(t, missing) for t in trees]
+
+    def batch_nodes(self, graph, nodes=None, missing=_RAISE):
+        """
+        Get the values for keys for the attributes of nodes in ``graph``.
+
+        :param `DiGraph` graph: the graph
+        :param nodes: the nodes, or None for all nodes in the graph
+        :type nodes: iterable of node or NoneType
+        :param object missing: as for get_tuple()
+        :returns: the nodes, and a tuple of values for each node
+        :rtype: tuple of (list of node) * (list of tuple)
+
+        :raises DAGValueError: if any key not found and missing is omitted
+        """
+        nodes = list(graph.nodes_iter() if nodes is None else nodes)
+        return (nodes, self.batch((graph.node[n] for n in nodes), missing))
+
+    def project(self, tree):
+        """
+        Get the parts of ``tree`` selected by the config.
+
+        :param dict tree: arbitrarily nested dict
+        :returns: a nested dict with only the selected keys
+        :rtype: dict
+
+        Selected keys which are not found in ``tree`` are omitted.
+        """
+        return self._project(tree, self.config)
+
+    @classmethod
+    def _project(cls, tree, config):
+        """
+        Get the parts of ``tree`` selected by ``config``.
 
         :param dict tree: arbitrarily nested dict
         :param config: the config
         :type config: dict (JSON)
-        :raises DAGValueError: if any key not found
+        :returns: a nested dict with only the selected keys
+        :rtype: dict
         """
-        if config is None:
-            yield tree
-            return
-
+        result = dict()
         for (key, val) in config.items():
             try:
                 subtree = tree[key]
             except (AttributeError, KeyError, TypeError):
-                raise DAGValueError('no key %s in tree' % key)
-            else:
-                for rval in self._get_values(subtree, val.get('args')):
-                    yield rval
+                continue
+            args = val.get('args')
+            result[key] = subtree if args is None else \
+               cls._project(subtree, args)
+        return result
@@ -0,0 +1,647 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2016  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+# Red Hat Author(s): Anne Mulhern <amulhern@redhat.com>
+
+"""
+    pydevDAG._views
+    ===============
+
+    Views of a graph which do not copy it.
+
+    .. moduleauthor::  Anne Mulhern  <amulhern@redhat.com>
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from ._errors import DAGValueError
+
+
+def _intersect(edgetypes, others):
+    """
+    The edge types in both ``edgetypes`` and ``others``.
+
+    :param edgetypes: edge types, or None for all
+    :type edgetypes: frozenset of `EdgeType` or NoneType
+    :param others: edge types, or None for all
+    :type others: iterable of `EdgeType` or NoneType
+    :rtype: frozenset of `EdgeType` or NoneType
+    """
+    if others is None:
+        return edgetypes
+    others = frozenset(others)
+    return others if edgetypes is None else edgetypes & others
+
+
+class GraphViews(object):
+    """
+    Methods for seeing through views to the graphs they view.
+    """
+    # pylint: disable=too-few-public-methods
+
+    @staticmethod
+    def resolve(graph, reverse=False, edgetypes=None):
+        """
+        The graph to traverse, the direction, and the edge types to follow.
+
+        :param `DiGraph` graph: the graph or a view of it
+        :param bool reverse: if True, follow the edges of ``graph`` backwards
+        :param edgetypes: the edge types to follow, or None for all
+        :type edgetypes: iterable of `EdgeType` or NoneType
+        :returns: the graph underlying any views, whether to follow its
+           edges backwards, and the edge types of the views, and of
+           ``edgetypes``, or None if there is no restriction
+        :rtype: tuple of `DiGraph` * bool * frozenset of `EdgeType` or
+           NoneType
+        """
+        edgetypes = _intersect(None, edgetypes)
+        while True:
+            if isinstance(graph, ReversedView):
+                (graph, reverse) = (graph.base, not reverse)
+            elif isinstance(graph, EdgeTypeView):
+                edgetypes = _intersect(graph.edgetypes, edgetypes)
+                graph = graph.base
+            else:
+                return (graph, reverse, edgetypes)
+
+    @staticmethod
+    def is_reversed(graph):
+        """
+        Whether ``graph`` is reversed, as recorded by the 'reversed' graph
+        attribute of the graph underlying any views.
+
+        :param `DiGraph` graph: the graph or a view of it
+        :rtype: bool
+
+        The graph attributes of a view are those of the graph it views, so
+        the direction of a `ReversedView` is the negation of that graph's.
+        """
+        flip = False
+        while True:
+            if isinstance(graph, ReversedView):
+                (graph, flip) = (graph.base, not flip)
+            elif isinstance(graph, EdgeTypeView):
+                graph = graph.base
+            else:
+                return graph.graph.get('reversed', False) != flip
+
+
+class ReversedView(object):
+    """
+    A read-only view of a graph with the direction of its edges reversed.
+
+    Creating a view takes constant time and memory. The view implements
+    the read-only part of the networkx 1.x DiGraph interface, reading
+    through to the graph it was made from, and its node and graph
+    attribute dicts are those of that graph; `GraphViews.is_reversed`
+    gives its direction.
+
+    The generators and `GraphUtils` use `GraphViews` to traverse the
+    underlying graph backwards, so they share its `GraphIndex`. The
+    writers copy the view, which yields an ordinary reversed graph.
+    """
+    # pylint: disable=too-many-public-methods
+
+    def __init__(self, graph):
+        """
+        Initializer.
+
+        :param `DiGraph` graph: the graph to view
+        """
+        self.base = graph
+        self.node = graph.node
+        self.graph = graph.graph
+
+    @classmethod
+    def of(cls, graph):
+        """
+        The reverse of ``graph``, without copying.
+
+        :param `DiGraph` graph: the graph
+        :returns: the graph viewed if ``graph`` is a view, otherwise a view
+        :rtype: `DiGraph` or `ReversedView`
+        """
+        if isinstance(graph, cls):
+            return graph.base
+        return cls(graph)
+
+    @property
+    def mutations(self):
+        """
+        The mutation count of the underlying graph, if it keeps one.
+
+        :raises AttributeError: if the underlying graph keeps no count
+        """
+        return self.base.mutations
+
+    def reverse(self, copy=True):
+        """
+        Reverse the view.
+
+        :param bool copy: if True, copy the underlying graph
+        :returns: the underlying graph, or a copy of it
+        :rtype: `DiGraph`
+        """
+        return self.base.copy() if copy else self.base
+
+    def copy(self):
+        """
+        Copy the view into a graph of the underlying graph's type.
+
+        :returns: a reversed copy of the underlying graph
+        :rtype: `DiGraph`
+        """
+        graph = self.base.reverse(copy=True)
+        graph.graph['reversed'] = GraphViews.is_reversed(self)
+        return graph
+
+    def __iter__(self):
+        return iter(self.base)
+
+    def __len__(self):
+        return len(self.base)
+
+    def __contains__(self, node):
+        return node in self.base
+
+    def is_directed(self):
+        """
+        Whether the view is directed.
+        """
+        return self.base.is_directed()
+
+    def is_multigraph(self):
+        """
+        Whether the view is a multigraph.
+        """
+        return self.base.is_multigraph()
+
+    def number_of_nodes(self):
+        """
+        The number of nodes.
+        """
+        return self.base.number_of_nodes()
+
+    def number_of_edges(self):
+        """
+        The number of edges.
+        """
+        return self.base.number_of_edges()
+
+    def nodes_iter(self, data=False):
+        """
+        Iterate over the nodes.
+
+        :param bool data: if True, yield pairs of node and attributes
+        """
+        return self.base.nodes_iter(data)
+
+    def nodes(self, data=False):
+        """
+        The nodes.
+
+        :param bool data: if True, pairs of node and attributes
+        """
+        return self.base.nodes(data)
+
+    def successors(self, node):
+        """
+        The successors of ``node``.
+
+        :param node: the node
+        :rtype: list of node
+        """
+        return self.base.predecessors(node)
+
+    def predecessors(self, node):
+        """
+        The predecessors of ``node``.
+
+        :param node: the node
+        :rtype: list of node
+        """
+        return self.base.successors(node)
+
+    def successors_iter(self, node):
+        """
+        Iterate over the successors of ``node``.
+
+        :param node: the node
+        """
+        return self.base.predecessors_iter(node)
+
+    def predecessors_iter(self, node):
+        """
+        Iterate over the predecessors of ``node``.
+
+        :param node: the node
+        """
+        return self.base.successors_iter(node)
+
+    neighbors = successors
+    neighbors_iter = successors_iter
+
+    def __getitem__(self, node):
+        """
+        The successors of ``node``, with the data of the edges to them.
+
+        :param node: the node
+        :rtype: dict of node * dict
+
+        :raises KeyError: if ``node`` is not in the graph
+        """
+        return self.base.pred[node]
+
+    @property
+    def succ(self):
+        """
+        The successors of each node, with the data of the edges to them.
+        """
+        return self.base.pred
+
+    adj = succ
+
+    @property
+    def pred(self):
+        """
+        The predecessors of each node, with the data of the edges from them.
+        """
+        return self.base.succ
+
+    def has_node(self, node):
+        """
+        Whether ``node`` is in the graph.
+
+        :param node: the node
+        :rtype: bool
+        """
+        return self.base.has_node(node)
+
+    def has_edge(self, source, target):
+        """
+        Whether there is an edge from ``source`` to ``target``.
+
+        :param source: the source node
+        :param target: the target node
+        :rtype: bool
+        """
+        return self.base.has_edge(target, source)
+
+    def has_successor(self, node, other):
+        """
+        Whether ``other`` is a successor of ``node``.
+
+        :param node: the node
+        :param other: the other node
+        :rtype: bool
+        """
+        return self.base.has_edge(other, node)
+
+    def has_predecessor(self, node, other):
+        """
+        Whether ``other`` is a predecessor of ``node``.
+
+        :param node: the node
+        :param other: the other node
+        :rtype: bool
+        """
+        return self.base.has_edge(node, other)
+
+    def get_edge_data(self, source, target, default=None):
+        """
+        The data of the edge from ``source`` to ``target``.
+
+        :param source: the source node
+        :param target: the target node
+        :param default: the value if there is no such edge
+        :returns: the edge data, or ``default``
+        """
+        try:
+            return self.base.succ[target][source]
+        except KeyError:
+            return default
+
+    def degree(self, nbunch=None, weight=None):
+        """
+        The number of edges at the nodes in ``nbunch``.
+
+        :param nbunch: a node, a list of nodes, or None for all nodes
+        :param weight: the edge attribute to sum, or None to count edges
+        :returns: the degree of a node, or a map from nodes to degrees
+        :rtype: int or dict of node * int
+        """
+        return self.base.degree(nbunch, weight)
+
+    def in_degree(self, nbunch=None, weight=None):
+        """
+        The number of edges entering the nodes in ``nbunch``.
+
+        :param nbunch: a node, a list of nodes, or None for all nodes
+        :param weight: the edge attribute to sum, or None to count edges
+        :returns: the degree of a node, or a map from nodes to degrees
+        :rtype: int or dict of node * int
+        """
+        return self.base.out_degree(nbunch, weight)
+
+    def out_degree(self, nbunch=None, weight=None):
+        """
+        The number of edges leaving the nodes in ``nbunch``.
+
+        :param nbunch: a node, a list of nodes, or None for all nodes
+        :param weight: the edge attribute to sum, or None to count edges
+        :returns: the degree of a node, or a map from nodes to degrees
+        :rtype: int or dict of node * int
+        """
+        return self.base.in_degree(nbunch, weight)
+
+    def out_edges_iter(self, nbunch=None, data=False):
+        """
+        Iterate over the edges leaving the nodes in ``nbunch``.
+
+        :param nbunch: a node, a list of nodes, or None for all nodes
+        :param bool data: if True, include the edge data
+        """
+        for edge in self.base.in_edges_iter(nbunch, data):
+            yield (edge[1], edge[0]) + edge[2:]
+
+    def in_edges_iter(self, nbunch=None, data=False):
+        """
+        Iterate over the edges entering the nodes in ``nbunch``.
+
+        :param nbunch: a node, a list of nodes, or None for all nodes
+        :param bool data: if True, include the edge data
+        """
+        for edge in self.base.out_edges_iter(nbunch, data):
+            yield (edge[1], edge[0]) + edge[2:]
+
+    edges_iter = out_edges_iter
+
+    def edges(self, nbunch=None, data=False):
+        """
+        The edges leaving the nodes in ``nbunch``.
+
+        :param nbunch: a node, a list of nodes, or None for all nodes
+        :param bool data: if True, include the edge data
+        """
+        return list(self.out_edges_iter(nbunch, data))
+
+
+class EdgeTypeView(object):
+    """
+    A read-only view of a graph restricted to the edges of some edge types.
+
+    Creating a view takes constant time and memory. The view has all the
+    nodes of the graph it was made from. If that graph is tracked, the
+    view reads its edges from the per edge type adjacency of the graph's
+    `GraphIndex`, which it holds until the graph changes; otherwise it
+    filters the edges of the graph on each read. It implements
+    the read-only part of the networkx 1.x DiGraph interface; its node
+    and graph attribute dicts are those of the graph.
+
+    The generators and `GraphUtils` use `GraphViews` to traverse the
+    underlying graph, following only the edges of the view's edge types.
+    """
+
+    def __init__(self, graph, edgetypes):
+        """
+        Initializer.
+
+        :param `DiGraph` graph: the graph to view
+        :param edgetypes: the edge types of the edges to keep
+        :type edgetypes: iterable of `EdgeType`
+        """
+        self.base = graph
+        self.edgetypes = frozenset(edgetypes)
+        self.node = graph.node
+        self.graph = graph.graph
+        self._held = None
+
+    @property
+    def mutations(self):
+        """
+        The mutation count of the underlying graph, if it keeps one.
+
+        :raises AttributeError: if the underlying graph keeps no count
+        """
+        return self.base.mutations
+
+    def _index(self):
+        """
+        The index of the underlying graph, held until the graph changes.
+
+        :returns: the index, or None if the graph can not be tracked
+        :rtype: `GraphIndex` or NoneType
+        """
+        from ._index import GraphIndex
+        signature = GraphIndex.signature_of(self.base)
+        if signature is None:
+            return None
+        index = self._held
+        if index is None or index.signature != signature:
+            index = GraphIndex.get(self.base)
+            self._held = index
+        return index
+
+    def _neighbours(self, node, reverse):
+        """
+        The neighbours of ``node`` along edges of the view.
+
+        :param node: the node
+        :param bool reverse: if True, predecessors, otherwise successors
+        :rtype: list of node
+        """
+        index = self._index()
+        if index is None:
+            if reverse:
+                edges = self._keep(self.base.in_edges_iter(node, True), False)
+                return [s for (s, _) in edges]
+            edges = self._keep(self.base.out_edges_iter(node, True), False)
+            return [t for (_, t) in edges]
+        return [
+           n for t in self.edgetypes \
+              for n in index.adjacency(t, reverse).get(node, ())
+        ]
+
+    def _keep(self, edges, data):
+        """
+        The edges of the view among ``edges``.
+
+        :param edges: edges, with their data
+        :type edges: iterable of tuple of node * node * dict
+        :param bool data: if True, include the edge data
+        """
+        edgetypes = self.edgetypes
+        for (source, target, attrs) in edges:
+            if attrs.get('edgetype') in edgetypes:
+                yield (source, target, attrs) if data else (source, target)
+
+    def reverse(self, copy=True):
+        """
+        Reverse the view.
+
+        :param bool copy: must be True, as the view can not be changed
+        :returns: a reversed copy of the view
+        :rtype: `DiGraph`
+
+        :raises DAGValueError: if ``copy`` is False
+        """
+        if not copy:
+            raise DAGValueError("a view can not be reversed in place")
+        return self.copy().reverse(copy=False)
+
+    def copy(self):
+        """
+        Copy the view into a graph of the underlying graph's type.
+
+        :returns: a copy of the underlying graph without the other edges
+        :rtype: `DiGraph`
+        """
+        graph = self.base.copy()
+        edgetypes = self.edgetypes
+        graph.remove_edges_from([
+           (s, t) for (s, t, d) in graph.edges_iter(data=True) \
+              if d.get('edgetype') not in edgetypes
+        ])
+        return graph
+
+    def __iter__(self):
+        return iter(self.base)
+
+    def __len__(self):
+        return len(self.base)
+
+    def __contains__(self, node):
+        return node in self.base
+
+    def is_directed(self):
+        """
+        Whether the view is directed.
+        """
+        return self.base.is_directed()
+
+    def is_multigraph(self):
+        """
+        Whether the view is a multigraph.
+        """
+        return self.base.is_multigraph()
+
+    def number_of_nodes(self):
+        """
+        The number of nodes.
+        """
+        return self.base.number_of_nodes()
+
+    def number_of_edges(self):
+        """
+        The number of edges.
+        """
+        index = self._index()
+        if index is None:
+            return sum(1 for _ in self.out_edges_iter())
+        return index.number_of_edges(self.edgetypes)
+
+    def nodes_iter(self, data=False):
+        """
+        Iterate over the nodes.
+
+        :param bool data: if True, yield pairs of node and attributes
+        """
+        return self.base.nodes_iter(data)
+
+    def nodes(self, data=False):
+        """
+        The nodes.
+
+        :param bool data: if True, pairs of node and attributes
+        """
+        return self.base.nodes(data)
+
+    def successors(self, node):
+        """
+        The successors of ``node``.
+
+        :param node: the node
+        :rtype: list of node
+        """
+        return self._neighbours(node, False)
+
+    def predecessors(self, node):
+        """
+        The predecessors of ``node``.
+
+        :param node: the node
+        :rtype: list of node
+        """
+        return self._neighbours(node, True)
+
+    def successors_iter(self, node):
+        """
+        Iterate over the successors of ``node``.
+
+        :param node: the node
+        """
+        return iter(self._neighbours(node, False))
+
+    def predecessors_iter(self, node):
+        """
+        Iterate over the predecessors of ``node``.
+
+        :param node: the node
+        """
+        return iter(self._neighbours(node, True))
+
+    def has_edge(self, source, target):
+        """
+        Whether there is an edge from ``source`` to ``target``.
+
+        :param source: the source node
+        :param target: the target node
+        :rtype: bool
+        """
+        return target in self._neighbours(source, False)
+
+    def out_edges_iter(self, nbunch=None, data=False):
+        """
+        Iterate over the edges leaving the nodes in ``nbunch``.
+
+        :param nbunch: a node, a list of nodes, or None for all nodes
+        :param bool data: if True, include the edge data
+        """
+        return self._keep(self.base.out_edges_iter(nbunch, True), data)
+
+    def in_edges_iter(self, nbunch=None, data=False):
+        """
+        Iterate over the edges entering the nodes in ``nbunch``.
+
+        :param nbunch: a node, a list of nodes, or None for all nodes
+        :param bool data: if True, include the edge data
+        """
+        return self._keep(self.base.in_edges_iter(nbunch, True), data)
+
+    edges_iter = out_edges_iter
+
+    def edges(self, nbunch=None, data=False):
+        """
+        The edges leaving the nodes in ``nbunch``.
+
+        :param nbunch: a node, a list of nodes, or None for all nodes
+        :param bool data: if True, include the edge data
+        """
+        return list(self.out_edges_iter(nbunch, data))
@@ -0,0 +1,221 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2016  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+# Red Hat Author(s): Anne Mulhern <amulhern@redhat.com>
+
+"""
+    tests.test_analysis
+    ===================
+
+    Tests analyses of graph structure.
+
+    .. moduleauthor:: mulhern <amulhern@redhat.com>
+"""
+
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import random
+
+import networkx as nx
+
+import pytest
+
+import pydevDAG
+
+from ._constants import GRAPH
+
+
+def _random_dag(size, edges, seed):
+    """
+    A random DAG with ``size`` nodes and at most ``edges`` edges.
+    """
+    randomizer = random.Random(seed)
+    graph = nx.DiGraph()
+    graph.add_nodes_from('n%d' % i for i in range(size))
+    for _ in range(edges):
+        (source, target) = sorted(randomizer.sample(range(size), 2))
+        graph.add_edge('n%d' % source, 'n%d' % target)
+    return graph
+
+
+class TestReachability(object):
+    """
+    Test reachability indexes.
+    """
+
+    _CLASSES = (pydevDAG.BitsetReachability, pydevDAG.IntervalReachability)
+
+    def test_agrees(self):
+        """
+        Verify that each index agrees with networkx.
+        """
+        graphs = [_random_dag(60, 90, seed) for seed in range(3)] + [GRAPH]
+        for graph in graphs:
+            index = pydevDAG.GraphIndex.get(graph)
+            for klass in self._CLASSES:
+                reachability = klass(index)
+                for node in graph:
+                    descendants = nx.descendants(graph, node)
+                    assert reachability.descendants(node) == descendants
+                    assert reachability.ancestors(node) == \
+                       nx.ancestors(graph, node)
+                    for other in graph:
+                        assert reachability.reaches(node, other) == \
+                           (other in descendants)
+
+    def test_get(self):
+        """
+        Verify that an index is reused until the graph changes.
+        """
+        graph = pydevDAG.TrackedDiGraph([('a', 'b'), ('b', 'c')])
+        reachability = pydevDAG.Reachability.get(graph)
+        assert pydevDAG.Reachability.get(graph) is reachability
+        assert pydevDAG.GraphUtils.is_ancestor(graph, 'a', 'c')
+        assert not pydevDAG.GraphUtils.is_ancestor(graph, 'c', 'a')
+
+        graph.add_edge('c', 'd')
+        assert pydevDAG.Reachability.get(graph) is not reachability
+        assert pydevDAG.GraphUtils.get_descendants(graph, 'a') == \
+           set(['b', 'c', 'd'])
+        assert pydevDAG.GraphUtils.get_ancestors(graph, 'd') == \
+           set(['a', 'b', 'c'])
+
+        with pytest.raises(pydevDAG.DAGError):
+            pydevDAG.GraphUtils.is_ancestor(graph, 'a', 'z')
+
+
+    def test_untracked(self):
+        """
+        Verify that the helpers search a graph which is not tracked.
+        """
+        graph = _random_dag(60, 90, 11)
+        tracked = pydevDAG.TrackedDiGraph(graph)
+        for node in graph:
+            ancestors = pydevDAG.GraphUtils.get_ancestors(graph, node)
+            assert ancestors == nx.ancestors(graph, node)
+            assert ancestors == \
+               pydevDAG.GraphUtils.get_ancestors(tracked, node)
+            descendants = pydevDAG.GraphUtils.get_descendants(graph, node)
+            assert descendants == nx.descendants(graph, node)
+            for other in graph:
+                assert pydevDAG.GraphUtils.is_ancestor(graph, node, other) \
+                   == (other in descendants)
+
+
+class TestImpact(object):
+    """
+    Test impact analysis.
+    """
+
+    def test_impact(self):
+        """
+        Verify the affected nodes, their kinds and their causes.
+        """
+        graph = nx.DiGraph()
+        graph.add_nodes_from(['lv', 'md0', 'sda', 'sdb', 'sdc'], kind='dev')
+        graph.add_nodes_from(['wwn-a', 'wwn-b', 'wwn-c'], kind='wwn')
+        graph.add_edges_from(
+           [('lv', 'md0'), ('md0', 'sda'), ('md0', 'sdb'), ('sdc', 'wwn-c')]
+        )
+        graph.add_edges_from([('sda', 'wwn-a'), ('sdb', 'wwn-b')])
+
+        impact = pydevDAG.ImpactAnalysis.impact(
+           graph,
+           ['wwn-b', 'wwn-a', 'sdb', 'wwn-a'],
+           lambda n: graph.node[n]['kind']
+        )
+        assert impact.sources == ['wwn-b', 'wwn-a', 'sdb']
+        assert impact.affected[:2] == ['lv', 'md0']
+        assert sorted(impact.by_kind['dev']) == ['lv', 'md0', 'sda', 'sdb']
+        assert 'wwn' not in impact.by_kind
+        assert impact.roots == ['lv']
+        assert impact.causes('lv') == ['wwn-b', 'wwn-a', 'sdb']
+        assert impact.causes('sda') == ['wwn-a']
+        assert impact.causes('sdb') == ['wwn-b']
+        assert impact.causes('sdc') == []
+
+        with pytest.raises(pydevDAG.DAGError):
+            pydevDAG.ImpactAnalysis.impact(graph, ['nothing'])
+
+    def test_agrees(self):
+        """
+        Verify that the affected nodes are the ancestors of the sources.
+        """
+        graph = _random_dag(80, 120, 7)
+        sources = ['n%d' % i for i in range(40, 80, 3)]
+        impact = pydevDAG.ImpactAnalysis.impact(graph, sources)
+        for node in graph:
+            expected = [s for s in sources if s in nx.descendants(graph, node)]
+            assert impact.causes(node) == expected
+        assert list(impact.by_kind) in ([None], [])
+
+
+class TestSpindleSignatures(object):
+    """
+    Test spindle signatures.
+    """
+
+    def test_signatures(self):
+        """
+        Verify spindles and sharing of spindles.
+        """
+        graph = pydevDAG.TrackedDiGraph()
+        graph.add_nodes_from(
+           ['wwn-a', 'wwn-b', 'wwn-c'],
+           nodetype=pydevDAG.NodeTypes.WWN
+        )
+        graph.add_nodes_from(
+           ['lv1', 'lv2', 'md0', 'sda', 'sdb', 'sdc', 'loop0'],
+           nodetype=pydevDAG.NodeTypes.DEVICE_PATH
+        )
+        graph.add_edge('sda', 'wwn-a', edgetype=pydevDAG.EdgeTypes.SPINDLE)
+        graph.add_edge('sdb', 'wwn-b', edgetype=pydevDAG.EdgeTypes.SPINDLE)
+        graph.add_edge('sdc', 'wwn-c', edgetype=pydevDAG.EdgeTypes.SPINDLE)
+        graph.add_edge('md0', 'sda', edgetype=pydevDAG.EdgeTypes.SLAVE)
+        graph.add_edge('md0', 'sdb', edgetype=pydevDAG.EdgeTypes.SLAVE)
+        graph.add_edge('lv1', 'md0', edgetype=pydevDAG.EdgeTypes.SLAVE)
+        graph.add_edge('lv2', 'sdc', edgetype=pydevDAG.EdgeTypes.SLAVE)
+
+        signatures = pydevDAG.SpindleSignatures.get(graph)
+        assert pydevDAG.SpindleSignatures.get(graph) is signatures
+        assert sorted(signatures.spindles_of('lv1')) == ['wwn-a', 'wwn-b']
+        assert signatures.spindles_of('wwn-c') == ['wwn-c']
+        assert signatures.spindles_of('loop0') == []
+        assert signatures.share_spindles('lv1', 'sda')
+        assert not signatures.share_spindles('lv1', 'lv2')
+        assert not signatures.share_spindles('loop0', 'loop0')
+
+        slaves = pydevDAG.SpindleSignatures(
+           graph,
+           [pydevDAG.EdgeTypes.SLAVE]
+        )
+        assert slaves.spindles_of('lv1') == []
+        typed = pydevDAG.SpindleSignatures(
+           graph,
+           [pydevDAG.EdgeTypes.SLAVE, pydevDAG.EdgeTypes.SPINDLE]
+        )
+        assert typed.spindles_of('lv1') == signatures.spindles_of('lv1')
+
+        signatures.spindles_of('lv1').append('wwn-c')
+        assert sorted(signatures.spindles_of('lv1')) == ['wwn-a', 'wwn-b']
+
+        with pytest.raises(pydevDAG.DAGError):
+            signatures.signature('nothing')
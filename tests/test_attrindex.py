@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2016  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+# Red Hat Author(s): Anne Mulhern <amulhern@redhat.com>
+
+"""
+    tests.test_attrindex
+    ====================
+
+    Tests indexes over node attributes.
+
+    .. moduleauthor:: mulhern <amulhern@redhat.com>
+"""
+
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import networkx as nx
+
+import pytest
+
+import pydevDAG
+
+from ._constants import DECORATED
+
+
+class TestAttributeIndexes(object):
+    """
+    Test declaring, using and maintaining attribute indexes.
+    """
+
+    def test_lookup(self):
+        """
+        Test equality and prefix lookups, and updates.
+        """
+        graph = nx.DiGraph()
+        graph.add_node('sda', UDEV={'DEVTYPE': 'disk', 'DM_UUID': None})
+        graph.add_node('sda1', UDEV={'DEVTYPE': 'partition'})
+        graph.add_node('dm-0', UDEV={'DEVTYPE': 'disk', 'DM_UUID': 'LVM-ab'})
+        graph.add_node('dm-1', UDEV={'DEVTYPE': 'disk', 'DM_UUID': 'CRYPT-c'})
+        graph.add_node('wwn')
+
+        devtypes = pydevDAG.AttributeIndexes.declare(graph, ['UDEV', 'DEVTYPE'])
+        assert pydevDAG.AttributeIndexes.declare(graph, ['UDEV', 'DEVTYPE']) \
+           is devtypes
+        assert devtypes.lookup('disk') == frozenset(['sda', 'dm-0', 'dm-1'])
+        assert devtypes.count('partition') == 1
+        assert devtypes.lookup('other') == frozenset()
+        assert devtypes.lookup([]) == frozenset()
+
+        uuids = pydevDAG.AttributeIndexes.declare(graph, ['UDEV', 'DM_UUID'])
+        assert uuids.prefix('LVM-') == frozenset(['dm-0'])
+        assert uuids.lookup(None) == frozenset(['sda'])
+
+        graph.node['dm-1']['UDEV']['DM_UUID'] = 'LVM-cd'
+        graph.remove_node('dm-0')
+        pydevDAG.AttributeIndexes.update(graph, ['dm-1', 'dm-0'])
+        assert uuids.prefix('LVM-') == frozenset(['dm-1'])
+        assert uuids.prefix('CRYPT') == frozenset()
+        assert devtypes.lookup('disk') == frozenset(['sda', 'dm-1'])
+
+        pydevDAG.Decorator.decorate_nodes(
+           graph,
+           {'UDEV': {'wwn': {'DEVTYPE': 'disk'}}}
+        )
+        assert devtypes.lookup('disk') == frozenset(['sda', 'dm-1', 'wwn'])
+
+        assert pydevDAG.AttributeIndexes.get(graph, ['UDEV', 'DEVTYPE']) is \
+           devtypes
+        with pytest.raises(pydevDAG.DAGError):
+            pydevDAG.AttributeIndexes.get(graph, ['UDEV', 'ID_PATH'])
+
+    def test_decorated(self):
+        """
+        Test that an index agrees with a scan of a decorated graph.
+        """
+        index = pydevDAG.AttributeIndexes.declare(
+           DECORATED,
+           ['UDEV', 'SUBSYSTEM']
+        )
+        for value in index.values():
+            assert index.lookup(value) == frozenset(
+               n for n in DECORATED if \
+                  DECORATED.node[n].get('UDEV', {}).get('SUBSYSTEM') == value
+            )
+
+    def test_tracked(self):
+        """
+        Test that an index of a tracked graph stays current as nodes are
+        added and removed.
+        """
+        graph = pydevDAG.TrackedDiGraph()
+        graph.add_node('a', UDEV={'DEVTYPE': 'disk'})
+        graph.add_node('b', UDEV={'DEVTYPE': 'partition'})
+        index = pydevDAG.AttributeIndexes.declare(graph, ['UDEV', 'DEVTYPE'])
+        assert index.lookup('disk') == frozenset(['a'])
+
+        graph.remove_node('a')
+        graph.node['b']['UDEV']['DEVTYPE'] = 'disk'
+        assert index.lookup('disk') == frozenset(['b'])
+        assert index.lookup('partition') == frozenset()
+
+        graph.add_node('c', UDEV={'DEVTYPE': 'disk'})
+        assert index.count('disk') == 2
+        assert index.prefix('d') == frozenset(['b', 'c'])
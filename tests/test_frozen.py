@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2016  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+# Red Hat Author(s): Anne Mulhern <amulhern@redhat.com>
+
+"""
+    tests.test_frozen
+    =================
+
+    Tests frozen graphs.
+
+    .. moduleauthor:: mulhern <amulhern@redhat.com>
+"""
+
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import networkx as nx
+
+import pytest
+
+import pydevDAG
+
+from ._constants import GRAPH
+
+
+def _graph():
+    """
+    A small graph with edge types.
+    """
+    graph = nx.DiGraph(name='small')
+    graph.add_node('md0', nodetype=pydevDAG.NodeTypes.DEVICE_PATH)
+    graph.add_edge('md0', 'sda1', edgetype=pydevDAG.EdgeTypes.SLAVE)
+    graph.add_edge('md0', 'sdb1', edgetype=pydevDAG.EdgeTypes.SLAVE)
+    graph.add_edge('sda', 'sda1', edgetype=pydevDAG.EdgeTypes.PARTITION)
+    graph.add_edge('sdb', 'sdb1', edgetype=pydevDAG.EdgeTypes.PARTITION)
+    graph.add_edge('sda', 'wwn')
+    graph.add_node('lonely')
+    return graph
+
+
+class TestFrozenDeviceGraph(object):
+    """
+    Test frozen graphs.
+    """
+
+    def test_structure(self):
+        """
+        Test that the frozen graph has the same nodes, edges and attributes.
+        """
+        for graph in (_graph(), GRAPH):
+            frozen = pydevDAG.FrozenDeviceGraph(graph)
+            assert len(frozen) == len(graph)
+            assert frozen.number_of_edges() == graph.number_of_edges()
+            assert sorted(frozen.edges(data=True)) == \
+               sorted(graph.edges(data=True))
+            for node in graph:
+                assert node in frozen
+                assert frozen.node[node] is graph.node[node]
+                assert sorted(frozen.successors(node)) == \
+                   sorted(graph.successors(node))
+                assert sorted(frozen.predecessors(node)) == \
+                   sorted(graph.predecessors(node))
+            assert frozen.graph == graph.graph
+
+            thawed = frozen.to_graph()
+            assert sorted(thawed.edges(data=True)) == \
+               sorted(graph.edges(data=True))
+
+    def test_traversal(self):
+        """
+        Test that traversals and utilities accept a frozen graph.
+        """
+        graph = _graph()
+        frozen = pydevDAG.FrozenDeviceGraph(graph)
+        assert sorted(pydevDAG.GraphUtils.get_roots(frozen)) == \
+           sorted(pydevDAG.GraphUtils.get_roots(graph))
+        assert sorted(pydevDAG.GraphUtils.get_leaves(frozen)) == \
+           sorted(pydevDAG.GraphUtils.get_leaves(graph))
+        for traversal in (pydevDAG.DepthFirst, pydevDAG.BreadthFirst):
+            for kwargs in (
+                  dict(),
+                  dict(reverse=True),
+                  dict(edgetypes=[pydevDAG.EdgeTypes.PARTITION])
+               ):
+                assert list(traversal.nodes(frozen, str, **kwargs)) == \
+                   list(traversal.nodes(graph, str, **kwargs))
+
+    def test_index(self):
+        """
+        Test that the index computed from the arrays is that of the graph.
+        """
+        graph = GRAPH.copy()
+        graph.add_edge('loop', 'loop')
+        frozen = pydevDAG.FrozenDeviceGraph(graph)
+        (index, expected) = (
+           pydevDAG.GraphIndex.get(frozen),
+           pydevDAG.GraphIndex.get(graph)
+        )
+        assert isinstance(index, frozen.index_class)
+        assert index.roots == expected.roots
+        assert index.leaves == expected.leaves
+        for edgetype in pydevDAG.EdgeTypes.values() + [None]:
+            for reverse in (False, True):
+                assert index.adjacency(edgetype, reverse) == \
+                   expected.adjacency(edgetype, reverse)
+        for node in graph:
+            for reverse in (False, True):
+                assert index.children(node, str, reverse) == \
+                   expected.children(node, str, reverse)
+        with pytest.raises(pydevDAG.DAGError):
+            index.order # pylint: disable=pointless-statement
+
+        graph.remove_edge('loop', 'loop')
+        frozen = pydevDAG.FrozenDeviceGraph(graph)
+        index = pydevDAG.GraphIndex.get(frozen)
+        assert index.levels == pydevDAG.GraphIndex.get(graph).levels
+        positions = dict((n, i) for (i, n) in enumerate(index.order))
+        assert all(positions[s] < positions[t] for (s, t) in graph.edges())
+
+    def test_networkx(self):
+        """
+        Test that networkx algorithms accept a frozen graph.
+        """
+        graph = _graph()
+        frozen = pydevDAG.FrozenDeviceGraph(graph)
+        assert frozen['md0'] == graph['md0']
+        assert dict(frozen.pred) == graph.pred
+        assert frozen.degree() == graph.degree()
+        assert frozen.in_degree('sda1') == 2
+        assert frozen.out_degree(['sda', 'wwn']) == {'sda': 2, 'wwn': 0}
+        with pytest.raises(pydevDAG.DAGError):
+            frozen.degree(weight='weight')
+
+        assert nx.descendants(frozen, 'sda') == nx.descendants(graph, 'sda')
+        assert nx.ancestors(frozen, 'sda1') == nx.ancestors(graph, 'sda1')
+        assert sorted(nx.bfs_edges(frozen, 'md0')) == \
+           sorted(nx.bfs_edges(graph, 'md0'))
+        assert len(nx.dag_longest_path(frozen)) == \
+           len(nx.dag_longest_path(graph))
+
+    def test_reverse(self):
+        """
+        Test that reversing shares the arrays and records the direction.
+        """
+        frozen = pydevDAG.FrozenDeviceGraph(_graph())
+        reversed_graph = pydevDAG.GraphUtils.reverse(frozen)
+        assert reversed_graph.graph['reversed']
+        assert 'reversed' not in frozen.graph
+        assert reversed_graph.successors('sda1') == frozen.predecessors('sda1')
+        assert reversed_graph.successor_ids(0) is not None
+        index = pydevDAG.GraphIndex.get(frozen)
+        assert frozen.reverse(copy=False) is frozen
+        assert frozen.successors('sda1') == reversed_graph.successors('sda1')
+        assert pydevDAG.GraphIndex.get(frozen) is not index
+        assert pydevDAG.GraphIndex.get(frozen).roots == index.leaves
+
+    def test_arrays(self):
+        """
+        Test the NumPy view of the arrays.
+        """
+        pytest.importorskip('numpy')
+        frozen = pydevDAG.FrozenDeviceGraph(_graph())
+        arrays = frozen.arrays()
+        node_id = frozen.ids['md0']
+        (start, stop) = arrays['succ_offsets'][node_id:node_id + 2]
+        successors = arrays['succ_targets'][start:stop]
+        assert sorted(frozen.names[i] for i in successors) == ['sda1', 'sdb1']
+        code = pydevDAG.EdgeTypes.get_code(pydevDAG.EdgeTypes.SLAVE)
+        assert list(arrays['succ_codes'][start:stop]) == [code, code]
@@ -32,11 +32,65 @@ from __future__ import division
 from __future__ import print_function
 from __future__ import unicode_literals
 
+import itertools
+
+import networkx as nx
+
+import pytest
+
 import pydevDAG
 
 from ._constants import GRAPH
 
 
+def _recursive(graph, key_func, node_info):
+    """
+    Reference recursive depth-first traversal.
+    """
+    yield node_info
+    (depth, node, _) = node_info
+    successors = sorted(graph.successors(node), key=key_func)
+    for succ in successors:
+        succ_info = (depth + 1, succ, succ is successors[-1])
+        for info in _recursive(graph, key_func, succ_info):
+            yield info
+
+
+def _diamonds(count):
+    """
+    A chain of ``count`` diamonds, which has 2 ** count paths.
+    """
+    graph = nx.DiGraph()
+    for i in range(count):
+        (top, bottom) = ('%d' % i, '%d' % (i + 1))
+        (left, right) = (top + 'l', top + 'r')
+        graph.add_edges_from(
+           [(top, left), (top, right), (left, bottom), (right, bottom)]
+        )
+    return graph
+
+
+def _pages(traversal, graph, size, shared, **kwargs):
+    """
+    All the node infos of ``traversal``, fetched a page at a time.
+    """
+    (infos, cursor) = \
+       traversal.page(graph, str, size, shared=shared, **kwargs)
+    result = infos
+    while cursor is not None:
+        assert len(infos) == size
+        (infos, cursor) = traversal.page(
+           graph,
+           str,
+           size,
+           cursor=cursor,
+           shared=shared,
+           **kwargs
+        )
+        result.extend(infos)
+    return result
+
+
 class TestDepthFirst(object):
     """
     Test the depth first generator.
@@ -51,6 +105,159 @@ class TestDepthFirst(object):
         assert frozenset(GRAPH.nodes()) == \
            frozenset(y for _, y, _ in gen_nodes)
 
+    def test_identical(self):
+        """
+        Test that the traversal is identical to a recursive traversal.
+        """
+        graph = nx.DiGraph(
+           [('a', 'b'), ('a', 'c'), ('b', 'd'), ('c', 'd'), ('e', 'd')]
+        )
+        graph.add_path(['d', 'f', 'g', 'h'])
+        graph.add_node('i')
+        for key_func in (lambda x: x, lambda x: ''):
+            roots = sorted(pydevDAG.GraphUtils.get_roots(graph), key=key_func)
+            expected = [
+               i for r in roots \
+                  for i in _recursive(graph, key_func, (0, r, r is roots[-1]))
+            ]
+            assert list(pydevDAG.DepthFirst.nodes(graph, key_func)) == expected
+
+    def test_deep(self):
+        """
+        Test that a graph deeper than the recursion limit is traversed.
+        """
+        graph = nx.DiGraph()
+        graph.add_path(range(5000))
+        gen_nodes = list(pydevDAG.DepthFirst.nodes(graph, lambda x: x))
+        assert [n for _, n, _ in gen_nodes] == list(range(5000))
+        assert [d for d, _, _ in gen_nodes] == list(range(5000))
+
+    def test_shared(self):
+        """
+        Test that each subtree is yielded once, with back references after.
+        """
+        graph = _diamonds(30)
+        gen_nodes = list(pydevDAG.DepthFirst.nodes(graph, str, shared=True))
+        nodes = [n for _, n, _ in gen_nodes]
+        refs = [n for n in nodes if isinstance(n, pydevDAG.BackReference)]
+        assert len(nodes) == graph.number_of_edges() + 1
+        assert len(refs) == 30
+        assert frozenset(r.node for r in refs) == \
+           frozenset('%d' % i for i in range(1, 31))
+        assert len(nodes) - len(refs) == graph.number_of_nodes()
+
+        graph = nx.DiGraph([('a', 'b'), ('a', 'c'), ('b', 'd'), ('c', 'd')])
+        assert list(pydevDAG.DepthFirst.nodes(graph, str, shared=True)) == [
+           (0, 'a', True),
+           (1, 'b', False),
+           (2, 'd', True),
+           (1, 'c', True),
+           (2, pydevDAG.BackReference('d'), True)
+        ]
+
+    def test_pages(self):
+        """
+        Test that pages resumed from cursors make up the whole traversal.
+        """
+        graph = nx.DiGraph(
+           [('a', 'b'), ('a', 'c'), ('b', 'd'), ('c', 'd'), ('e', 'd')]
+        )
+        graph.add_path(['d', 'f', 'g', 'h'])
+        graph.add_node('i')
+        for shared in (False, True):
+            expected = list(
+               pydevDAG.DepthFirst.nodes(graph, str, shared=shared)
+            )
+            for size in range(1, len(expected) + 2):
+                assert _pages(pydevDAG.DepthFirst, graph, size, shared) == \
+                   expected
+
+    def test_options(self):
+        """
+        Test sources, depth limit, reverse direction and edge type pruning.
+        """
+        graph = nx.DiGraph()
+        graph.add_edge('a', 'b', edgetype=pydevDAG.EdgeTypes.PARTITION)
+        graph.add_edge('a', 'c', edgetype=pydevDAG.EdgeTypes.SLAVE)
+        graph.add_edge('c', 'd', edgetype=pydevDAG.EdgeTypes.SLAVE)
+        graph.add_edge('e', 'd', edgetype=pydevDAG.EdgeTypes.SLAVE)
+
+        def names(**kwargs):
+            # pylint: disable=missing-docstring
+            return [
+               n for _, n, _ in pydevDAG.DepthFirst.nodes(graph, str, **kwargs)
+            ]
+
+        assert names(sources=['c', 'a']) == ['c', 'd', 'a', 'b', 'c', 'd']
+        assert names(max_depth=1) == ['a', 'b', 'c', 'e', 'd']
+        assert names(reverse=True) == ['b', 'a', 'd', 'c', 'a', 'e']
+        assert names(edgetypes=[pydevDAG.EdgeTypes.SLAVE]) == \
+           ['a', 'c', 'd', 'b', 'e', 'd']
+        assert names(sources=['d'], reverse=True, max_depth=1) == \
+           ['d', 'c', 'e']
+        assert graph.has_edge('a', 'b') and not graph.has_edge('b', 'a')
+
+        with pytest.raises(pydevDAG.DAGError):
+            names(sources=['z'])
+
+    def test_bad_cursor(self):
+        """
+        Test that a cursor that can not be resumed raises an error.
+        """
+        graph = nx.DiGraph([('a', 'b'), ('a', 'c')])
+        (_, cursor) = pydevDAG.BreadthFirst.page(graph, str, 1)
+        for bad in ('junk', cursor):
+            with pytest.raises(pydevDAG.DAGError):
+                pydevDAG.DepthFirst.page(graph, str, 1, cursor=bad)
+
+        (_, cursor) = pydevDAG.DepthFirst.page(graph, str, 2)
+        with pytest.raises(pydevDAG.DAGError):
+            pydevDAG.DepthFirst.page(graph, str, 1, cursor=cursor, shared=True)
+        graph.remove_node('b')
+        with pytest.raises(pydevDAG.DAGError):
+            pydevDAG.DepthFirst.page(graph, str, 1, cursor=cursor)
+
+    def test_held_cursor(self):
+        """
+        Test that a cursor for a wide traversal is short, can be resumed
+        more than once, and still resumes once the state it names is no
+        longer held.
+        """
+        graph = pydevDAG.TrackedDiGraph(('r', 'n%d' % i) for i in range(5000))
+        for (traversal, shared) in (
+           (pydevDAG.BreadthFirst, False),
+           (pydevDAG.BreadthFirst, True),
+           (pydevDAG.DepthFirst, True)
+        ):
+            (_, cursor) = traversal.page(graph, str, 10, shared=shared)
+            assert len(cursor) < 200
+            infos = [
+               traversal.page(graph, str, 10, cursor=cursor, shared=shared)[0]
+               for _ in range(2)
+            ]
+            assert infos[0] == infos[1]
+
+            (_, cursor) = traversal.page(graph, str, 10, shared=shared)
+            for _ in range(300):
+                traversal.page(graph, str, 1, shared=shared)
+            assert traversal.page(
+               graph,
+               str,
+               10,
+               cursor=cursor,
+               shared=shared
+            )[0] == infos[0]
+
+        (_, cursor) = pydevDAG.BreadthFirst.page(graph, str, 1, shared=True)
+        other = pydevDAG.TrackedDiGraph([('r', 'n1'), ('r', 'x')])
+        assert pydevDAG.BreadthFirst.page(
+           other,
+           str,
+           5,
+           cursor=cursor,
+           shared=True
+        ) == ([(1, 'n1', False), (1, 'x', True)], None)
+
 
 class TestBreadthFirst(object):
     """
@@ -65,3 +272,61 @@ class TestBreadthFirst(object):
         gen_nodes = list(pydevDAG.BreadthFirst.nodes(GRAPH, lambda x: ''))
         assert frozenset(GRAPH.nodes()) == \
            frozenset(y for _, y, _ in gen_nodes)
+
+    def test_shared(self):
+        """
+        Test that each subtree is yielded once, with back references after.
+        """
+        graph = _diamonds(30)
+        gen_nodes = list(pydevDAG.BreadthFirst.nodes(graph, str, shared=True))
+        nodes = [n for _, n, _ in gen_nodes]
+        refs = [n for n in nodes if isinstance(n, pydevDAG.BackReference)]
+        assert len(nodes) == graph.number_of_edges() + 1
+        assert len(refs) == 30
+        assert frozenset(r.node for r in refs) == \
+           frozenset('%d' % i for i in range(1, 31))
+        assert len(nodes) - len(refs) == graph.number_of_nodes()
+
+    def test_pages(self):
+        """
+        Test that pages resumed from cursors make up the whole traversal.
+        """
+        graph = _diamonds(3)
+        graph.add_path(['0', 'a', 'b', 'c', 'd', 'e', 'f'])
+        graph.add_edges_from([('a', 'a%d' % i) for i in range(3)])
+        options = ({}, {'max_depth': 3}, {'reverse': True}, {'sources': ['a']})
+        for (shared, kwargs) in itertools.product((False, True), options):
+            expected = list(
+               pydevDAG.BreadthFirst.nodes(graph, str, shared, **kwargs)
+            )
+            for size in range(1, len(expected) + 2):
+                assert _pages(
+                   pydevDAG.BreadthFirst,
+                   graph,
+                   size,
+                   shared,
+                   **kwargs
+                ) == expected
+
+    def test_options(self):
+        """
+        Test sources, depth limit, reverse direction and edge type pruning.
+        """
+        graph = nx.DiGraph()
+        graph.add_edge('a', 'b', edgetype=pydevDAG.EdgeTypes.PARTITION)
+        graph.add_edge('a', 'c', edgetype=pydevDAG.EdgeTypes.SLAVE)
+        graph.add_edge('c', 'd', edgetype=pydevDAG.EdgeTypes.SLAVE)
+
+        def names(**kwargs):
+            # pylint: disable=missing-docstring
+            return [
+               n for _, n, _ in \
+                  pydevDAG.BreadthFirst.nodes(graph, str, **kwargs)
+            ]
+
+        assert names(max_depth=1) == ['a', 'b', 'c']
+        assert names(reverse=True) == ['b', 'd', 'a', 'c', 'a']
+        assert names(sources=['c'], edgetypes=[pydevDAG.EdgeTypes.SLAVE]) == \
+           ['c', 'd']
+        assert names(edgetypes=[pydevDAG.EdgeTypes.PARTITION]) == \
+           ['a', 'c', 'd', 'b']
@@ -0,0 +1,214 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2016  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+# Red Hat Author(s): Anne Mulhern <amulhern@redhat.com>
+
+"""
+    tests.test_index
+    ================
+
+    Tests graph indexes.
+
+    .. moduleauthor:: mulhern <amulhern@redhat.com>
+"""
+
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import gc
+import weakref
+
+import networkx as nx
+
+import pytest
+
+import pydevDAG
+
+from ._constants import GRAPH
+
+
+class TestGraphIndex(object):
+    """
+    Test the graph index.
+    """
+
+    def test_roots_and_leaves(self):
+        """
+        Verify that roots have no ancestors and leaves no descendants.
+        """
+        index = pydevDAG.GraphIndex.get(GRAPH)
+        assert frozenset(index.roots) == \
+           frozenset(n for n in GRAPH if not nx.ancestors(GRAPH, n))
+        assert frozenset(index.leaves) == \
+           frozenset(n for n in GRAPH if not nx.descendants(GRAPH, n))
+
+    def test_order(self):
+        """
+        Verify that each edge goes forward in order and up in level.
+        """
+        index = pydevDAG.GraphIndex.get(GRAPH)
+        positions = dict((n, i) for (i, n) in enumerate(index.order))
+        assert len(positions) == len(GRAPH)
+        for (source, target) in GRAPH.edges_iter():
+            assert positions[source] < positions[target]
+            assert index.levels[source] < index.levels[target]
+        assert all(index.levels[r] == 0 for r in index.roots)
+
+    def test_degrees(self):
+        """
+        Verify that degrees by edge type sum to degrees.
+        """
+        index = pydevDAG.GraphIndex.get(GRAPH)
+        for node in GRAPH:
+            assert GRAPH.out_degree(node) == sum(
+               index.out_degree(node, e) for e in pydevDAG.EdgeTypes.values()
+            )
+            assert GRAPH.in_degree(node) == sum(
+               index.in_degree(node, e) for e in pydevDAG.EdgeTypes.values()
+            )
+
+    def test_adjacency(self):
+        """
+        Verify that the adjacency by edge type partitions the edges.
+        """
+        index = pydevDAG.GraphIndex.get(GRAPH)
+        edgetypes = pydevDAG.EdgeTypes.values()
+        for node in GRAPH:
+            assert sorted(GRAPH.successors(node)) == sorted(
+               n for e in edgetypes for n in index.adjacency(e).get(node, [])
+            )
+            assert sorted(GRAPH.predecessors(node)) == sorted(
+               n for e in edgetypes \
+                  for n in index.adjacency(e, True).get(node, [])
+            )
+        assert index.number_of_edges(edgetypes) == GRAPH.number_of_edges()
+        assert index.roots_of(edgetypes) == index.roots
+
+    def test_reuse(self):
+        """
+        Verify that an index is reused until the graph changes.
+        """
+        graph = pydevDAG.TrackedDiGraph()
+        graph.add_edges_from([('a', 'b'), ('b', 'c')])
+        index = pydevDAG.GraphIndex.get(graph)
+        assert pydevDAG.GraphIndex.get(graph) is index
+        assert index.roots == ['a']
+
+        graph.remove_edge('a', 'b')
+        graph.add_edge('b', 'a')
+        index = pydevDAG.GraphIndex.get(graph)
+        assert index.roots == ['b']
+        assert index.order == ['b', 'a', 'c'] or index.order == ['b', 'c', 'a']
+
+        pydevDAG.GraphIndex.invalidate(graph)
+        assert pydevDAG.GraphIndex.get(graph) is not index
+
+    def test_untracked(self):
+        """
+        Verify that an index of a graph which can not be tracked is never
+        stale.
+        """
+        graph = nx.DiGraph([('a', 'b'), ('c', 'd')])
+        assert not pydevDAG.GraphIndex.is_tracked(graph)
+        assert sorted(pydevDAG.GraphUtils.get_roots(graph)) == ['a', 'c']
+
+        graph.remove_edge('a', 'b')
+        graph.add_edge('b', 'a')
+        assert sorted(pydevDAG.GraphUtils.get_roots(graph)) == ['b', 'c']
+        assert sorted(
+           n for (_, n, _) in pydevDAG.DepthFirst.nodes(graph, str)
+        ) == ['a', 'b', 'c', 'd']
+
+    def test_untracked_traversal(self):
+        """
+        Verify that a traversal of a graph which can not be tracked indexes
+        it only once.
+        """
+        class Counted(nx.DiGraph):
+            """
+            A graph which counts the look ups of predecessors.
+            """
+            lookups = 0
+
+            def predecessors_iter(self, n):
+                self.lookups += 1
+                return nx.DiGraph.predecessors_iter(self, n)
+
+        graph = Counted([('a', 'b'), ('a', 'c'), ('c', 'd')])
+        for traversal in (pydevDAG.DepthFirst, pydevDAG.BreadthFirst):
+            graph.lookups = 0
+            assert len(list(traversal.nodes(graph, str))) == 4
+            assert graph.lookups == len(graph)
+
+    def test_orderings(self):
+        """
+        Verify that an ordering does not outlive a change to the attributes
+        of the nodes, nor keep its key function alive.
+        """
+        graph = pydevDAG.TrackedDiGraph([('a', 'b'), ('a', 'c')])
+        pydevDAG.Decorator.decorate_nodes(graph, {'rank': {'b': 2, 'c': 1}})
+        key_func = lambda n: graph.node[n].get('rank')
+        index = pydevDAG.GraphIndex.get(graph)
+        assert index.children('a', key_func) == ['c', 'b']
+
+        pydevDAG.Decorator.decorate_nodes(graph, {'rank': {'b': 0, 'c': 3}})
+        assert pydevDAG.GraphIndex.get(graph) is index
+        assert index.children('a', key_func) == ['b', 'c']
+
+        def closure():
+            # pylint: disable=missing-docstring
+            graph = pydevDAG.TrackedDiGraph([('a', 'b')])
+            pydevDAG.GraphIndex.get(graph).sorted_roots(
+               lambda n: graph.node[n]
+            )
+            return weakref.ref(graph)
+        reference = closure()
+        gc.collect()
+        assert reference() is None
+
+    def test_cycle(self):
+        """
+        Verify that a cycle is detected.
+        """
+        graph = nx.DiGraph([('a', 'b'), ('b', 'a'), ('c', 'c')])
+        index = pydevDAG.GraphIndex.get(graph)
+        assert index.roots == ['c']
+        with pytest.raises(pydevDAG.DAGError):
+            index.order # pylint: disable=pointless-statement
+
+    def test_children(self):
+        """
+        Verify that sorted successors are computed once per key function.
+        """
+        graph = nx.DiGraph([('a', 'c'), ('a', 'b'), ('d', 'b')])
+        calls = []
+        def key_func(node):
+            # pylint: disable=missing-docstring
+            calls.append(node)
+            return node
+
+        index = pydevDAG.GraphIndex.get(graph)
+        assert index.sorted_roots(key_func) == ['a', 'd']
+        assert index.children('a', key_func) == ['b', 'c']
+        assert index.children('a', key_func) is index.children('a', key_func)
+        assert index.children('d', key_func) == ['b']
+        assert sorted(calls) == ['a', 'b', 'c', 'd']
+
+        assert index.children('a', lambda n: -ord(n)) == ['c', 'b']
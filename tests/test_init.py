@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2016  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+# Red Hat Author(s): Anne Mulhern <amulhern@redhat.com>
+
+"""
+    tests.test_init
+    ===============
+
+    Tests the public names of the package.
+
+    .. moduleauthor:: mulhern <amulhern@redhat.com>
+"""
+
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+import pydevDAG
+
+
+class TestNames(object):
+    """
+    Test the lazily imported public names.
+    """
+
+    def test_names(self):
+        """
+        Test that every public name can be got, and appears in dir().
+        """
+        for name in pydevDAG.__all__:
+            assert getattr(pydevDAG, name) is not None
+            assert name in dir(pydevDAG)
+
+        with pytest.raises(AttributeError):
+            getattr(pydevDAG, 'NoSuchName')
+
+    @pytest.mark.skipif(
+       sys.version_info < (3, 7),
+       reason="names are imported eagerly"
+    )
+    def test_lazy(self):
+        """
+        Test that getting NodeGetters does not import networkx based modules.
+        """
+        code = (
+           "import sys, pydevDAG; pydevDAG.NodeGetters; "
+           "print(sorted(m for m in sys.modules if m in "
+           "('pydevDAG._index', 'pydevDAG._graphs', 'pydevDAG._structure')))"
+        )
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+        output = subprocess.check_output([sys.executable, '-c', code], env=env)
+        assert output.decode('utf-8').strip() == '[]'
+
+    @pytest.mark.skipif(
+       sys.version_info < (3, 7),
+       reason="names are imported eagerly"
+    )
+    def test_lazy_readwrite(self):
+        """
+        Test that getting Reader does not import the sinks, the store or
+        the background writer.
+        """
+        code = (
+           "import sys, pydevDAG; pydevDAG.Reader; "
+           "print(sorted(m for m in sys.modules if m.startswith("
+           "('pydevDAG._readwrite._', 'pydevDAG._generators'))))"
+        )
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+        output = subprocess.check_output([sys.executable, '-c', code], env=env)
+        assert output.decode('utf-8').strip() == str([
+           'pydevDAG._readwrite._compression',
+           'pydevDAG._readwrite._readwrite',
+           'pydevDAG._readwrite._stream',
+           'pydevDAG._readwrite._write'
+        ])
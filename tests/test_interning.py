@@ -0,0 +1,216 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2016  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+# Red Hat Author(s): Anne Mulhern <amulhern@redhat.com>
+
+"""
+    tests.test_interning
+    ====================
+
+    Tests integer node ids.
+
+    .. moduleauthor:: mulhern <amulhern@redhat.com>
+"""
+
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import gc
+import io
+import weakref
+
+import networkx as nx
+
+import pytest
+
+import pydevDAG
+
+from ._constants import CONTEXT
+from ._constants import DECORATED
+
+
+def _written(graph):
+    """
+    The graph that is read back after ``graph`` is written.
+
+    :param `DiGraph` graph: the graph
+    :returns: the attributes of the nodes, the edges, and the graph
+       attributes, which do not depend on the order of the nodes
+    :rtype: tuple of dict * (list of tuple) * dict
+    """
+    res = pydevDAG.StringUtils.from_string(
+       pydevDAG.StringUtils.as_string(graph, pydevDAG.Writer.write),
+       pydevDAG.Reader.read
+    )
+    return (res.node, sorted(res.edges(data=True)), res.graph)
+
+
+class TestStringTable(object):
+    """
+    Test the table of strings.
+    """
+
+    def test_table(self):
+        """
+        Test that ids are consecutive and map back to their strings.
+        """
+        table = pydevDAG.StringTable()
+        assert [table.intern(s) for s in ('a', 'b', 'a')] == [0, 1, 0]
+        assert len(table) == 2 and 'b' in table
+        assert table.get_string(table.get_id('b')) == 'b'
+
+        with pytest.raises(pydevDAG.DAGError):
+            table.get_id('c')
+        with pytest.raises(pydevDAG.DAGError):
+            table.get_string(2)
+
+
+class TestNodeIds(object):
+    """
+    Test interned graphs.
+    """
+
+    def test_generate(self):
+        """
+        Test that an interned graph is the graph with its nodes renamed.
+        """
+        graph = pydevDAG.GenerateGraph.get_graph(CONTEXT, "graph", True)
+        pydevDAG.GenerateGraph.decorate_graph(graph)
+        assert pydevDAG.NodeIds.is_interned(graph)
+        assert all(isinstance(n, int) for n in graph)
+
+        name = pydevDAG.NodeIds.names(graph)
+        assert sorted(name(n) for n in graph) == sorted(DECORATED.nodes())
+        assert sorted(name(s) + name(t) for (s, t) in graph.edges()) == \
+           sorted(s + t for (s, t) in DECORATED.edges())
+
+        getter = pydevDAG.NodeGetters.IDENTIFIER.getter
+        for node in graph:
+            assert getter(graph.node[node]) == name(node)
+            assert getter(graph.node[node]) == \
+               getter(DECORATED.node[name(node)])
+
+    def test_write_and_read(self):
+        """
+        Test that an interned graph is written as the graph it interns.
+        """
+        graph = pydevDAG.NodeIds.intern_graph(DECORATED.copy())
+        assert _written(graph) == _written(DECORATED)
+
+        expected = pydevDAG.StringUtils.as_string(
+           DECORATED,
+           pydevDAG.Writer.write
+        )
+
+        res = pydevDAG.Reader.read(io.StringIO(expected), interned=True)
+        assert pydevDAG.NodeIds.is_interned(res)
+        name = pydevDAG.NodeIds.names(res)
+        assert sorted(name(n) for n in res) == sorted(DECORATED.nodes())
+
+        restored = pydevDAG.NodeIds.restore_graph(res)
+        assert not pydevDAG.NodeIds.is_interned(restored)
+        assert sorted(restored.nodes()) == sorted(DECORATED.nodes())
+
+    def test_indexes(self):
+        """
+        Test that the indexes of a graph follow its nodes when it is
+        interned or restored.
+        """
+        graph = pydevDAG.TrackedDiGraph()
+        graph.add_node('/devices/a', size=1)
+        graph.add_node('/devices/b', size=2)
+        graph.add_edge('/devices/a', '/devices/b')
+        sizes = pydevDAG.AttributeIndexes.declare(graph, ['size'])
+        assert pydevDAG.GraphUtils.get_roots(graph) == ['/devices/a']
+
+        pydevDAG.NodeIds.intern_graph(graph)
+        name = pydevDAG.NodeIds.names(graph)
+        assert [name(n) for n in pydevDAG.GraphUtils.get_roots(graph)] == \
+           ['/devices/a']
+        assert [name(n) for n in sizes.lookup(2)] == ['/devices/b']
+        assert [
+           name(n) for (_, n, _) in pydevDAG.BreadthFirst.nodes(graph, name)
+        ] == ['/devices/a', '/devices/b']
+
+        pydevDAG.NodeIds.restore_graph(graph)
+        assert pydevDAG.GraphUtils.get_roots(graph) == ['/devices/a']
+        assert sizes.lookup(2) == frozenset(['/devices/b'])
+
+    def test_edges(self):
+        """
+        Test that the edges of an interned graph are written by name.
+        """
+        graph = nx.DiGraph()
+        for node in ('/devices/a', '/devices/b', '/devices/c'):
+            graph.add_node(
+               node,
+               identifier=node,
+               nodetype=pydevDAG.NodeTypes.DEVICE_PATH
+            )
+        graph.add_edge(
+           '/devices/a',
+           '/devices/b',
+           edgetype=pydevDAG.EdgeTypes.SLAVE
+        )
+        graph.add_edge(
+           '/devices/c',
+           '/devices/b',
+           edgetype=pydevDAG.EdgeTypes.SLAVE
+        )
+        interned = pydevDAG.NodeIds.intern_graph(graph.copy())
+        table = pydevDAG.NodeIds.table(interned)
+        assert interned.has_edge(
+           table.get_id('/devices/a'),
+           table.get_id('/devices/b')
+        )
+
+        assert _written(interned) == _written(graph)
+
+        out = io.StringIO()
+        pydevDAG.Exporter.export(
+           interned,
+           [pydevDAG.DOTSink(out, [pydevDAG.NodeGetters.IDENTIFIER])]
+        )
+        assert '"/devices/a" -> "/devices/b"' in out.getvalue()
+
+    def test_tables(self):
+        """
+        Test that each interned graph has its own table, which is dropped
+        with the graph, and that integer nodes of other graphs are not
+        taken for ids.
+        """
+        graph = pydevDAG.NodeIds.intern_graph(
+           nx.DiGraph([('/devices/a', '/devices/b')])
+        )
+        table = weakref.ref(pydevDAG.NodeIds.table(graph))
+        other = pydevDAG.NodeIds.intern_graph(nx.DiGraph([('/devices/c', 'd')]))
+        assert pydevDAG.NodeIds.table(other) is not table()
+        assert '/devices/c' not in table()
+
+        plain = nx.DiGraph()
+        plain.add_node(0, identifier=0)
+        with pytest.raises(pydevDAG.DAGError):
+            pydevDAG.NodeIds.table(plain)
+        assert pydevDAG.NodeIds.names(plain)(0) == 0
+        assert pydevDAG.NodeGetters.IDENTIFIER.getter(plain.node[0]) == 0
+
+        del graph
+        gc.collect()
+        assert table() is None
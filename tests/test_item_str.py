@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2016  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+# Red Hat Author(s): Anne Mulhern <amulhern@redhat.com>
+
+"""
+    tests.test_item_str
+    ===================
+
+    Tests getting values for nodes.
+
+    .. moduleauthor:: mulhern <amulhern@redhat.com>
+"""
+
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import justbytes
+
+import networkx as nx
+
+import pydevDAG
+
+
+class TestNodeGetters(object):
+    """
+    Test node getters.
+    """
+
+    def test_getters(self):
+        """
+        Test getters on present, missing and partially missing attributes.
+        """
+        full = {
+           'UDEV': {'DEVNAME': '/dev/sda', 'DM_UUID': None},
+           'SYSFS': {'size': '2048'},
+           'nodetype': pydevDAG.NodeTypes.DEVICE_PATH
+        }
+        getters = pydevDAG.NodeGetters
+        assert getters.DEVNAME.getter(full) == '/dev/sda'
+        assert getters.SIZE.getter(full) == '1 MiB'
+        assert getters.DMUUIDSUBSYSTEM.getter(full) is None
+        assert getters.NODETYPE.getter(full) == 'Device'
+
+        empty = {'UDEV': None}
+        for getter in (
+              getters.BY_PATH,
+              getters.DEVNAME,
+              getters.DMUUIDSUBSYSTEM,
+              getters.MAJOR,
+              getters.SIZE,
+              getters.SYSNAME
+           ):
+            assert getter.getter(empty) is None
+
+    def test_columns(self):
+        """
+        Test getting columns for many nodes.
+        """
+        graph = nx.DiGraph()
+        graph.add_node('a', UDEV={'DEVNAME': '/dev/a', 'DEVTYPE': 'disk'})
+        graph.add_node('b', UDEV={'DEVNAME': '/dev/b'})
+        graph.add_node('c')
+
+        getters = [pydevDAG.NodeGetters.DEVNAME, pydevDAG.NodeGetters.DEVTYPE]
+        (nodes, columns) = pydevDAG.NodeGetters.columns(
+           graph,
+           getters,
+           ['c', 'a', 'b']
+        )
+        assert nodes == ['c', 'a', 'b']
+        assert columns == [[None, '/dev/a', '/dev/b'], [None, 'disk', None]]
+
+        (nodes, columns) = pydevDAG.NodeGetters.columns(graph, getters)
+        assert sorted(nodes) == ['a', 'b', 'c']
+        assert len(columns[0]) == 3
+
+    def test_size(self):
+        """
+        Test that sizes formatted without justbytes agree with justbytes.
+        """
+        sizes = [0, 1, 2, 3, 7, 1000, 2048, 2049, 1953125, 976773168]
+        sizes.extend(2 ** exponent for exponent in range(70))
+        sizes.extend(3 * 2 ** exponent for exponent in range(60))
+        for size in sizes:
+            node = {'SYSFS': {'size': str(size)}}
+            expected = \
+               str(justbytes.Range(str(size), justbytes.Range(512)))
+            assert pydevDAG.NodeGetters.SIZE.getter(node) == expected
+            assert pydevDAG.NodeGetters.SIZE.getter(node) == expected
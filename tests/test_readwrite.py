@@ -32,10 +32,20 @@ from __future__ import division
 from __future__ import print_function
 from __future__ import unicode_literals
 
+import io
+import json
+import os
+import shutil
+import tempfile
+
 import networkx as nx
 
 import networkx.algorithms.isomorphism as iso
 
+from networkx.readwrite import json_graph
+
+import pytest
+
 import pydevDAG
 
 from ._constants import DECORATED
@@ -77,6 +87,263 @@ class TestStringUtils(object):
         )
 
 
+class TestStreaming(object):
+    """
+    Test writing graphs a node and a link at a time.
+    """
+
+    def test_node_link_data(self):
+        """
+        Test that the output is that of json.dump of the node-link data,
+        and that the graph written is not changed.
+        """
+        copied = DECORATED.copy()
+        pydevDAG.Rewriter.stringize(copied)
+        expected = io.StringIO()
+        json.dump(
+           json_graph.node_link_data(copied),
+           expected,
+           indent=4,
+           separators=(',', ': ')
+        )
+        print(end=os.linesep, file=expected)
+
+        identical = lambda x, y: x == y
+        graph = DECORATED.copy()
+        out = io.StringIO()
+        pydevDAG.Writer.write(graph, out)
+        assert out.getvalue() == expected.getvalue()
+        assert iso.is_isomorphic(graph, DECORATED, identical, identical)
+        assert graph.node == DECORATED.node
+
+        out = io.StringIO()
+        pydevDAG.Writer.write(nx.DiGraph(), out)
+        assert json.loads(out.getvalue())['nodes'] == []
+
+    def test_tuples(self):
+        """
+        Test that tuple node ids are read back as tuples.
+        """
+        graph = nx.MultiDiGraph()
+        graph.add_edge(('a', 1), ('b', (2, 3)), 'k', label='x')
+        val = pydevDAG.StringUtils.as_string(graph, pydevDAG.Writer.write)
+        res = pydevDAG.StringUtils.from_string(val, pydevDAG.Reader.read)
+        assert res.edges(keys=True, data=True) == \
+           [(('a', 1), ('b', (2, 3)), 'k', {'label': 'x'})]
+
+
+class TestCompression(object):
+    """
+    Test reading and writing compressed graphs.
+    """
+
+    def test_inverses(self):
+        """
+        Test that a compressed graph is detected and read back identically.
+        """
+        identical = lambda x, y: x == y
+        for compression in pydevDAG.Compressions.values():
+            val = pydevDAG.StringUtils.as_string(
+               DECORATED,
+               pydevDAG.Writer.write,
+               compression
+            )
+            assert val.startswith(compression.MAGIC)
+            res = pydevDAG.StringUtils.from_string(val, pydevDAG.Reader.read)
+            assert iso.is_isomorphic(DECORATED, res, identical, identical)
+
+    def test_uncompressed_bytes(self):
+        """
+        Test that an uncompressed binary stream is read.
+        """
+        val = pydevDAG.StringUtils.as_string(DECORATED, pydevDAG.Writer.write)
+        instream = io.BytesIO(val.encode('utf-8'))
+        res = pydevDAG.Reader.read(instream)
+        assert not instream.closed
+        assert frozenset(res.nodes()) == frozenset(DECORATED.nodes())
+
+    def test_stream_left_open(self):
+        """
+        Test that writing does not close the stream written to.
+        """
+        out = io.BytesIO()
+        pydevDAG.Writer.write(DECORATED, out, pydevDAG.Compressions.GZIP)
+        assert not out.closed
+        out.seek(0)
+        assert len(pydevDAG.Reader.read(out)) == len(DECORATED)
+
+
+class TestProjection(object):
+    """
+    Test reading only some attributes of a graph.
+    """
+
+    def test_projection(self):
+        """
+        Test that only the selected attributes are read.
+        """
+        node_attributes = {
+           'nodetype': {},
+           'UDEV': {'args': {'DEVNAME': {}}}
+        }
+        lookup = pydevDAG.ExtendedLookup(node_attributes)
+        val = pydevDAG.StringUtils.as_string(DECORATED, pydevDAG.Writer.write)
+        res = pydevDAG.StringUtils.from_string(
+           val,
+           lambda f: pydevDAG.Reader.read(f, node_attributes, {})
+        )
+        assert frozenset(res.edges()) == frozenset(DECORATED.edges())
+        assert all(d == {} for (_, _, d) in res.edges_iter(data=True))
+        for node in DECORATED:
+            assert res.node[node] == lookup.project(DECORATED.node[node])
+
+
+class TestBackgroundWriter(object):
+    """
+    Test writing graphs in the background.
+    """
+
+    def setup_method(self, method):
+        """
+        Make a directory to write to.
+        """
+        # pylint: disable=attribute-defined-outside-init, unused-argument
+        self.directory = tempfile.mkdtemp()
+
+    def teardown_method(self, method):
+        """
+        Remove the directory written to.
+        """
+        # pylint: disable=unused-argument
+        shutil.rmtree(self.directory)
+
+    def test_write(self):
+        """
+        Test that graphs are written and are not affected by later changes.
+        """
+        identical = lambda x, y: x == y
+        graph = DECORATED.copy()
+        path = os.path.join(self.directory, 'graph.json')
+        with pydevDAG.BackgroundWriter(pydevDAG.Compressions.GZIP) as writer:
+            writer.write(graph, path)
+            graph.add_node('new', nodetype=pydevDAG.NodeTypes.WWN)
+            writer.flush()
+            assert os.listdir(self.directory) == ['graph.json']
+
+        with open(path, 'rb') as instream:
+            res = pydevDAG.Reader.read(instream)
+        assert iso.is_isomorphic(DECORATED, res, identical, identical)
+
+    def test_process(self):
+        """
+        Test that graphs are written in a worker process, and that a failed
+        write leaves no temporary file behind.
+        """
+        identical = lambda x, y: x == y
+        graph = DECORATED.copy()
+        path = os.path.join(self.directory, 'graph.json')
+        blocked = os.path.join(self.directory, 'blocked')
+        os.mkdir(blocked)
+        with pydevDAG.BackgroundWriter(process_threshold=0) as writer:
+            writer.write(graph, path)
+            graph.add_node('new', nodetype=pydevDAG.NodeTypes.WWN)
+            writer.flush()
+            writer.write(graph, blocked)
+            with pytest.raises(pydevDAG.DAGError):
+                writer.flush()
+        assert sorted(os.listdir(self.directory)) == ['blocked', 'graph.json']
+
+        with open(path) as instream:
+            res = pydevDAG.Reader.read(instream)
+        assert iso.is_isomorphic(DECORATED, res, identical, identical)
+
+    def test_error(self):
+        """
+        Test that a failed write is reported by the next call.
+        """
+        path = os.path.join(self.directory, 'missing', 'graph.json')
+        writer = pydevDAG.BackgroundWriter()
+        writer.write(DECORATED, path)
+        with pytest.raises(pydevDAG.DAGError):
+            writer.flush()
+        writer.close()
+        with pytest.raises(pydevDAG.DAGError):
+            writer.write(DECORATED, path)
+
+
+class TestExport(object):
+    """
+    Test exporting a graph to several sinks at once.
+    """
+
+    def test_export(self):
+        """
+        Test that every sink receives every node and edge.
+        """
+        getters = [pydevDAG.NodeGetters.DEVNAME, pydevDAG.NodeGetters.SIZE]
+        (lines, rows, edge_rows, dot) = \
+           (io.StringIO(), io.StringIO(), io.StringIO(), io.StringIO())
+        sinks = [
+           pydevDAG.JSONLinesSink(lines, getters),
+           pydevDAG.CSVSink(rows, getters, edge_rows),
+           pydevDAG.DOTSink(dot, getters)
+        ]
+        traversal = pydevDAG.DepthFirst.nodes(DECORATED, lambda x: x)
+        pydevDAG.Exporter.export(
+           DECORATED,
+           sinks,
+           (n for (_, n, _) in traversal)
+        )
+
+        objs = [json.loads(l) for l in lines.getvalue().splitlines()]
+        assert frozenset(o['node'] for o in objs if 'node' in o) == \
+           frozenset(DECORATED.nodes())
+        assert len(objs) == len(DECORATED) + DECORATED.number_of_edges()
+
+        assert len(rows.getvalue().splitlines()) == len(DECORATED) + 1
+        assert len(edge_rows.getvalue().splitlines()) == \
+           DECORATED.number_of_edges() + 1
+
+        lines = dot.getvalue().splitlines()
+        assert lines[0].startswith('digraph') and lines[-1] == '}'
+        assert len(lines) == len(DECORATED) + DECORATED.number_of_edges() + 2
+
+    def test_export_shared(self):
+        """
+        Test that the output of a shared traversal can be exported.
+        """
+        graph = nx.DiGraph([('a', 'c'), ('b', 'c'), ('c', 'd')])
+        lines = io.StringIO()
+        sinks = [pydevDAG.JSONLinesSink(lines, [pydevDAG.NodeGetters.DEVNAME])]
+        traversal = pydevDAG.DepthFirst.nodes(graph, lambda x: x, shared=True)
+        pydevDAG.Exporter.export(graph, sinks, (n for (_, n, _) in traversal))
+
+        objs = [json.loads(l) for l in lines.getvalue().splitlines()]
+        assert [o['node'] for o in objs if 'node' in o] == ['a', 'c', 'd', 'b']
+        assert len(objs) == len(graph) + graph.number_of_edges()
+
+    def test_export_partial(self):
+        """
+        Test that a depth-limited export has no edges to nodes that are
+        not exported.
+        """
+        graph = nx.DiGraph([('a', 'b'), ('b', 'c'), ('a', 'c'), ('c', 'd')])
+        (lines, dot) = (io.StringIO(), io.StringIO())
+        sinks = [
+           pydevDAG.JSONLinesSink(lines, [pydevDAG.NodeGetters.DEVNAME]),
+           pydevDAG.DOTSink(dot, [pydevDAG.NodeGetters.DEVNAME])
+        ]
+        traversal = pydevDAG.DepthFirst.nodes(graph, lambda x: x, max_depth=1)
+        pydevDAG.Exporter.export(graph, sinks, (n for (_, n, _) in traversal))
+
+        objs = [json.loads(l) for l in lines.getvalue().splitlines()]
+        assert [o['node'] for o in objs if 'node' in o] == ['a', 'b', 'c']
+        assert sorted(
+           (o['source'], o['target']) for o in objs if 'source' in o
+        ) == [('a', 'b'), ('a', 'c'), ('b', 'c')]
+        assert len(dot.getvalue().splitlines()) == 3 + 3 + 2
+
+
 class TestRewriter(object):
     """
     Test rewriting of a graph.
@@ -94,3 +361,87 @@ class TestRewriter(object):
         assert not iso.is_isomorphic(copied, DECORATED, identical, identical)
         pydevDAG.Rewriter.destringize(copied)
         assert iso.is_isomorphic(copied, DECORATED, identical, identical)
+
+
+class TestSQLiteStore(object):
+    """
+    Test storing graphs in an SQLite database.
+    """
+
+    def test_inverses(self):
+        """
+        Test that saving and loading a graph yields an identical graph.
+        """
+        identical = lambda x, y: x == y
+        store = pydevDAG.SQLiteStore(':memory:')
+        store.save(DECORATED, 'graph')
+        store.save(DECORATED, 'graph')
+        assert store.names() == ['graph']
+        res = store.load('graph')
+        assert iso.is_isomorphic(DECORATED, res, identical, identical)
+        assert res.graph == DECORATED.graph
+
+    def test_partial(self):
+        """
+        Test that loading some nodes yields the induced subgraph.
+        """
+        identical = lambda x, y: x == y
+        store = pydevDAG.SQLiteStore(':memory:')
+        store.save(DECORATED, 'graph')
+        nodes = DECORATED.nodes()[::2]
+        res = store.load('graph', nodes)
+        assert iso.is_isomorphic(
+           DECORATED.subgraph(nodes),
+           res,
+           identical,
+           identical
+        )
+
+    def test_find_nodes(self):
+        """
+        Test that nodes found are the nodes with the given attributes.
+        """
+        store = pydevDAG.SQLiteStore(':memory:')
+        store.save(DECORATED, 'graph')
+
+        nodetype = pydevDAG.NodeTypes.DEVICE_PATH
+        found = store.find_nodes(nodetype=nodetype)
+        assert frozenset(n for (_, n) in found) == frozenset(
+           n for n in DECORATED if DECORATED.node[n]['nodetype'] is nodetype
+        )
+
+        disks = store.find_nodes({('UDEV', 'DEVTYPE'): 'disk'})
+        expected = [
+           n for n in DECORATED \
+              if DECORATED.node[n].get('UDEV', {}).get('DEVTYPE') == 'disk'
+        ]
+        assert expected
+        assert sorted(disks) == sorted(('graph', n) for n in expected)
+
+        disks = store.find_nodes({('UDEV', 'DEVTYPE'): 'disk'}, names=['x'])
+        assert disks == []
+
+    def test_reachable(self):
+        """
+        Test that reachable nodes are the descendants of the nodes.
+        """
+        store = pydevDAG.SQLiteStore(':memory:')
+        store.save(DECORATED, 'graph')
+        for node in DECORATED.nodes()[:10]:
+            assert frozenset(store.reachable('graph', [node])) == \
+               nx.descendants(DECORATED, node)
+
+    def test_reachable_many(self):
+        """
+        Test that any number of nodes may be started from, and that a node
+        started from is found if it is reachable from another.
+        """
+        graph = nx.DiGraph()
+        graph.add_path(range(2000))
+        store = pydevDAG.SQLiteStore(':memory:')
+        store.save(graph, 'chain')
+        reached = store.reachable('chain', range(0, 2000, 2))
+        assert sorted(reached) == list(range(1, 2000))
+        assert len(reached) == len(set(reached))
+        assert sorted(store.reachable('chain', [1998, 1999], True)) == \
+           list(range(1999))
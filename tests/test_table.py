@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2016  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+# Red Hat Author(s): Anne Mulhern <amulhern@redhat.com>
+
+"""
+    tests.test_table
+    ================
+
+    Tests columnar tables of node attributes.
+
+    .. moduleauthor:: mulhern <amulhern@redhat.com>
+"""
+
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import random
+
+from array import array
+
+import networkx as nx
+
+import pytest
+
+import pydevDAG
+
+
+def _table():
+    """
+    A table over a small graph.
+    """
+    graph = nx.DiGraph()
+    for (name, devtype, size) in [
+          ('sda', 'disk', 8),
+          ('sda1', 'partition', 3),
+          ('sda2', 'partition', 5),
+          ('sdb', 'disk', 2),
+          ('loop0', None, 1)
+       ]:
+        graph.add_node(name, UDEV={'DEVTYPE': devtype, 'DEVNAME': name})
+        graph.node[name]['blocks'] = size
+
+    size = pydevDAG.Dict.accessor(['blocks'])
+    return pydevDAG.GraphTable.from_graph(
+       graph,
+       [pydevDAG.NodeGetters.DEVTYPE, ('blocks', size)],
+       ['sda', 'sda1', 'sda2', 'sdb', 'loop0']
+    )
+
+
+class TestGraphTable(object):
+    """
+    Test tables.
+    """
+
+    def test_columns(self):
+        """
+        Test that numeric columns are typed arrays.
+        """
+        table = _table()
+        assert table.names == ['DEVTYPE', 'blocks']
+        assert len(table) == 5
+        assert isinstance(table.column('blocks'), array)
+        assert table.column('DEVTYPE')[:2] == ['disk', 'partition']
+        assert next(table.rows()) == ('sda', 'disk', 8)
+        with pytest.raises(pydevDAG.DAGError):
+            table.column('nothing')
+
+    def test_operations(self):
+        """
+        Test filtering, sorting and grouping.
+        """
+        table = _table()
+        partitions = table.filter('DEVTYPE', lambda v: v == 'partition')
+        assert partitions.nodes == ['sda1', 'sda2']
+        assert isinstance(partitions.column('blocks'), array)
+
+        ordered = table.sort(['DEVTYPE', 'blocks'], reverse=True)
+        assert ordered.nodes == ['sda2', 'sda1', 'sda', 'sdb', 'loop0']
+
+        assert table.count_by('DEVTYPE') == \
+           {'disk': 2, 'partition': 2, None: 1}
+        assert table.aggregate('DEVTYPE', 'blocks') == \
+           {'disk': 10, 'partition': 8, None: 1}
+        assert table.group_by('DEVTYPE')['disk'].nodes == ['sda', 'sdb']
+
+        assert table.select([True, False] * 2 + [True]).nodes == \
+           ['sda', 'sda2', 'loop0']
+        with pytest.raises(pydevDAG.DAGError):
+            table.select([True])
+
+    def test_numpy(self):
+        """
+        Test selecting with a NumPy mask.
+        """
+        pytest.importorskip('numpy')
+        table = _table()
+        assert table.select(table.numpy('blocks') > 4).nodes == \
+           ['sda', 'sda2']
+        assert list(table.numpy('DEVTYPE'))[-1] is None
+
+    def test_typed(self):
+        """
+        Test that operations on typed columns agree with Python's.
+        """
+        randomizer = random.Random(3)
+        graph = nx.DiGraph()
+        for index in range(200):
+            graph.add_node(
+               'n%d' % index,
+               a=randomizer.randrange(5),
+               b=randomizer.randrange(3) * 1.5
+            )
+        nodes = sorted(graph)
+        table = pydevDAG.GraphTable.from_graph(
+           graph,
+           [('a', lambda d: d['a']), ('b', lambda d: d['b'])],
+           nodes
+        )
+        rows = list(table.rows())
+
+        for reverse in (False, True):
+            assert table.sort(['a', 'b'], reverse).nodes == [
+               r[0] for r in sorted(rows, key=lambda r: r[1:], reverse=reverse)
+            ]
+        assert table.filter('a', lambda v: v > 2).nodes == \
+           [r[0] for r in rows if r[1] > 2]
+        assert table.filter('a', lambda v: v in (1, 3)).nodes == \
+           [r[0] for r in rows if r[1] in (1, 3)]
+
+        groups = dict()
+        for (node, a, b) in rows:
+            groups.setdefault(a, []).append((node, b))
+        assert table.count_by('a') == \
+           dict((a, len(g)) for (a, g) in groups.items())
+        assert table.group_by('a')[3].nodes == [n for (n, _) in groups[3]]
+        for function in (sum, min, max, len):
+            assert table.aggregate('a', 'b', function) == dict(
+               (a, function([b for (_, b) in g])) for (a, g) in groups.items()
+            )
+        assert table.aggregate('b', 'a')[1.5] == \
+           sum(r[1] for r in rows if r[2] == 1.5)
+        assert isinstance(table.filter('b', lambda v: v < 1).column('b'), array)
@@ -49,3 +49,21 @@ class TestTypes(object):
         assert edge_type is pydevDAG.EdgeTypes.get_value(str(edge_type))
 
         assert pydevDAG.EdgeTypes.get_value("bogus") is None
+
+    def test_codes(self):
+        """
+        Test that codes are positions in values() and map back to values.
+        """
+        for klass in (
+              pydevDAG.EdgeTypes,
+              pydevDAG.ElementTypes,
+              pydevDAG.NodeTypes
+           ):
+            values = klass.values()
+            assert [klass.get_code(v) for v in values] == \
+               list(range(len(values)))
+            assert [klass.from_code(i) for i in range(len(values))] == values
+            assert klass.from_code(len(values)) is None
+            assert klass.from_code(-1) is None
+
+        assert pydevDAG.EdgeTypes.get_code(pydevDAG.NodeTypes.WWN) is None
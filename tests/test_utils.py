@@ -32,6 +32,13 @@ from __future__ import division
 from __future__ import print_function
 from __future__ import unicode_literals
 
+try:
+    from collections.abc import Mapping
+except ImportError: # pragma: no cover
+    from collections import Mapping # pylint: disable=deprecated-class
+
+import networkx as nx
+
 import pytest
 
 from hypothesis import given
@@ -75,6 +82,140 @@ class TestGraphUtils(object):
         )
         assert graph.graph['reversed']
 
+    def test_view(self):
+        """
+        Test that a reversed view is traversed as a reversed copy.
+        """
+        graph = nx.DiGraph()
+        graph.add_edges_from([('a', 'b'), ('a', 'c'), ('b', 'd'), ('c', 'd')])
+        graph.add_edge('d', 'e', edgetype=pydevDAG.EdgeTypes.SLAVE)
+
+        view = pydevDAG.GraphUtils.set_direction(
+           graph,
+           set_reversed=True,
+           view=True
+        )
+        copied = pydevDAG.GraphUtils.set_direction(graph, set_reversed=True)
+        assert isinstance(view, pydevDAG.ReversedView)
+        assert pydevDAG.GraphViews.is_reversed(view)
+        assert copied.graph['reversed']
+        assert 'reversed' not in graph.graph
+        assert view.graph is graph.graph
+
+        assert pydevDAG.GraphUtils.get_roots(view) == ['e']
+        assert pydevDAG.GraphUtils.get_leaves(view) == ['a']
+        assert pydevDAG.GraphUtils.get_descendants(view, 'd') == \
+           set(['a', 'b', 'c'])
+        assert pydevDAG.GraphUtils.is_ancestor(view, 'e', 'a')
+        assert sorted(view.edges(data=True)) == \
+           sorted(copied.edges(data=True))
+
+        key_func = lambda n: n
+        for generator in (pydevDAG.DepthFirst, pydevDAG.BreadthFirst):
+            assert list(generator.nodes(view, key_func)) == \
+               list(generator.nodes(copied, key_func))
+            assert list(generator.nodes(view, key_func, reverse=True)) == \
+               list(generator.nodes(graph, key_func))
+
+        assert pydevDAG.GraphUtils.set_direction(view, view=True) is graph
+        assert not pydevDAG.GraphUtils.set_direction(view).graph.get(
+           'reversed',
+           False
+        )
+        assert sorted(view.copy().edges()) == sorted(copied.edges())
+        assert view.copy().graph['reversed']
+
+    def test_view_interface(self):
+        """
+        Test that a reversed view reads as a reversed copy.
+        """
+        graph = nx.DiGraph()
+        graph.add_edges_from([('a', 'b'), ('a', 'c'), ('b', 'd')])
+        graph.add_edge('d', 'e', edgetype=pydevDAG.EdgeTypes.SLAVE)
+        view = pydevDAG.ReversedView(graph)
+        copied = graph.reverse(copy=True)
+
+        for node in graph:
+            assert view[node] == copied[node]
+            assert view.pred[node] == copied.pred[node]
+            assert view.neighbors(node) == copied.neighbors(node)
+        assert view.degree() == copied.degree()
+        assert view.in_degree() == copied.in_degree()
+        assert view.out_degree('a') == copied.out_degree('a') == 0
+        assert view.has_node('a') and not view.has_node('x')
+        assert view.has_successor('e', 'd') and view.has_predecessor('d', 'e')
+        assert not view.has_successor('d', 'e')
+        assert view.get_edge_data('e', 'd') == \
+           {'edgetype': pydevDAG.EdgeTypes.SLAVE}
+        assert view.get_edge_data('d', 'e', 0) == 0
+        assert nx.descendants(view, 'd') == nx.descendants(copied, 'd')
+
+        graph.graph['name'] = 'changed'
+        assert view.graph['name'] == 'changed'
+
+    def test_edgetype_view(self):
+        """
+        Test that a view restricted to edge types is traversed as a copy.
+        """
+        (slave, partition) = \
+           (pydevDAG.EdgeTypes.SLAVE, pydevDAG.EdgeTypes.PARTITION)
+        graph = nx.DiGraph()
+        graph.add_edge('a', 'b', edgetype=slave)
+        graph.add_edge('b', 'c', edgetype=partition)
+        graph.add_edge('c', 'd', edgetype=slave)
+        graph.add_edge('a', 'd', edgetype=partition)
+
+        view = pydevDAG.EdgeTypeView(graph, [slave])
+        copied = view.copy()
+        assert sorted(copied.edges()) == [('a', 'b'), ('c', 'd')]
+        assert sorted(view.edges()) == sorted(copied.edges())
+        assert view.number_of_edges() == 2
+        assert view.predecessors('d') == ['c']
+        assert view.has_edge('a', 'b') and not view.has_edge('a', 'd')
+
+        assert sorted(pydevDAG.GraphUtils.get_roots(view)) == ['a', 'c']
+        assert sorted(pydevDAG.GraphUtils.get_leaves(view)) == ['b', 'd']
+        assert pydevDAG.GraphUtils.get_descendants(view, 'a') == set(['b'])
+
+        key_func = lambda n: n
+        reversed_view = pydevDAG.GraphUtils.reverse(view, view=True)
+        for generator in (pydevDAG.DepthFirst, pydevDAG.BreadthFirst):
+            assert list(generator.nodes(view, key_func)) == \
+               list(generator.nodes(copied, key_func))
+            assert list(generator.nodes(reversed_view, key_func)) == \
+               list(generator.nodes(copied.reverse(), key_func))
+            assert [
+               info[1] for info in \
+                  generator.nodes(view, key_func, edgetypes=[partition])
+            ] == ['a', 'b', 'c', 'd']
+
+    def test_edgetypes(self):
+        """
+        Test that restricting a traversal to edge types by a keyword and by
+        a view agree, whether or not the graph is tracked.
+        """
+        (slave, partition) = \
+           (pydevDAG.EdgeTypes.SLAVE, pydevDAG.EdgeTypes.PARTITION)
+        graph = nx.DiGraph()
+        graph.add_edge('a', 'b', edgetype=slave)
+        graph.add_edge('b', 'c', edgetype=partition)
+        graph.add_edge('c', 'd', edgetype=slave)
+        graph.add_edge('a', 'd', edgetype=partition)
+
+        key_func = lambda n: n
+        for base in (graph, pydevDAG.TrackedDiGraph(graph)):
+            view = pydevDAG.EdgeTypeView(base, [slave])
+            for generator in (pydevDAG.DepthFirst, pydevDAG.BreadthFirst):
+                assert list(generator.nodes(base, key_func, edgetypes=[slave]))\
+                   == list(generator.nodes(view, key_func))
+                assert list(generator.nodes(view, key_func)) == \
+                   list(generator.nodes(view.copy(), key_func))
+            assert pydevDAG.GraphUtils.get_descendants(view, 'c') == set(['d'])
+            assert pydevDAG.GraphUtils.get_ancestors(view, 'd') == set(['c'])
+            assert not pydevDAG.GraphUtils.is_ancestor(view, 'a', 'd')
+            assert pydevDAG.GraphUtils.is_ancestor(view, 'a', 'b')
+            assert view.number_of_edges() == 2
+
 
 class TestDict(object):
     """
@@ -106,6 +247,56 @@ class TestDict(object):
         pydevDAG.Dict.set_value(table, keys, value)
         assert pydevDAG.Dict.get_value(table, keys[:-1]) == {keys[-1]: value}
 
+    @given(
+        strategies.lists(elements=strategies.text(), max_size=4, min_size=1),
+        strategies.integers()
+    )
+    @settings(max_examples=20)
+    def test_accessor(self, keys, value):
+        """
+        Test that a compiled accessor agrees with get_value.
+        """
+        table = dict()
+        accessor = pydevDAG.Dict.accessor(keys, default=None)
+        assert accessor(table) is None
+        assert accessor(None) is None
+
+        pydevDAG.Dict.set_value(table, keys, value, force=True)
+        assert accessor(table) == value
+        assert pydevDAG.Dict.accessor(keys[:-1] + ['x' + keys[-1]])(table) \
+           is None
+        if len(keys) > 1:
+            assert pydevDAG.Dict.accessor(keys + ['y'], 0)(table) == 0
+
+    def test_accessor_mappings(self):
+        """
+        Test that a compiled accessor traverses any mapping.
+        """
+        class Frozen(Mapping):
+            """
+            A read-only mapping which is not a dict.
+            """
+            def __init__(self, **kwargs):
+                self._values = dict(kwargs)
+
+            def __getitem__(self, key):
+                return self._values[key]
+
+            def __iter__(self):
+                return iter(self._values)
+
+            def __len__(self):
+                return len(self._values)
+
+        tree = Frozen(UDEV=Frozen(DEVNAME='/dev/sda', LINKS=Frozen(a=1)))
+        assert pydevDAG.Dict.accessor(['UDEV'])(tree) is tree['UDEV']
+        assert pydevDAG.Dict.accessor(['UDEV', 'DEVNAME'])(tree) == '/dev/sda'
+        assert pydevDAG.Dict.accessor(['UDEV', 'LINKS', 'a'])(tree) == 1
+        assert pydevDAG.Dict.accessor(['UDEV', 'DEVNAME', 'x'])(tree) is None
+        assert pydevDAG.NodeGetters.DEVNAME.getter(tree) == '/dev/sda'
+        lookup = pydevDAG.ExtendedLookup({'UDEV': {'args': {'DEVNAME': {}}}})
+        assert lookup.get_tuple(tree) == ('/dev/sda',)
+
     def test_exceptions(self):
         """
         Test exceptions.
@@ -169,9 +360,46 @@ class TestDict(object):
         with pytest.raises(pydevDAG.DAGError):
             list(pydevDAG.ExtendedLookup({unknown_key: {}}).get_values(tree))
 
+    def test_project(self):
+        """
+        Test that projection keeps exactly the selected keys that are found.
+        """
+        tree = {'a': {'b': 1, 'c': 2}, 'd': 3}
+        config = {'a': {'args': {'b': {}, 'e': {}}}, 'd': {}, 'f': {}}
+        assert pydevDAG.ExtendedLookup(config).project(tree) == \
+           {'a': {'b': 1}, 'd': 3}
+        assert pydevDAG.ExtendedLookup({}).project(tree) == {}
+
     def test_get_values_simple(self):
         """
         Test what would be exceptions if an empty list did not sometimes
         mean the same thing.
         """
         assert list(pydevDAG.ExtendedLookup({}).get_values(None)) == []
+
+    def test_batch(self):
+        """
+        Test the compiled plan and batch evaluation with a missing sentinel.
+        """
+        config = {'UDEV': {'args': {'DEVNAME': {}}}, 'SYSNAME': {}}
+        lookup = pydevDAG.ExtendedLookup(config)
+        assert sorted(lookup.paths) == [('SYSNAME',), ('UDEV', 'DEVNAME')]
+
+        devname = lookup.paths.index(('UDEV', 'DEVNAME'))
+        trees = [
+           {'UDEV': {'DEVNAME': '/dev/sda'}, 'SYSNAME': 'sda'},
+           {'UDEV': None, 'SYSNAME': 'sdb'}
+        ]
+        rows = lookup.batch(trees, missing=pydevDAG.ExtendedLookup.MISSING)
+        assert rows[0][devname] == '/dev/sda'
+        assert rows[1][devname] is pydevDAG.ExtendedLookup.MISSING
+        assert lookup.batch(trees, missing=None)[1][devname] is None
+        with pytest.raises(pydevDAG.DAGError):
+            lookup.batch(trees)
+
+        graph = nx.DiGraph()
+        for (node, tree) in zip(['a', 'b'], trees):
+            graph.add_node(node, attr_dict=tree)
+        (nodes, rows) = lookup.batch_nodes(graph, ['b'], missing=None)
+        assert nodes == ['b']
+        assert rows[0][1 - devname] == 'sdb'